@@ -0,0 +1,7 @@
+# ASGI entry point: uvicorn asgi_app:app --workers 4
+# Same app, config selection, models and schemas as flask_app.py (gunicorn);
+# read endpoints with async variants query through the asyncio engine.
+from flask_app import app as flask_app
+from project.application.asgi import AsgiApp
+
+app = AsgiApp(flask_app)
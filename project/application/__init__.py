@@ -2,7 +2,14 @@ from flask import Flask, jsonify
 from flask_swagger_ui import get_swaggerui_blueprint
 
 from .config.init import DevelopmentConfig, TestingConfig, ProductionConfig
-from .extensions import db, ma, limiter, cache, migrate
+from .extensions import db, ma, limiter, cache, migrate, revocations
+from .caching import configure_cache, revocation_cache_config
+from .db_pool import configure_pool
+from .replica import configure_replica
+from .json_provider import init_json
+from .instrumentation import init_instrumentation
+from .query_log import init_query_log
+from .search import search_cli
 from .models import Customer, Mechanic, ServiceTicket, Inventory
 
 # Blueprints
@@ -10,6 +17,7 @@ from .blueprints.customers import customers_bp
 from .blueprints.mechanics import mechanics_bp
 from .blueprints.service_tickets import service_tickets_bp
 from .blueprints.inventory import inventory_bp
+from .blueprints.metrics import metrics_bp
 
 
 # ----------------------------------------
@@ -34,7 +42,10 @@ def create_app(config_name="DevelopmentConfig"):
     # ------------------------
     # Load Correct Configuration
     # ------------------------
-    if config_name == "TestingConfig":
+    if isinstance(config_name, type):
+        # A config class (e.g. a TestingConfig subclass) can be passed directly.
+        app.config.from_object(config_name)
+    elif config_name == "TestingConfig":
         app.config.from_object(TestingConfig)
     elif config_name == "ProductionConfig":
         app.config.from_object(ProductionConfig)
@@ -49,14 +60,22 @@ def create_app(config_name="DevelopmentConfig"):
     # KEEP IT DELETED.
 
 
+    init_json(app)
+
     # ------------------------
     # Initialize Extensions
     # ------------------------
+    configure_pool(app)
+    configure_replica(app)
     db.init_app(app)
     ma.init_app(app)
+    configure_cache(app)
     cache.init_app(app, config=app.config)
+    revocations.init_app(app, config=revocation_cache_config(app))
     limiter.init_app(app)
     migrate.init_app(app, db)
+    init_instrumentation(app)
+    init_query_log(app)
 
     # ------------------------
     # Register Blueprints
@@ -65,7 +84,9 @@ def create_app(config_name="DevelopmentConfig"):
     app.register_blueprint(mechanics_bp, url_prefix="/mechanics/")
     app.register_blueprint(service_tickets_bp, url_prefix="/service_tickets/")
     app.register_blueprint(inventory_bp, url_prefix="/inventory/")
+    app.register_blueprint(metrics_bp, url_prefix="/metrics")
     app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
+    app.cli.add_command(search_cli)
 
     # ------------------------
     # Default Home Route
@@ -84,9 +105,10 @@ def create_app(config_name="DevelopmentConfig"):
         })
 
     # Only auto-create tables in Testing mode
-    if config_name == "TestingConfig":
+    if app.testing:
         with app.app_context():
-            db.create_all()
+            # Primary only: a replica bind, if any, is populated by replication.
+            db.create_all(bind_key=None)
 
 
     return app
@@ -0,0 +1,277 @@
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from flask import current_app, request
+
+from .async_db import close_request_session, init_async_db, request_session
+from .caching import _view_cache_key
+from .conditional import (
+    Validators, collection_parts, collection_validators, fold_validators, not_modified, row_parts, state_statement, with_validators,
+)
+from .extensions import cache
+from .replica import cacheable, route_reads
+from .streaming import stream_format
+
+
+class AsyncView(NamedTuple):
+    view: Callable
+    # Query args that send a request to the sync view instead (e.g. ?q=).
+    sync_args: Tuple[str, ...]
+
+
+# Flask endpoint ("mechanics.get_mechanics") → its async variant.
+ASYNC_VIEWS: Dict[str, AsyncView] = {}
+
+
+def async_view(blueprint, sync_args: Sequence[str] = ()):
+    """
+    Registers an `async def` as the ASGI variant of the blueprint view of
+    the same name. It matches the sync view's URL rule, takes the same
+    view args and returns what a Flask view returns; the sync view keeps
+    serving WSGI workers and anything listed in `sync_args`.
+    """
+    def decorator(view):
+        ASYNC_VIEWS[f"{blueprint.name}.{view.__name__}"] = AsyncView(view, tuple(sync_args))
+        return view
+    return decorator
+
+
+# ---- Async twins of the read-path decorators ----
+def async_read_replica(view):
+    """replica.read_replica for async views: request_session() follows g.db_route."""
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        route_reads()
+        return await view(*args, **kwargs)
+    return wrapper
+
+
+def async_cached_view(*resources: str, timeout: int = 60):
+    """
+    caching.cached_view for async views. Same keys and stored value as
+    the sync decorator, so WSGI and ASGI workers share cached pages.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            if stream_format() is not None or not cacheable(resources):
+                return await view(*args, **kwargs)
+            key = _view_cache_key(resources)
+            rv = cache.get(key)
+            if rv is None:
+                rv = await view(*args, **kwargs)
+                cache.set(key, rv, timeout=timeout)
+            return rv
+        return wrapper
+    return decorator
+
+
+async def _validators(parts: Sequence) -> Tuple[list, Validators]:
+    result = await request_session().execute(state_statement(parts))
+    return fold_validators(result.all())
+
+
+async def async_collection_state(model) -> Validators:
+    return collection_validators((await _validators(collection_parts(model)))[1])
+
+
+async def async_row_state(model, row_id: int, *related) -> Optional[Validators]:
+    rows, validators = await _validators(row_parts(model, row_id, *related))
+    return validators if rows[0][1] else None
+
+
+def async_conditional(state: Callable, *resources: str, timeout: int = 60):
+    """conditional.conditional for async views; `state` is async_collection_state / async_row_state."""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            if resources and cacheable(resources):
+                key = _view_cache_key(resources, prefix="validators")
+                validators = cache.get(key)
+                if validators is None:
+                    validators = await state(**kwargs)
+                    if validators is not None:
+                        cache.set(key, validators, timeout=timeout)
+            else:
+                validators = await state(**kwargs)
+            if validators is None:
+                return await view(*args, **kwargs)
+
+            response = not_modified(validators)
+            if response is not None:
+                return response
+            response = current_app.make_response(await view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            return with_validators(response, validators)
+        return wrapper
+    return decorator
+
+
+# ---- ASGI application ----
+def _environ(scope, body: bytes) -> dict:
+    """A PEP 3333 environ for an ASGI HTTP scope."""
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf8").decode("latin1"),
+        "PATH_INFO": scope["path"].encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("127.0.0.1", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", ()):
+        name = raw_name.decode("latin1").upper().replace("-", "_")
+        value = raw_value.decode("latin1")
+        if name not in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            name = f"HTTP_{name}"
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    # The body is already buffered (chunked uploads have no header).
+    environ["CONTENT_LENGTH"] = str(len(body))
+    return environ
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def _start(status: int, headers) -> dict:
+    return {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(name.lower().encode("latin1"), value.encode("latin1")) for name, value in headers],
+    }
+
+
+class AsgiApp:
+    """
+    Serves a Flask app under an ASGI server. GET/HEAD requests for an
+    endpoint with a registered async_view run on the event loop, their
+    queries going through the asyncio engine (async_db), so one worker
+    keeps many reads in flight while they wait on the database. Every
+    other request - writes, ?q= search, NDJSON/CSV exports, auth - runs
+    the unchanged WSGI app on a bounded thread pool (ASGI_SYNC_THREADS).
+
+    Both paths share the app's before/after_request hooks (rate limits,
+    instrumentation, replica stickiness), error handlers, cache and JSON
+    provider. Cache calls are synchronous; with a network cache they hold
+    the loop for one round trip.
+    """
+
+    def __init__(self, app, views: Optional[Dict[str, AsyncView]] = None):
+        self.app = app
+        self.views = ASYNC_VIEWS if views is None else views
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config.get("ASGI_SYNC_THREADS", 8), thread_name_prefix="wsgi"
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        environ = _environ(scope, await _read_body(receive))
+        if scope["method"] in ("GET", "HEAD"):
+            with self.app.request_context(environ):
+                view = self._async_view()
+                if view is not None:
+                    response = await self._dispatch(view)
+                    await send(_start(response.status_code, response.headers.to_wsgi_list()))
+                    body = b"" if scope["method"] == "HEAD" else response.get_data()
+                    await send({"type": "http.response.body", "body": body})
+                    return
+            environ["wsgi.input"].seek(0)
+        await self._run_wsgi(environ, send)
+
+    def _async_view(self) -> Optional[Callable]:
+        entry = self.views.get(request.endpoint)
+        if entry is None or request.routing_exception is not None:
+            return None
+        if stream_format() is not None or any(arg in request.args for arg in entry.sync_args):
+            return None
+        return entry.view
+
+    async def _dispatch(self, view):
+        # Flask.full_dispatch_request / wsgi_app, with the view awaited.
+        app = self.app
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await view(**request.view_args)
+            except Exception as err:
+                rv = app.handle_user_exception(err)
+            finally:
+                await close_request_session()
+            return app.finalize_request(rv)
+        except Exception as err:
+            return app.handle_exception(err)
+
+    async def _run_wsgi(self, environ, send):
+        loop = asyncio.get_running_loop()
+
+        def emit(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        def run():
+            started = []
+
+            def start_response(status, headers, exc_info=None):
+                started[:] = [int(status.split(" ", 1)[0]), headers]
+
+            result = self.app(environ, start_response)
+            try:
+                head_sent = False
+                for chunk in result:
+                    if not head_sent:
+                        emit(_start(*started))
+                        head_sent = True
+                    if chunk:
+                        emit({"type": "http.response.body", "body": chunk, "more_body": True})
+                if not head_sent:
+                    emit(_start(*started))
+                emit({"type": "http.response.body", "body": b""})
+            finally:
+                if hasattr(result, "close"):
+                    result.close()
+
+        await loop.run_in_executor(self.executor, run)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    # Fail at boot, not on the first request, without an asyncio driver.
+                    init_async_db(self.app)
+                except Exception as err:
+                    await send({"type": "lifespan.startup.failed", "message": str(err)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await init_async_db(self.app).dispose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,116 @@
+from typing import Dict, Optional
+
+from flask import current_app, g
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from .extensions import db
+
+# Sync driver → asyncio driver for the same database.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+# Sync-only engine options that the asyncio drivers don't take.
+_SYNC_ONLY_OPTIONS = ("poolclass", "connect_args", "creator")
+
+
+def async_url(url: str) -> str:
+    """
+    The asyncio-driver URL for a sync SQLAlchemy URL, e.g.
+    postgresql+psycopg2://... → postgresql+asyncpg://...
+    sqlite:///app.db → sqlite+aiosqlite:///app.db
+    URLs already naming an async driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    if parsed.get_dialect().is_async:
+        return url
+    backend = parsed.get_backend_name()
+    if backend == "sqlite" and parsed.database in (None, "", ":memory:"):
+        raise ValueError("An in-memory SQLite database can't be shared with the asyncio engine; use a file")
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver known for {backend!r} URLs; set ASYNC_DATABASE_URI")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+class AsyncDatabase:
+    """
+    The asyncio engines (one per db bind: the primary, plus the replica
+    when configured) and session factories behind the ASGI read views.
+    Same databases, models and metadata as db; only the driver differs.
+    """
+
+    def __init__(self, engines: Dict[Optional[str], AsyncEngine]):
+        self.engines = engines
+        self.sessions = {
+            bind: async_sessionmaker(engine, expire_on_commit=False) for bind, engine in engines.items()
+        }
+
+    def session(self, bind: Optional[str] = None) -> AsyncSession:
+        return self.sessions[bind if bind in self.sessions else None]()
+
+    async def dispose(self) -> None:
+        for engine in self.engines.values():
+            await engine.dispose()
+
+
+def _engine(app, uri: str) -> AsyncEngine:
+    options = {
+        key: value for key, value in (app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}).items()
+        if key not in _SYNC_ONLY_OPTIONS
+    }
+    if "pool_size" in options:
+        # aiosqlite would otherwise default to NullPool and reject the sizing.
+        options["poolclass"] = AsyncAdaptedQueuePool
+    engine = create_async_engine(async_url(uri), **options)
+    # Same slow-query log and per-request SQL counters as the sync engines.
+    listeners = []
+    if "perf_registry" in app.extensions:
+        from .instrumentation import _before_cursor_execute, _after_cursor_execute, _handle_error
+        listeners.append((_before_cursor_execute, _after_cursor_execute))
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+    if "query_log" in app.extensions:
+        listeners.append((app.extensions["query_log"].before, app.extensions["query_log"].after))
+        event.listen(engine.sync_engine, "handle_error", app.extensions["query_log"].failed)
+    for before, after in listeners:
+        event.listen(engine.sync_engine, "before_cursor_execute", before)
+        event.listen(engine.sync_engine, "after_cursor_execute", after)
+    return engine
+
+
+def init_async_db(app) -> AsyncDatabase:
+    """
+    Creates the app's AsyncDatabase on first use. Only the ASGI entry
+    point calls this, so WSGI workers never load an asyncio driver.
+    ASYNC_DATABASE_URI overrides the URL derived from
+    SQLALCHEMY_DATABASE_URI.
+    """
+    if "async_db" not in app.extensions:
+        # The sync engines' URLs, as Flask-SQLAlchemy resolved them (relative
+        # SQLite paths live under the instance folder).
+        with app.app_context():
+            urls = {bind: engine.url.render_as_string(hide_password=False) for bind, engine in db.engines.items()}
+        if app.config.get("ASYNC_DATABASE_URI"):
+            urls[None] = app.config["ASYNC_DATABASE_URI"]
+        app.extensions["async_db"] = AsyncDatabase({bind: _engine(app, url) for bind, url in urls.items()})
+    return app.extensions["async_db"]
+
+
+def request_session() -> AsyncSession:
+    """
+    The current request's AsyncSession, opened on first use against the
+    bind replica.route_reads() picked. Closed by close_request_session().
+    """
+    if "_async_session" not in g:
+        g._async_session = init_async_db(current_app._get_current_object()).session(g.get("db_route"))
+    return g._async_session
+
+
+async def close_request_session() -> None:
+    session = g.pop("_async_session", None)
+    if session is not None:
+        await session.close()
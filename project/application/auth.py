@@ -1,10 +1,127 @@
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import Callable, Any, Optional
+from typing import Callable, Any, NamedTuple, Optional
 
-from flask import current_app, request, jsonify
+from flask import current_app, g, request, jsonify
 from jose import jwt, JWTError
 
+from .extensions import revocations
+
+_REVOKED_KEY = "jti/%s"
+
+
+class Claims(NamedTuple):
+    customer_id: int
+    # The jti claim or, for tokens minted without one, a digest of the
+    # token itself, so any token can be revoked.
+    jti: str
+    exp: int
+
+
+class ClaimsCache:
+    """
+    Bounded LRU of verified token claims, keyed by a hash of the signing
+    key and the token, so a rotated SECRET_KEY never matches an old entry
+    and raw tokens are never held in memory. Entries past their exp are
+    dropped on lookup; revocation is checked separately on every request.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Claims]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Claims]:
+        with self._lock:
+            claims = self._entries.get(key)
+            if claims is None:
+                return None
+            if claims.exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, key: str, claims: Claims) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = claims
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def claims_cache() -> ClaimsCache:
+    """The current app's ClaimsCache, sized by JWT_CLAIMS_CACHE_SIZE."""
+    extensions = current_app.extensions
+    if "jwt_claims" not in extensions:
+        extensions["jwt_claims"] = ClaimsCache(current_app.config.get("JWT_CLAIMS_CACHE_SIZE", 1024))
+    return extensions["jwt_claims"]
+
+
+def _cache_key(token: str) -> str:
+    config = current_app.config
+    material = "\0".join((config["SECRET_KEY"], config["JWT_ISSUER"], config["JWT_AUDIENCE"], token))
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+def _decode(token: str) -> Claims:
+    payload = jwt.decode(
+        token,
+        current_app.config["SECRET_KEY"],
+        algorithms=["HS256"],
+        issuer=current_app.config["JWT_ISSUER"],
+        audience=current_app.config["JWT_AUDIENCE"],
+    )
+    try:
+        jti = payload.get("jti") or "sha256:" + hashlib.sha256(token.encode()).hexdigest()
+        return Claims(int(payload.get("sub")), jti, int(payload["exp"]))
+    except (KeyError, TypeError, ValueError):
+        raise JWTError("Invalid claims")
+
+
+def verify_token(token: str) -> Claims:
+    """
+    Returns the verified claims of `token`, decoding it only on the first
+    sight. Raises JWTError for bad, expired or revoked tokens.
+    """
+    claims_lru = claims_cache()
+    key = _cache_key(token)
+    claims = claims_lru.get(key)
+    if claims is None:
+        claims = _decode(token)
+        claims_lru.put(key, claims)
+    if revocations.get(_REVOKED_KEY % claims.jti):
+        claims_lru.discard(key)
+        raise JWTError("Token revoked")
+    return claims
+
+
+def revoke_token(token: str, claims: Claims) -> None:
+    """
+    Denylists `claims.jti` in the revocation store until the token would
+    have expired anyway, so every worker rejects it, and drops it from
+    this worker's claims cache.
+    """
+    ttl = int(claims.exp - time.time())
+    if ttl > 0:
+        revocations.set(_REVOKED_KEY % claims.jti, True, timeout=ttl)
+    claims_cache().discard(_cache_key(token))
+
+
 def encode_token(customer_id: int) -> str:
     """
     Returns a JWT for the given customer_id.
@@ -18,6 +135,7 @@ def encode_token(customer_id: int) -> str:
         "iat": int(now.timestamp()),
         "exp": int(exp.timestamp()),
         "role": "customer",
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm="HS256")
 
@@ -33,17 +151,11 @@ def token_required(fn: Callable[..., Any]):
             return jsonify({"error": "Missing or invalid Authorization header"}), 401
         token = auth.split(" ", 1)[1].strip()
         try:
-            payload = jwt.decode(
-                token,
-                current_app.config["SECRET_KEY"],
-                algorithms=["HS256"],
-                issuer=current_app.config["JWT_ISSUER"],
-                audience=current_app.config["JWT_AUDIENCE"],
-            )
-            customer_id = int(payload.get("sub"))
+            claims = verify_token(token)
         except JWTError:
             return jsonify({"error": "Invalid or expired token"}), 401
 
-        kwargs["customer_id"] = customer_id
+        g.token, g.token_claims = token, claims
+        kwargs["customer_id"] = claims.customer_id
         return fn(*args, **kwargs)
     return wrapper
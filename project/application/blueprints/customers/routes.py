@@ -1,14 +1,32 @@
 from math import ceil
-from flask import request, jsonify
+from flask import current_app, g, request, jsonify
 from sqlalchemy import select
-from werkzeug.security import generate_password_hash, check_password_hash
 from marshmallow import ValidationError
 
-from ...extensions import db, limiter, cache
-from ...models import Customer, ServiceTicket
-from ...auth import encode_token
+from ...extensions import db, limiter
+from ...caching import cached_view, bump
+from ...replica import read_replica
+from ...pagination import count_rows, decode_cursor, keyset_page, parse_limit
+from ...models import Customer, ServiceTicket, service_mechanics
+from ...auth import encode_token, token_required, revoke_token
+from ...passwords import HasherBusy, hash_password, verify_password
+from ...ticket_counts import adjust_ticket_counts
+from ...invoices import forget_totals
+from ...streaming import stream_format, stream_response
+from ...serializers import schema_columns
+from ...search import search_response
+from ...bulk import BulkResult, read_items, load_items, reject_taken, insert_chunks
 from . import customers_bp
-from .schemas import customer_schema, customer_public, customers_public, login_schema
+from .schemas import (
+    customer_schema, customer_public, customers_bulk, login_schema,
+    customer_public_dump, customers_public_dump,
+)
+
+
+# KDF slots saturated (login storm): shed load instead of queueing forever.
+@customers_bp.errorhandler(HasherBusy)
+def hasher_busy(err):
+    return jsonify({"error": "Too many password operations in flight, retry shortly"}), 503, {"Retry-After": "1"}
 
 
 # =============================================================
@@ -29,39 +47,102 @@ def create_customer():
     if exists:
         return jsonify({"error": "Email already exists"}), 400
 
-    data.password_hash = generate_password_hash(
-        request.json["password"], method="pbkdf2:sha256"
-    )
+    data.password_hash = hash_password(request.json["password"])
 
     db.session.add(data)
     db.session.commit()
+    bump("customers")
 
     return customer_public.jsonify(data), 201
 
 
+# =============================================================
+# POST /customers/bulk  → Create many (JSON array or NDJSON)
+# =============================================================
+@customers_bp.post("/bulk")
+@limiter.limit("5/minute")
+def create_customers_bulk():
+    try:
+        # Every item is a full password hash, so batches stay small.
+        items = read_items(current_app.config.get("BULK_MAX_PASSWORDS", 20))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    result = BulkResult(len(items))
+    valid = load_items(customers_bulk, items, result)
+    reject_taken(valid, "email", Customer.email, result, "Email already exists")
+
+    rows = {}
+    for index, data in valid.items():
+        password = data.pop("password")
+        data["password_hash"] = hash_password(password)
+        rows[index] = data
+
+    insert_chunks(Customer, rows, result)
+    bump("customers")
+    return result.response()
+
+
 # =============================================================
 # GET /customers/  → List
 # =============================================================
 @customers_bp.get("/")
-@cache.cached(timeout=60, query_string=True)
+@read_replica
+@cached_view("customers", timeout=60)
 def get_customers():
-    page = max(int(request.args.get("page", 1)), 1)
-    per_page = min(max(int(request.args.get("per_page", 10)), 1), 100)
-
-    stmt = select(Customer).order_by(Customer.id.asc())
-    total = db.session.execute(select(db.func.count()).select_from(Customer)).scalar() or 0
-
-    customers = db.session.execute(
-        stmt.limit(per_page).offset((page - 1) * per_page)
-    ).scalars().all()
+    """
+    Offset mode: ?page=1&per_page=10
+    Seek mode:   ?cursor=<next_cursor>&per_page=10 (pass an empty cursor for the first page)
+    Either mode: ?count=exact|estimate|none
+    Search:      ?q=smith 555&page=1&per_page=10 (name, email, phone; ranked)
+    Accept: application/x-ndjson or text/csv streams every customer instead.
+    """
+    # Plain rows carrying exactly the public columns; no ORM hydration.
+    columns = select(*schema_columns(customer_public, Customer))
+
+    if "q" in request.args:
+        return search_response(
+            Customer, lambda ids: db.session.execute(columns.where(Customer.id.in_(ids))).all(),
+            customers_public_dump, size_arg="per_page"
+        )
+
+    fmt = stream_format()
+    if fmt:
+        return stream_response(
+            columns.order_by(Customer.id.asc()),
+            customer_public_dump, fmt, ["id", "name", "email", "phone"], scalars=False
+        )
 
-    return jsonify({
+    try:
+        per_page = min(max(int(request.args.get("per_page", 10)), 1), 100)
+        if "cursor" in request.args:
+            page = None
+            after_id = decode_cursor(request.args.get("cursor"))
+        else:
+            page = max(int(request.args.get("page", 1)), 1)
+        total = count_rows(Customer, request.args.get("count", "exact"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    body = {
         "page": page,
         "per_page": per_page,
         "total": total,
-        "pages": ceil(total / per_page),
-        "items": customers_public.dump(customers)
-    }), 200
+        "pages": ceil(total / per_page) if total is not None else None,
+    }
+
+    if page is None:
+        customers, body["next_cursor"] = keyset_page(
+            columns, Customer.id, after_id, per_page, scalars=False
+        )
+    else:
+        customers = db.session.execute(
+            columns.order_by(Customer.id.asc())
+            .limit(per_page).offset((page - 1) * per_page)
+        ).all()
+
+    body["items"] = customers_public_dump(customers)
+    return jsonify(body), 200
 
 
 # =============================================================
@@ -72,7 +153,7 @@ def get_customer(customer_id: int):
     cust = db.session.get(Customer, customer_id)
     if not cust:
         return jsonify({"error": "Customer not found"}), 404
-    return customer_public.jsonify(cust), 200
+    return jsonify(customer_public_dump(cust)), 200
 
 
 # =============================================================
@@ -87,14 +168,14 @@ def update_customer(customer_id: int):
     payload = request.json or {}
 
     if "password" in payload:
-        cust.password_hash = generate_password_hash(payload.pop("password"))
+        cust.password_hash = hash_password(payload.pop("password"))
 
     for key in ("name", "email", "phone"):
         if key in payload:
             setattr(cust, key, payload[key])
 
     db.session.commit()
-    cache.delete_memoized(get_customers)
+    bump("customers")
     return customer_public.jsonify(cust), 200
 
 
@@ -107,9 +188,18 @@ def delete_customer(customer_id: int):
     if not cust:
         return jsonify({"error": "Customer not found"}), 404
 
+    # Their tickets cascade, taking the mechanic assignments with them.
+    assigned = db.session.scalars(
+        select(service_mechanics.c.mechanic_id)
+        .join(ServiceTicket, ServiceTicket.id == service_mechanics.c.ticket_id)
+        .where(ServiceTicket.customer_id == customer_id)
+    ).all()
+    adjust_ticket_counts(removed=assigned)
+    ticket_ids = [t.id for t in cust.tickets]
     db.session.delete(cust)
     db.session.commit()
-    cache.delete_memoized(get_customers)
+    forget_totals(ticket_ids)
+    bump("customers", "tickets")  # tickets cascade with the customer
 
     return jsonify({"message": "Customer deleted"}), 200
 
@@ -128,27 +218,63 @@ def login():
         select(Customer).where(Customer.email == data["email"])
     ).scalars().first()
 
-    if not cust or not check_password_hash(cust.password_hash, data["password"]):
+    if not cust:
         return jsonify({"error": "Invalid credentials"}), 401
+    matches, needs_rehash = verify_password(cust.password_hash, data["password"])
+    if not matches:
+        return jsonify({"error": "Invalid credentials"}), 401
+
+    if needs_rehash:
+        # Hashing policy changed since this hash was made; upgrade it now
+        # that we have the plaintext.
+        cust.password_hash = hash_password(data["password"])
+        db.session.commit()
 
     token = encode_token(cust.id)
     return jsonify({"token": token}), 200
 
 
+# =============================================================
+# POST /customers/logout/
+# =============================================================
+@customers_bp.post("/logout/")
+@token_required
+def logout(customer_id: int):
+    revoke_token(g.token, g.token_claims)
+    return jsonify({"message": "Logged out"}), 200
+
+
 # =============================================================
 # GET /customers/my-tickets/
 # =============================================================
 @customers_bp.get("/my-tickets/")
-def my_tickets():
-    tickets = db.session.execute(
-        select(ServiceTicket).order_by(ServiceTicket.id.asc())
-    ).scalars().all()
-
-    items = [{
-        "ticket_id": t.id,
-        "VIN": t.VIN,
-        "service_date": t.service_date.isoformat(),
-        "service_desc": t.service_desc
-    } for t in tickets]
-
-    return jsonify(items), 200
+@token_required
+def my_tickets(customer_id: int):
+    """
+    ?limit=25&cursor=<next_cursor>
+    """
+    try:
+        after_id = decode_cursor(request.args.get("cursor"))
+        limit = parse_limit(request.args.get("limit"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    # Plain column rows straight off ix_service_tickets_customer_id; no ORM hydration.
+    stmt = select(
+        ServiceTicket.id,
+        ServiceTicket.VIN,
+        ServiceTicket.service_date,
+        ServiceTicket.service_desc,
+    ).where(ServiceTicket.customer_id == customer_id)
+    rows, next_cursor = keyset_page(stmt, ServiceTicket.id, after_id, limit, scalars=False)
+
+    return jsonify({
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "items": [{
+            "ticket_id": r.id,
+            "VIN": r.VIN,
+            "service_date": r.service_date.isoformat(),
+            "service_desc": r.service_desc
+        } for r in rows]
+    }), 200
@@ -1,5 +1,6 @@
 from marshmallow import fields, validate
 from ...extensions import ma, db
+from ...serializers import compile_schema
 from ...models import Customer
 
 class CustomerSchema(ma.SQLAlchemySchema):
@@ -41,4 +42,9 @@ class LoginSchema(ma.Schema):
 customer_schema = CustomerSchema()
 customer_public = CustomerPublicSchema()
 customers_public = CustomerPublicSchema(many=True)
+customers_bulk = CustomerSchema(many=True, load_instance=False)
+
+# Compiled equivalents of .dump() for the read paths
+customer_public_dump = compile_schema(customer_public)
+customers_public_dump = compile_schema(customers_public)
 login_schema = LoginSchema()
@@ -0,0 +1,41 @@
+from flask import request, jsonify
+
+from project.application.async_db import request_session
+from project.application.asgi import (
+    async_view, async_read_replica, async_conditional, async_cached_view, async_collection_state, async_row_state,
+)
+from project.application.models import Inventory
+from . import inventory_bp
+from .routes import _list_statement
+from .schemas import inventory_dump, inventories_query
+
+# ASGI variants of the read views in routes.py (see application/asgi.py).
+
+
+# ============================================================
+# LIST PARTS → GET /inventory and /inventory/ (?q= stays on routes.py)
+# ============================================================
+@async_view(inventory_bp, sync_args=("q",))
+@async_read_replica
+@async_conditional(lambda: async_collection_state(Inventory), "inventory")
+@async_cached_view("inventory", timeout=60)
+async def get_parts():
+    try:
+        spec = inventories_query.parse(request.args)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    dump = inventories_query.dumper(spec)
+    parts = (await request_session().execute(_list_statement(spec))).all()
+    return jsonify([dump(p) for p in parts]), 200
+
+
+# ============================================================
+# GET SINGLE PART → GET /inventory/<id>
+# ============================================================
+@async_view(inventory_bp)
+@async_conditional(lambda part_id: async_row_state(Inventory, part_id), "inventory")
+async def get_part(part_id: int):
+    part = await request_session().get(Inventory, part_id)
+    if not part:
+        return jsonify({"error": "Part not found"}), 404
+    return jsonify(inventory_dump(part)), 200
@@ -3,9 +3,19 @@ from sqlalchemy import select
 from marshmallow import ValidationError
 
 from project.application.extensions import db, limiter
+from project.application.caching import cached_view, bump
+from project.application.replica import read_replica
+from project.application.conditional import conditional, collection_state, row_state
+from project.application.streaming import stream_format, stream_response
+from project.application.serializers import schema_columns
+from project.application.search import search_response
+from project.application.bulk import BulkResult, read_items, load_items, insert_chunks
+from project.application.invoices import forget_totals, tickets_using_part
 from project.application.models import Inventory
 from . import inventory_bp
-from .schemas import inventory_schema, inventories_schema
+from .schemas import (
+    inventory_schema, inventories_bulk, inventory_dump, inventories_dump, inventories_query,
+)
 
 
 # ============================================================
@@ -22,30 +32,81 @@ def create_part():
 
     db.session.add(part)
     db.session.commit()
+    bump("inventory")
     return inventory_schema.jsonify(part), 201
 
 
+# ============================================================
+# BULK CREATE PARTS → POST /inventory/bulk (JSON array or NDJSON)
+# ============================================================
+@inventory_bp.post("bulk")
+@limiter.limit("5/minute")
+def create_parts_bulk():
+    try:
+        items = read_items()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    result = BulkResult(len(items))
+    valid = load_items(inventories_bulk, items, result)
+    insert_chunks(Inventory, valid, result)
+    bump("inventory")
+    return result.response()
+
+
+def _list_statement(spec):
+    return (
+        select(*inventories_query.columns(spec))
+        .where(*inventories_query.where(spec))
+        .order_by(*inventories_query.order_by(spec))
+    )
+
+
 # ============================================================
 # LIST PARTS → GET /inventory and /inventory/
 # ============================================================
 @inventory_bp.get("")
 @inventory_bp.get("/")
+@read_replica
+@conditional(lambda: collection_state(Inventory), "inventory")
+@cached_view("inventory", timeout=60)
 def get_parts():
-    parts = db.session.execute(
-        select(Inventory).order_by(Inventory.id.asc())
-    ).scalars().all()
-    return inventories_schema.jsonify(parts), 200
+    """
+    ?q=brake pad&page=1&limit=25 → ranked name search instead of the full list.
+    ?filter[price][lte]=20&sort=-price&fields=id,name → filtered/sorted/sparse, in SQL.
+    """
+    if "q" in request.args:
+        columns = select(*schema_columns(inventory_schema, Inventory))
+        return search_response(
+            Inventory, lambda ids: db.session.execute(columns.where(Inventory.id.in_(ids))).all(),
+            inventories_dump
+        )
+
+    try:
+        spec = inventories_query.parse(request.args)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    stmt = _list_statement(spec)
+    dump = inventories_query.dumper(spec)
+
+    fmt = stream_format()
+    if fmt:
+        return stream_response(stmt, dump, fmt, list(spec.fields or ("id", "name", "price")), scalars=False)
+
+    parts = db.session.execute(stmt).all()
+    return jsonify([dump(p) for p in parts]), 200
 
 
 # ============================================================
 # GET SINGLE PART → GET /inventory/<id>
 # ============================================================
 @inventory_bp.get("<int:part_id>")
+@conditional(lambda part_id: row_state(Inventory, part_id), "inventory")
 def get_part(part_id: int):
     part = db.session.get(Inventory, part_id)
     if not part:
         return jsonify({"error": "Part not found"}), 404
-    return inventory_schema.jsonify(part), 200
+    return jsonify(inventory_dump(part)), 200
 
 
 # ============================================================
@@ -60,10 +121,14 @@ def update_part(part_id: int):
     payload = request.json or {}
     if "name" in payload:
         part.name = payload["name"]
-    if "price" in payload:
+    repriced = []
+    if "price" in payload and payload["price"] != part.price:
         part.price = payload["price"]
+        repriced = tickets_using_part(part_id)
 
     db.session.commit()
+    forget_totals(repriced)
+    bump("inventory")
     return inventory_schema.jsonify(part), 200
 
 
@@ -76,6 +141,9 @@ def delete_part(part_id: int):
     if not part:
         return jsonify({"error": "Part not found"}), 404
 
+    used_by = tickets_using_part(part_id)
     db.session.delete(part)
     db.session.commit()
+    forget_totals(used_by)
+    bump("inventory", "tickets")
     return jsonify({"message": "Part deleted"}), 200
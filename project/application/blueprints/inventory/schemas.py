@@ -1,4 +1,6 @@
 from project.application.extensions import ma, db
+from project.application.serializers import compile_schema
+from project.application.query_spec import CollectionSpec
 from project.application.models import Inventory
 
 class InventorySchema(ma.SQLAlchemyAutoSchema):
@@ -6,6 +8,7 @@ class InventorySchema(ma.SQLAlchemyAutoSchema):
         model = Inventory
         load_instance = True
         sqla_session = db.session
+        exclude = ("version", "updated_at")
 
     id = ma.auto_field(dump_only=True)
     name = ma.auto_field(required=True)
@@ -13,3 +16,13 @@ class InventorySchema(ma.SQLAlchemyAutoSchema):
 
 inventory_schema = InventorySchema()
 inventories_schema = InventorySchema(many=True)
+inventories_bulk = InventorySchema(many=True, load_instance=False)
+
+# Compiled equivalents of .dump() for the read paths
+inventory_dump = compile_schema(inventory_schema)
+inventories_dump = compile_schema(inventories_schema)
+
+# ?filter[...]/sort=/fields= on GET /inventory/
+inventories_query = CollectionSpec(
+    inventory_schema, filters=("id", "name", "price"), sorts=("id", "name", "price")
+)
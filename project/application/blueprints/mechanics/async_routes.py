@@ -0,0 +1,45 @@
+from flask import request, jsonify
+
+from project.application.async_db import request_session
+from project.application.asgi import (
+    async_view, async_read_replica, async_conditional, async_cached_view, async_collection_state, async_row_state,
+)
+from project.application.models import Mechanic
+from . import mechanics_bp
+from .routes import _list_statement, _leaderboard_statement, _leaderboard_rows
+from .schemas import mechanic_dump, mechanics_query
+
+# ASGI variants of the read views in routes.py (see application/asgi.py).
+
+# GET '/'
+@async_view(mechanics_bp)
+@async_conditional(lambda: async_collection_state(Mechanic), "mechanics")
+@async_cached_view("mechanics", timeout=60)
+async def get_mechanics():
+    try:
+        spec = mechanics_query.parse(request.args)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    dump = mechanics_query.dumper(spec)
+    mechs = (await request_session().execute(_list_statement(spec))).all()
+    return jsonify([dump(m) for m in mechs]), 200
+
+# GET '/<id>'
+@async_view(mechanics_bp)
+@async_conditional(lambda mechanic_id: async_row_state(Mechanic, mechanic_id), "mechanics")
+async def get_mechanic(mechanic_id: int):
+    mech = await request_session().get(Mechanic, mechanic_id)
+    if not mech:
+        return jsonify({"error": "Mechanic not found"}), 404
+    return jsonify(mechanic_dump(mech)), 200
+
+# GET '/leaderboard'
+@async_view(mechanics_bp)
+@async_read_replica
+@async_cached_view("mechanics", "tickets", timeout=60)
+async def leaderboard():
+    try:
+        stmt = _leaderboard_statement()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify(_leaderboard_rows((await request_session().execute(stmt)).all())), 200
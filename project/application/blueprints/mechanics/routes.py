@@ -1,11 +1,19 @@
+import click
 from flask import request, jsonify
-from sqlalchemy import select, func
+from sqlalchemy import select
 from marshmallow import ValidationError
 
 from project.application.extensions import db, limiter
-from project.application.models import Mechanic, ServiceTicket, service_mechanics
+from project.application.caching import cached_view, bump
+from project.application.replica import read_replica
+from project.application.conditional import conditional, collection_state, row_state
+from project.application.streaming import stream_format, stream_response
+from project.application.bulk import BulkResult, read_items, load_items, reject_taken, insert_chunks
+from project.application.models import Mechanic
+from project.application.pagination import parse_limit
+from project.application.ticket_counts import reconcile_ticket_counts
 from . import mechanics_bp
-from .schemas import mechanic_schema, mechanics_schema   # <-- only mechanic schemas
+from .schemas import mechanic_schema, mechanics_bulk, mechanic_dump, mechanics_query   # <-- only mechanic schemas
 
 # POST '/'
 @mechanics_bp.post("/")
@@ -23,23 +31,65 @@ def create_mechanic():
         return jsonify({"error": "Mechanic email already exists"}), 400
     db.session.add(data)
     db.session.commit()
+    bump("mechanics")
     return mechanic_schema.jsonify(data), 201
 
+# POST '/bulk' : JSON array or NDJSON of mechanics
+@mechanics_bp.post("/bulk")
+@limiter.limit("5/minute")
+def create_mechanics_bulk():
+    try:
+        items = read_items()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    result = BulkResult(len(items))
+    valid = load_items(mechanics_bulk, items, result)
+    reject_taken(valid, "email", Mechanic.email, result, "Mechanic email already exists")
+    insert_chunks(Mechanic, valid, result)
+    bump("mechanics")
+    return result.response()
+
+def _list_statement(spec):
+    # Only the requested columns are selected, filtered and ordered in SQL.
+    return (
+        select(*mechanics_query.columns(spec))
+        .where(*mechanics_query.where(spec))
+        .order_by(*mechanics_query.order_by(spec))
+    )
+
 # GET '/'
 @mechanics_bp.get("/")
+@conditional(lambda: collection_state(Mechanic), "mechanics")
+@cached_view("mechanics", timeout=60)
 def get_mechanics():
-    mechs = db.session.execute(
-        select(Mechanic).order_by(Mechanic.id.asc())
-    ).scalars().all()
-    return mechanics_schema.jsonify(mechs), 200
+    """
+    ?filter[salary][gte]=4000&filter[name][in]=Ann,Bob&sort=-salary&fields=id,name
+    """
+    try:
+        spec = mechanics_query.parse(request.args)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    stmt = _list_statement(spec)
+    dump = mechanics_query.dumper(spec)
+
+    fmt = stream_format()
+    if fmt:
+        return stream_response(
+            stmt, dump, fmt, list(spec.fields or ("id", "name", "email", "phone", "salary")), scalars=False
+        )
+    mechs = db.session.execute(stmt).all()
+    return jsonify([dump(m) for m in mechs]), 200
 
 # GET '/<id>'
 @mechanics_bp.get("/<int:mechanic_id>")
+@conditional(lambda mechanic_id: row_state(Mechanic, mechanic_id), "mechanics")
 def get_mechanic(mechanic_id: int):
     mech = db.session.get(Mechanic, mechanic_id)
     if not mech:
         return jsonify({"error": "Mechanic not found"}), 404
-    return mechanic_schema.jsonify(mech), 200
+    return jsonify(mechanic_dump(mech)), 200
 
 # PUT '/<id>'
 @mechanics_bp.put("/<int:mechanic_id>")
@@ -52,6 +102,7 @@ def update_mechanic(mechanic_id: int):
         if key in payload:
             setattr(mech, key, payload[key])
     db.session.commit()
+    bump("mechanics")
     return mechanic_schema.jsonify(mech), 200
 
 # DELETE '/<id>'
@@ -63,22 +114,43 @@ def delete_mechanic(mechanic_id: int):
     mech.tickets.clear()
     db.session.delete(mech)
     db.session.commit()
+    bump("mechanics", "tickets")
     return jsonify({"message": "Mechanic deleted"}), 200
 
 # GET '/leaderboard'
 @mechanics_bp.get("/leaderboard")
+@read_replica
+@cached_view("mechanics", "tickets", timeout=60)
 def leaderboard():
-    rows = db.session.execute(
-        select(
-            Mechanic.id,
-            Mechanic.name,
-            func.count(service_mechanics.c.ticket_id).label("ticket_count")
-        )
-        .join(service_mechanics, Mechanic.id == service_mechanics.c.mechanic_id, isouter=True)
-        .group_by(Mechanic.id, Mechanic.name)
-        .order_by(func.count(service_mechanics.c.ticket_id).desc(), Mechanic.id.asc())
-    ).all()
-    return jsonify([
+    """
+    ?limit=10 → top 10 only. Reads the maintained ticket_count through
+    ix_mechanics_leaderboard, so a top-K page is an index walk of K rows.
+    """
+    try:
+        stmt = _leaderboard_statement()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    return jsonify(_leaderboard_rows(db.session.execute(stmt).all())), 200
+
+def _leaderboard_statement():
+    stmt = select(Mechanic.id, Mechanic.name, Mechanic.ticket_count).order_by(
+        Mechanic.ticket_count.desc(), Mechanic.id.asc()
+    )
+    if "limit" in request.args:
+        stmt = stmt.limit(parse_limit(request.args.get("limit")))
+    return stmt
+
+def _leaderboard_rows(rows):
+    return [
         {"mechanic_id": r.id, "name": r.name, "ticket_count": int(r.ticket_count)}
         for r in rows
-    ]), 200
+    ]
+
+# CLI: flask --app flask_app mechanics reconcile-counts
+@mechanics_bp.cli.command("reconcile-counts")
+def reconcile_counts():
+    """Rebuild every mechanic's ticket_count from service_mechanics."""
+    drifted = reconcile_ticket_counts()
+    db.session.commit()
+    bump("mechanics")
+    click.echo(f"Reconciled ticket_count for {drifted} mechanic(s).")
@@ -1,4 +1,6 @@
 from ...extensions import ma, db
+from ...serializers import compile_schema
+from ...query_spec import CollectionSpec
 from ...models import Mechanic
 
 class MechanicSchema(ma.SQLAlchemySchema):
@@ -15,3 +17,13 @@ class MechanicSchema(ma.SQLAlchemySchema):
 
 mechanic_schema = MechanicSchema()
 mechanics_schema = MechanicSchema(many=True)
+mechanics_bulk = MechanicSchema(many=True, load_instance=False)
+
+# Compiled equivalents of .dump() for the read paths
+mechanic_dump = compile_schema(mechanic_schema)
+mechanics_dump = compile_schema(mechanics_schema)
+
+# ?filter[...]/sort=/fields= on GET /mechanics/
+mechanics_query = CollectionSpec(
+    mechanic_schema, filters=("id", "name", "email", "salary"), sorts=("id", "name", "salary")
+)
@@ -0,0 +1,3 @@
+from flask import Blueprint
+metrics_bp = Blueprint("metrics", __name__)
+from . import routes  # noqa: E402,F401
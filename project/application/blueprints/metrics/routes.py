@@ -0,0 +1,54 @@
+import hmac
+
+from flask import abort, current_app, request, jsonify
+
+from ...extensions import db, limiter
+from ...db_pool import pool_status
+from ...instrumentation import CONTENT_TYPE
+from . import metrics_bp
+
+
+@metrics_bp.before_request
+def require_metrics_token():
+    # Shared secret so pool internals aren't public. Optional in development;
+    # with METRICS_REQUIRE_TOKEN (production) no token means no metrics.
+    expected = current_app.config.get("METRICS_TOKEN")
+    if not expected:
+        if current_app.config.get("METRICS_REQUIRE_TOKEN"):
+            return jsonify({"error": "Metrics are disabled until METRICS_TOKEN is set"}), 403
+        return None
+    supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied.encode(), expected.encode()):
+        return jsonify({"error": "Missing or invalid metrics token"}), 401
+    return None
+
+
+# ============================================================
+# PROMETHEUS SCRAPE → GET /metrics
+# ============================================================
+@metrics_bp.get("")
+@limiter.exempt
+def prometheus():
+    """Per-endpoint request metrics; 404 unless PERF_INSTRUMENTATION is on."""
+    registry = current_app.extensions.get("perf_registry")
+    if registry is None:
+        abort(404)
+    return registry.render(), 200, {"Content-Type": CONTENT_TYPE}
+
+
+# ============================================================
+# POOL HEALTH → GET /metrics/pool
+# ============================================================
+@metrics_bp.get("/pool")
+@limiter.exempt
+def pool():
+    """
+    This worker's connection pool: size, checked in/out, overflow in use,
+    and checkout wait stats (mean/max/percentiles/histogram, timeouts).
+    The replica pool, when configured, is reported under "replica".
+    Numbers are per process; aggregate across workers when sizing.
+    """
+    status = pool_status(db.engine)
+    if "replica" in db.engines:
+        status["replica"] = pool_status(db.engines["replica"])
+    return jsonify(status), 200
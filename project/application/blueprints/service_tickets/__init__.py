@@ -1,3 +1,3 @@
 from flask import Blueprint
 service_tickets_bp = Blueprint("service_tickets", __name__)
-from . import routes  # noqa: E402,F401
+from . import routes, async_routes  # noqa: E402,F401
@@ -0,0 +1,53 @@
+from flask import request, jsonify
+
+from ...async_db import request_session
+from ...asgi import async_view, async_read_replica, async_conditional, async_cached_view, async_row_state
+from ...models import ServiceTicket
+from ...pagination import decode_cursor, parse_limit, keyset_statement, finish_keyset_page
+from ...loaders import loader_options
+from ...query_spec import seek_statement, finish_seek_page
+from . import service_tickets_bp
+from .routes import _list_statement
+from .schemas import ticket_schema, ticket_dump, tickets_query
+
+# ASGI variants of the read views in routes.py (see application/asgi.py).
+
+# GET '/' : List one keyset page (?q= search stays on routes.py)
+@async_view(service_tickets_bp, sync_args=("q",))
+@async_read_replica
+@async_cached_view("tickets", "mechanics", "inventory", timeout=60)
+async def get_tickets():
+    try:
+        spec = tickets_query.parse(request.args)
+        limit = parse_limit(request.args.get("limit"))
+        stmt = _list_statement(spec)
+        if spec.sort:
+            stmt = seek_statement(tickets_query, spec, stmt, request.args.get("cursor"), limit)
+        else:
+            stmt = keyset_statement(stmt, ServiceTicket.id, decode_cursor(request.args.get("cursor")), limit)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    rows = (await request_session().scalars(stmt)).all()
+    if spec.sort:
+        tickets, next_cursor = finish_seek_page(tickets_query, spec, rows, limit)
+    else:
+        tickets, next_cursor = finish_keyset_page(rows, ServiceTicket.id, limit)
+    dump = tickets_query.dumper(spec)
+    return jsonify({
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "items": [dump(t) for t in tickets]
+    }), 200
+
+# GET '/<id>'
+@async_view(service_tickets_bp)
+@async_conditional(
+    lambda ticket_id: async_row_state(ServiceTicket, ticket_id, ServiceTicket.mechanics, ServiceTicket.parts),
+    "tickets", "mechanics", "inventory",
+)
+async def get_ticket(ticket_id: int):
+    ticket = await request_session().get(ServiceTicket, ticket_id, options=loader_options(ticket_schema))
+    if not ticket:
+        return jsonify({"error": "Ticket not found"}), 404
+    return jsonify(ticket_dump(ticket)), 200
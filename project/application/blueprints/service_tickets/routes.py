@@ -1,17 +1,41 @@
+import datetime
 from functools import wraps
 from flask import request, jsonify
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 
-from ...extensions import db, limiter, cache
-from ...models import ServiceTicket, Mechanic, Customer, Inventory
+from ...extensions import db, limiter
+from ...caching import cached_view, bump
+from ...replica import read_replica
+from ...conditional import conditional, row_state
+from ...models import ServiceTicket, Mechanic, Customer, service_mechanics
 from ...auth import token_required
+from ...pagination import decode_cursor, parse_limit, keyset_page
+from ...loaders import loader_options
+from ...streaming import stream_format, stream_response
+from ...bulk import BulkResult, read_items, load_items, insert_chunks
+from ...ticket_counts import adjust_ticket_counts
+from ...ticket_parts import missing_parts, attach_parts, part_lines
+from ...search import search_response
+from ...query_spec import seek_page
+from ...invoices import (
+    GROUPINGS, invoice_lines, ticket_totals, forget_totals,
+    totals_by_ticket, totals_by_customer, totals_by_date,
+)
+from ...ticket_mechanics import parse_ids, missing_mechanics, change_mechanics, replace_mechanics, assign_new_ticket
 from . import service_tickets_bp
-from .schemas import ticket_schema, tickets_schema
+from .schemas import ticket_schema, tickets_schema, tickets_bulk, ticket_dump, tickets_dump, part_lines_schema, tickets_query
 
 def _verify_customer(customer_id: int) -> bool:
     return db.session.get(Customer, customer_id) is not None
 
+def _load_ticket(ticket_id: int):
+    """Fetch a ticket with everything ticket_schema dumps eager-loaded."""
+    return db.session.get(
+        ServiceTicket, ticket_id,
+        options=loader_options(ticket_schema), populate_existing=True
+    )
+
 # POST '/' : Create ticket
 @service_tickets_bp.post("/")
 @limiter.limit("15/minute")
@@ -27,45 +51,162 @@ def create_ticket():
     }
     """
     payload = request.json or {}
-    mechanic_ids = payload.pop("mechanic_ids", [])
     try:
+        mechanic_ids = parse_ids(payload.pop("mechanic_ids", None), "mechanic_ids")
         ticket = ticket_schema.load(payload)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
     except Exception as e:
         return jsonify(getattr(e, "messages", {"error": "Invalid data"})), 400
 
     if not _verify_customer(ticket.customer_id):
         return jsonify({"error": f"customer_id {ticket.customer_id} not found"}), 400
 
-    if mechanic_ids:
-        mechs = db.session.execute(select(Mechanic).where(Mechanic.id.in_(mechanic_ids))).scalars().all()
-        if len(mechs) != len(set(mechanic_ids)):
-            return jsonify({"error": "One or more mechanic_ids not found"}), 400
-        ticket.mechanics = mechs
+    if missing_mechanics(mechanic_ids):
+        return jsonify({"error": "One or more mechanic_ids not found"}), 400
 
     db.session.add(ticket)
     try:
+        db.session.flush()
+        assign_new_ticket(ticket.id, mechanic_ids)
         db.session.commit()
     except IntegrityError:
         db.session.rollback()
         return jsonify({"error": "Foreign key error (customer/mechanic)."}), 400
 
-    cache.delete_memoized(get_tickets)
-    return ticket_schema.jsonify(ticket), 201
+    bump("tickets")
+    return ticket_schema.jsonify(_load_ticket(ticket.id)), 201
+
+# POST '/bulk' : Create many tickets (JSON array or NDJSON)
+@service_tickets_bp.post("/bulk")
+@limiter.limit("5/minute")
+def create_tickets_bulk():
+    """
+    Each item is a create_ticket payload, mechanic_ids included.
+    Customers and mechanics for the whole batch are checked with one
+    query each; tickets and their mechanic rows are inserted per chunk.
+    """
+    try:
+        items = read_items()
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    result = BulkResult(len(items))
+    mechanic_ids = {}
+    payloads = []
+    for index, item in enumerate(items):
+        if isinstance(item, dict):
+            item = dict(item)
+            mechanic_ids[index] = item.pop("mechanic_ids", None)
+        payloads.append(item)
+
+    valid = load_items(tickets_bulk, payloads, result)
+    for index in list(valid):
+        try:
+            mechanic_ids[index] = set(parse_ids(mechanic_ids[index], "mechanic_ids"))
+        except ValueError as err:
+            result.failed(index, {"mechanic_ids": [str(err)]})
+            del valid[index]
 
-# GET '/' : List all (cached)
+    customer_ids = {row["customer_id"] for row in valid.values()}
+    known_customers = set(db.session.scalars(
+        select(Customer.id).where(Customer.id.in_(customer_ids))
+    )) if customer_ids else set()
+    wanted_mechanics = set().union(*(mechanic_ids.get(i, set()) for i in valid))
+    known_mechanics = set(db.session.scalars(
+        select(Mechanic.id).where(Mechanic.id.in_(wanted_mechanics))
+    )) if wanted_mechanics else set()
+
+    for index in list(valid):
+        if valid[index]["customer_id"] not in known_customers:
+            result.failed(index, {"customer_id": [f"customer_id {valid[index]['customer_id']} not found"]})
+            del valid[index]
+        elif not mechanic_ids.get(index, set()) <= known_mechanics:
+            result.failed(index, {"mechanic_ids": ["One or more mechanic_ids not found"]})
+            del valid[index]
+
+    def _assign_mechanics(pairs):
+        rows = [
+            {"ticket_id": ticket_id, "mechanic_id": mid}
+            for index, ticket_id in pairs
+            for mid in mechanic_ids.get(index, ())
+        ]
+        if rows:
+            db.session.execute(service_mechanics.insert(), rows)
+            adjust_ticket_counts(added=[r["mechanic_id"] for r in rows])
+
+    insert_chunks(ServiceTicket, valid, result, after_insert=_assign_mechanics)
+    bump("tickets")
+    return result.response()
+
+def _list_statement(spec):
+    # Hydrate only the requested columns and eager-load only the requested nesting.
+    return select(ServiceTicket).options(
+        tickets_query.load_only(spec, *(name for name, _ in spec.sort)),
+        *loader_options(tickets_query.subset(spec)),
+    ).where(*tickets_query.where(spec))
+
+# GET '/' : List one keyset page (cached per page)
 @service_tickets_bp.get("/")
-@cache.cached(timeout=60)
+@read_replica
+@cached_view("tickets", "mechanics", "inventory", timeout=60)
 def get_tickets():
-    tickets = db.session.execute(select(ServiceTicket).order_by(ServiceTicket.id.asc())).scalars().all()
-    return tickets_schema.jsonify(tickets), 200
+    """
+    ?limit=25&cursor=<next_cursor from the previous page>
+    ?q=633A oil&page=1&limit=25 → ranked search on VIN fragments and description.
+    Accept: application/x-ndjson or text/csv streams every ticket instead.
+    """
+    if "q" in request.args:
+        return search_response(
+            ServiceTicket,
+            lambda ids: db.session.scalars(
+                select(ServiceTicket).options(*loader_options(tickets_schema)).where(ServiceTicket.id.in_(ids))
+            ).all(),
+            tickets_dump
+        )
+
+    try:
+        spec = tickets_query.parse(request.args)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    stmt = _list_statement(spec)
+    dump = tickets_query.dumper(spec)
+
+    fmt = stream_format()
+    if fmt:
+        return stream_response(
+            stmt.order_by(*tickets_query.order_by(spec)), dump, fmt,
+            list(spec.fields or ("id", "VIN", "service_date", "service_desc", "customer_id", "mechanics", "parts"))
+        )
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+        if spec.sort:
+            tickets, next_cursor = seek_page(tickets_query, spec, stmt, request.args.get("cursor"), limit)
+        else:
+            after_id = decode_cursor(request.args.get("cursor"))
+            tickets, next_cursor = keyset_page(stmt, ServiceTicket.id, after_id, limit)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    return jsonify({
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "items": [dump(t) for t in tickets]
+    }), 200
 
 # GET '/<id>'
 @service_tickets_bp.get("/<int:ticket_id>")
+@conditional(
+    lambda ticket_id: row_state(ServiceTicket, ticket_id, ServiceTicket.mechanics, ServiceTicket.parts),
+    "tickets", "mechanics", "inventory",
+)
 def get_ticket(ticket_id: int):
-    ticket = db.session.get(ServiceTicket, ticket_id)
+    ticket = _load_ticket(ticket_id)
     if not ticket:
         return jsonify({"error": "Ticket not found"}), 404
-    return ticket_schema.jsonify(ticket), 200
+    return jsonify(ticket_dump(ticket)), 200
 
 # PUT '/<id>' : Update fields; mechanics via mechanic_ids replaces list
 @service_tickets_bp.put("/<int:ticket_id>")
@@ -78,7 +219,13 @@ def update_ticket(ticket_id: int, customer_id: int):
         return jsonify({"error": "Forbidden"}), 403
 
     payload = request.json or {}
-    mechanic_ids = payload.pop("mechanic_ids", None)
+    replace = payload.get("mechanic_ids") is not None
+    try:
+        mechanic_ids = parse_ids(payload.pop("mechanic_ids", None), "mechanic_ids")
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+    if missing_mechanics(mechanic_ids):
+        return jsonify({"error": "One or more mechanic_ids not found"}), 400
 
     try:
         updated = ticket_schema.load(payload, instance=ticket, partial=True)
@@ -88,15 +235,12 @@ def update_ticket(ticket_id: int, customer_id: int):
     if "customer_id" in payload and not _verify_customer(updated.customer_id):
         return jsonify({"error": f"customer_id {updated.customer_id} not found"}), 400
 
-    if mechanic_ids is not None:
-        mechs = db.session.execute(select(Mechanic).where(Mechanic.id.in_(mechanic_ids))).scalars().all()
-        if len(mechs) != len(set(mechanic_ids)):
-            return jsonify({"error": "One or more mechanic_ids not found"}), 400
-        updated.mechanics = mechs
+    if replace:
+        replace_mechanics(ticket_id, mechanic_ids)
 
     db.session.commit()
-    cache.delete_memoized(get_tickets)
-    return ticket_schema.jsonify(updated), 200
+    bump("tickets")
+    return ticket_schema.jsonify(_load_ticket(ticket_id)), 200
 
 # DELETE '/<id>'
 @service_tickets_bp.delete("/<int:ticket_id>")
@@ -108,11 +252,13 @@ def delete_ticket(ticket_id: int, customer_id: int):
     if ticket.customer_id != customer_id:
         return jsonify({"error": "Forbidden"}), 403
 
+    adjust_ticket_counts(removed=[m.id for m in ticket.mechanics])
     ticket.mechanics.clear()
     ticket.parts.clear()
     db.session.delete(ticket)
     db.session.commit()
-    cache.delete_memoized(get_tickets)
+    forget_totals([ticket_id])
+    bump("tickets")
     return jsonify({"message": "Ticket deleted"}), 200
 
 # PUT '/<ticket_id>/edit' : add/remove mechanics
@@ -132,25 +278,21 @@ def edit_mechanics(ticket_id: int, customer_id: int):
         return jsonify({"error": "Forbidden"}), 403
 
     payload = request.json or {}
-    add_ids = payload.get("add_ids", []) or []
-    remove_ids = payload.get("remove_ids", []) or []
-
-    for mid in add_ids:
-        mech = db.session.get(Mechanic, int(mid))
-        if not mech:
-            return jsonify({"error": f"Mechanic {mid} not found"}), 404
-        if mech not in ticket.mechanics:
-            ticket.mechanics.append(mech)
-
-    for mid in remove_ids:
-        mech = db.session.get(Mechanic, int(mid))
-        if not mech:
-            return jsonify({"error": f"Mechanic {mid} not found"}), 404
-        if mech in ticket.mechanics:
-            ticket.mechanics.remove(mech)
+    try:
+        add_ids = parse_ids(payload.get("add_ids"), "add_ids")
+        remove_ids = parse_ids(payload.get("remove_ids"), "remove_ids")
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
 
-    db.session.commit()
-    return ticket_schema.jsonify(ticket), 200
+    # One IN query validates both lists, however long they are.
+    missing = missing_mechanics(dict.fromkeys(add_ids + remove_ids))
+    if missing:
+        return jsonify({"error": f"Mechanic {missing[0]} not found"}), 404
+
+    if change_mechanics(ticket_id, add=add_ids, remove=remove_ids):
+        db.session.commit()
+        bump("tickets")
+    return ticket_schema.jsonify(_load_ticket(ticket_id)), 200
 
 # POST '/<ticket_id>/add-part/<part_id>' : add inventory item to ticket
 @service_tickets_bp.post("/<int:ticket_id>/add-part/<int:part_id>")
@@ -162,11 +304,119 @@ def add_part(ticket_id: int, part_id: int, customer_id: int):
     if ticket.customer_id != customer_id:
         return jsonify({"error": "Forbidden"}), 403
 
-    part = db.session.get(Inventory, part_id)
-    if not part:
+    if missing_parts([part_id]):
         return jsonify({"error": "Part not found"}), 404
 
-    if part not in ticket.parts:
-        ticket.parts.append(part)
+    # Already attached: keeps its quantity.
+    if attach_parts(ticket_id, {part_id: 1}, overwrite=False):
         db.session.commit()
-    return ticket_schema.jsonify(ticket), 200
+        forget_totals([ticket_id])
+        bump("tickets")
+    return ticket_schema.jsonify(_load_ticket(ticket_id)), 200
+
+# POST '/<ticket_id>/parts' : attach many parts with quantities
+@service_tickets_bp.post("/<int:ticket_id>/parts")
+@token_required
+def add_parts(ticket_id: int, customer_id: int):
+    """
+    [
+      {"part_id": 3, "quantity": 4},
+      {"part_id": 7}                  // quantity defaults to 1
+    ]
+    Parts already on the ticket take the quantity given; repeated part_ids
+    are summed. Responds with the ticket's part lines, not the full ticket.
+    """
+    ticket = db.session.get(ServiceTicket, ticket_id)
+    if not ticket:
+        return jsonify({"error": "Ticket not found"}), 404
+    if ticket.customer_id != customer_id:
+        return jsonify({"error": "Forbidden"}), 403
+
+    try:
+        lines = part_lines_schema.load(request.get_json(silent=True))
+    except Exception as e:
+        return jsonify(getattr(e, "messages", {"error": "Invalid data"})), 400
+    if not lines:
+        return jsonify({"error": "Expected a non-empty list of parts"}), 400
+
+    quantities = {}
+    for line in lines:
+        quantities[line["part_id"]] = quantities.get(line["part_id"], 0) + line["quantity"]
+
+    missing = missing_parts(quantities)
+    if missing:
+        return jsonify({"error": f"Part {missing[0]} not found"}), 404
+
+    attach_parts(ticket_id, quantities)
+    db.session.commit()
+    forget_totals([ticket_id])
+    bump("tickets")
+    return jsonify({"ticket_id": ticket_id, "parts": part_lines(ticket_id)}), 200
+
+# GET '/<ticket_id>/invoice' : priced part lines and total
+@service_tickets_bp.get("/<int:ticket_id>/invoice")
+def get_invoice(ticket_id: int):
+    if db.session.get(ServiceTicket, ticket_id) is None:
+        return jsonify({"error": "Ticket not found"}), 404
+    return jsonify({
+        "ticket_id": ticket_id,
+        "lines": invoice_lines(ticket_id),
+        "total": ticket_totals([ticket_id])[ticket_id],
+    }), 200
+
+def _parse_date(name: str):
+    raw = request.args.get(name)
+    if not raw:
+        return None
+    try:
+        return datetime.date.fromisoformat(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a YYYY-MM-DD date")
+
+def _parse_id(name: str):
+    raw = request.args.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a positive integer")
+    if value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+# GET '/invoices' : totals per ticket, customer or date, aggregated in SQL
+@service_tickets_bp.get("/invoices")
+def get_invoices():
+    """
+    ?group_by=ticket|customer|date&from=2025-09-01&to=2025-09-30&customer_id=1
+    ticket and customer groupings are keyset paginated (?limit=&cursor=);
+    date returns every day in the range plus the range total.
+    """
+    group_by = request.args.get("group_by", "ticket")
+    if group_by not in GROUPINGS:
+        return jsonify({"error": f"group_by must be one of {', '.join(GROUPINGS)}"}), 400
+    try:
+        start, end = _parse_date("from"), _parse_date("to")
+        customer_id = _parse_id("customer_id")
+        after_id = decode_cursor(request.args.get("cursor"))
+        limit = parse_limit(request.args.get("limit"))
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    if group_by == "date":
+        items = totals_by_date(start, end, customer_id)
+        return jsonify({
+            "group_by": group_by,
+            "items": items,
+            "total": round(sum(item["total"] for item in items), 2),
+        }), 200
+
+    page = totals_by_ticket if group_by == "ticket" else totals_by_customer
+    items, next_cursor = page(start, end, customer_id, after_id, limit)
+    return jsonify({
+        "group_by": group_by,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "items": items,
+    }), 200
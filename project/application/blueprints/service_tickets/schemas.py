@@ -1,5 +1,7 @@
 from marshmallow import fields, validate
 from ...extensions import ma, db
+from ...serializers import compile_schema
+from ...query_spec import CollectionSpec
 from ...models import ServiceTicket, Mechanic, Inventory
 
 # Public mechanic serializer
@@ -45,5 +47,25 @@ class ServiceTicketSchema(ma.SQLAlchemySchema):
     parts = fields.Nested(PartPublicSchema, many=True, dump_only=True)
 
 
+# One entry of a batch part attachment
+class PartLineSchema(ma.Schema):
+    part_id = fields.Int(required=True, strict=True)
+    quantity = fields.Int(load_default=1, strict=True, validate=validate.Range(min=1))
+
+
 ticket_schema = ServiceTicketSchema()
 tickets_schema = ServiceTicketSchema(many=True)
+tickets_bulk = ServiceTicketSchema(many=True, load_instance=False)
+part_lines_schema = PartLineSchema(many=True)
+
+# Compiled equivalents of .dump() for the read paths
+ticket_dump = compile_schema(ticket_schema)
+tickets_dump = compile_schema(tickets_schema)
+
+# ?filter[...]/sort=/fields= on GET /service_tickets/
+tickets_query = CollectionSpec(
+    ticket_schema,
+    filters=("id", "VIN", "service_date", "customer_id"),
+    sorts=("id", "service_date", "customer_id"),
+)
+
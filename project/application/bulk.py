@@ -0,0 +1,160 @@
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from flask import current_app, request, jsonify
+from marshmallow import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+
+from .extensions import db
+from .search import index_rows
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def read_items(max_items: Optional[int] = None) -> List[Any]:
+    """
+    Reads a bulk request body: either a JSON array, or NDJSON (one JSON
+    object per line) when sent as application/x-ndjson. NDJSON is parsed
+    line by line straight off the request stream.
+
+    Raises ValueError for malformed bodies or batches over `max_items`
+    (default BULK_MAX_ITEMS).
+    """
+    if max_items is None:
+        max_items = current_app.config.get("BULK_MAX_ITEMS", 20000)
+
+    if request.mimetype == NDJSON_MIMETYPE:
+        items = []
+        for lineno, line in enumerate(request.stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f"Invalid JSON on line {lineno}")
+            if len(items) > max_items:
+                break
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array or an application/x-ndjson body")
+
+    if not items:
+        raise ValueError("No items supplied")
+    if len(items) > max_items:
+        raise ValueError(f"At most {max_items} items per request")
+    return items
+
+
+class BulkResult:
+    """
+    Collects one result per input item, addressed by the item's index.
+    """
+
+    def __init__(self, size: int):
+        self.results: List[Optional[Dict[str, Any]]] = [None] * size
+
+    def created(self, index: int, obj_id: int) -> None:
+        self.results[index] = {"index": index, "status": "created", "id": obj_id}
+
+    def failed(self, index: int, errors) -> None:
+        self.results[index] = {"index": index, "status": "error", "errors": errors}
+
+    def response(self):
+        created = sum(1 for r in self.results if r and r["status"] == "created")
+        failed = len(self.results) - created
+        if failed == 0:
+            status = 201
+        elif created == 0:
+            status = 400
+        else:
+            status = 207
+        return jsonify({"created": created, "failed": failed, "results": self.results}), status
+
+
+def load_items(schema, items: Sequence[Any], result: BulkResult) -> Dict[int, dict]:
+    """
+    Validates every item with a many=True schema in one pass, recording
+    failures on `result`. Returns {index: loaded dict} for the valid ones.
+    The schema must be built with load_instance=False.
+    """
+    try:
+        loaded, errors = schema.load(items), {}
+    except ValidationError as err:
+        loaded, errors = err.valid_data, err.messages
+
+    valid = {}
+    for index in range(len(items)):
+        if index in errors:
+            result.failed(index, errors[index])
+        else:
+            valid[index] = loaded[index]
+    return valid
+
+
+def reject_taken(valid: Dict[int, dict], field: str, column, result: BulkResult, message: str) -> None:
+    """
+    Enforces uniqueness of `field` for a batch with a single IN query
+    against `column`, also catching repeats inside the batch itself.
+    Offending items are removed from `valid` and recorded on `result`.
+    """
+    values = {row[field] for row in valid.values()}
+    taken = set(db.session.scalars(select(column).where(column.in_(values)))) if values else set()
+    seen = set()
+    for index in list(valid):
+        value = valid[index][field]
+        if value in taken or value in seen:
+            result.failed(index, {field: [message]})
+            del valid[index]
+        else:
+            seen.add(value)
+
+
+def chunk_size() -> int:
+    return max(int(current_app.config.get("BULK_CHUNK_SIZE", 1000)), 1)
+
+
+def insert_chunks(model, rows: Dict[int, dict], result: BulkResult, after_insert=None) -> None:
+    """
+    Inserts `rows` ({index: column values}) with one executemany INSERT per
+    chunk and commits each chunk separately, so one bad chunk (e.g. a
+    unique-constraint race) only fails its own items.
+
+    `after_insert(pairs)`, if given, runs inside the chunk's transaction
+    with [(index, new_id), ...] to write dependent rows. Searchable models
+    are indexed in the same transaction.
+    """
+    indexes = list(rows)
+    size = chunk_size()
+    sentinel = db.session.get_bind().dialect.insertmanyvalues_implicit_sentinel
+    ordered = bool(sentinel & InsertmanyvaluesSentinelOpts.ANY_AUTOINCREMENT)
+    if ordered:
+        stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+    else:
+        # SQLite can't order RETURNING for us and SQLAlchemy would fall back
+        # to one INSERT per row. Within a single multi-row INSERT, SQLite
+        # hands out INTEGER PRIMARY KEY values incrementally in VALUES order,
+        # so sorting the returned ids restores parameter order.
+        stmt = insert(model).returning(model.id)
+
+    for start in range(0, len(indexes), size):
+        chunk = indexes[start:start + size]
+        try:
+            ids = db.session.scalars(stmt, [rows[i] for i in chunk]).all()
+            if not ordered:
+                ids = sorted(ids)
+            pairs = list(zip(chunk, ids))
+            index_rows(model, {obj_id: rows[index] for index, obj_id in pairs})
+            if after_insert is not None:
+                after_insert(pairs)
+            db.session.commit()
+        except IntegrityError as err:
+            db.session.rollback()
+            for index in chunk:
+                result.failed(index, {"_db": [str(err.orig)]})
+            continue
+        for index, obj_id in pairs:
+            result.created(index, obj_id)
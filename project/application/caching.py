@@ -0,0 +1,167 @@
+import hashlib
+import os
+import tempfile
+import uuid
+
+from flask import request
+
+from .extensions import cache
+from .streaming import stream_format
+from .replica import cacheable, note_write
+
+# Resources whose writes invalidate cached responses.
+RESOURCES = ("customers", "tickets", "mechanics", "inventory")
+
+_GENERATION_KEY = "generation/%s"
+
+# Long but finite: cachelib stores timeout=0 as expiry 0, which its pruning
+# treats as the oldest (even expired) entry, so generations would be the
+# first keys evicted under pressure - invalidating every cached page at
+# once. Kept under memcached's 30-day limit for relative timeouts. A
+# generation that does age out is simply recreated with a fresh token.
+GENERATION_TIMEOUT = 7 * 24 * 3600
+
+_BACKENDS = {
+    "simple": "SimpleCache",
+    "shared": "FileSystemCache",
+    "filesystem": "FileSystemCache",
+    "redis": "RedisCache",
+    "memcached": "MemcachedCache",
+    "null": "NullCache",
+}
+
+
+def _shared_cache_dir() -> str:
+    # /dev/shm is tmpfs on Linux: a file cache there never touches disk and
+    # is visible to every worker process on the host.
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(root, "mechanic-api-cache")
+
+
+def configure_cache(app) -> None:
+    """
+    Translates CACHE_BACKEND into the Flask-Caching settings for that
+    backend. Must run before cache.init_app(). An explicit CACHE_TYPE in
+    the config still wins, for setups that need a backend not listed here.
+    """
+    config = app.config
+    if config.get("CACHE_TYPE"):
+        return
+
+    backend = (config.get("CACHE_BACKEND") or "simple").lower()
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown CACHE_BACKEND {backend!r}; expected one of {sorted(_BACKENDS)}")
+    config["CACHE_TYPE"] = _BACKENDS[backend]
+
+    if backend in ("shared", "filesystem"):
+        cache_dir = config.get("CACHE_DIR") or _shared_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        config["CACHE_DIR"] = cache_dir
+    elif backend == "redis":
+        if not config.get("CACHE_REDIS_URL"):
+            raise ValueError("CACHE_BACKEND=redis requires CACHE_REDIS_URL")
+    elif backend == "memcached":
+        servers = config.get("CACHE_MEMCACHED_SERVERS")
+        if not servers:
+            raise ValueError("CACHE_BACKEND=memcached requires CACHE_MEMCACHED_SERVERS")
+        if isinstance(servers, str):
+            config["CACHE_MEMCACHED_SERVERS"] = [s.strip() for s in servers.split(",") if s.strip()]
+
+    if backend != "simple":
+        # Shared stores may be used by other apps; keep our keys apart.
+        config.setdefault("CACHE_KEY_PREFIX", "mechanic_api:")
+
+
+def revocation_cache_config(app) -> dict:
+    """
+    Flask-Caching settings for the token denylist (extensions.revocations).
+    It is a store of its own, so response-cache churn can never evict a
+    revocation before its token expires.
+
+    REVOCATION_BACKEND is "simple", "shared" (a directory next to
+    CACHE_DIR) or "redis" (REVOCATION_REDIS_URL, else CACHE_REDIS_URL;
+    under the revoked: key prefix, so give it an instance with
+    maxmemory-policy noeviction). It defaults to CACHE_BACKEND, except
+    that null and memcached, which drop entries by design, become shared.
+    Only expired revocations are pruned until REVOCATION_THRESHOLD live
+    entries are reached.
+    """
+    config = app.config
+    backend = (config.get("REVOCATION_BACKEND") or config.get("CACHE_BACKEND") or "simple").lower()
+    if backend in ("null", "memcached"):
+        backend = "shared"
+    if backend not in ("simple", "shared", "filesystem", "redis"):
+        raise ValueError(f"Unknown REVOCATION_BACKEND {backend!r}; expected simple, shared or redis")
+
+    settings = {
+        "CACHE_TYPE": _BACKENDS[backend],
+        "CACHE_THRESHOLD": int(config.get("REVOCATION_THRESHOLD", 100000)),
+        "CACHE_KEY_PREFIX": "mechanic_api:revoked:",
+    }
+    if backend in ("shared", "filesystem"):
+        cache_dir = config.get("REVOCATION_DIR") or (config.get("CACHE_DIR") or _shared_cache_dir()).rstrip(os.sep) + "-revoked"
+        os.makedirs(cache_dir, exist_ok=True)
+        settings["CACHE_DIR"] = cache_dir
+    elif backend == "redis":
+        settings["CACHE_REDIS_URL"] = config.get("REVOCATION_REDIS_URL") or config.get("CACHE_REDIS_URL")
+        if not settings["CACHE_REDIS_URL"]:
+            raise ValueError("REVOCATION_BACKEND=redis requires REVOCATION_REDIS_URL or CACHE_REDIS_URL")
+    return settings
+
+
+def _new_token() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def generations(*resources: str) -> tuple:
+    """
+    Returns the current generation token of each resource, creating a
+    token for any resource that has none yet (or whose key was evicted).
+    """
+    keys = [_GENERATION_KEY % r for r in resources]
+    tokens = list(cache.get_many(*keys))
+    for i, token in enumerate(tokens):
+        if token is None:
+            # add() keeps whichever token another worker stored first.
+            cache.add(keys[i], _new_token(), timeout=GENERATION_TIMEOUT)
+            # Still None on the null backend: a throwaway token, never reused.
+            tokens[i] = cache.get(keys[i]) or _new_token()
+    return tuple(tokens)
+
+
+def bump(*resources: str) -> None:
+    """
+    Invalidates every cached response that depends on `resources`.
+
+    Each generation is replaced by a fresh random token rather than
+    incremented, so concurrent writers can never land on a value a reader
+    has already cached under. Old entries are simply never read again and
+    age out through their timeout.
+    """
+    for resource in resources:
+        if resource not in RESOURCES:
+            raise ValueError(f"Unknown cache resource: {resource}")
+        cache.set(_GENERATION_KEY % resource, _new_token(), timeout=GENERATION_TIMEOUT)
+    note_write(*resources)
+
+
+def _view_cache_key(resources, prefix: str = "view") -> str:
+    args = sorted(request.args.items(multi=True))
+    digest = hashlib.md5(repr(args).encode()).hexdigest()
+    tokens = ".".join(generations(*resources))
+    return f"{prefix}/{request.path}/{tokens}/{digest}"
+
+
+def cached_view(*resources: str, timeout: int = 60):
+    """
+    Like cache.cached(query_string=True), but the key also folds in the
+    generation of each resource the response is built from, so a single
+    bump() evicts every page and query-string variant at once.
+    Streamed (NDJSON/CSV) responses, and reads that could see a replica
+    lagging behind a recent write (see replica.cacheable), bypass it.
+    """
+    return cache.cached(
+        timeout=timeout,
+        make_cache_key=lambda *args, **kwargs: _view_cache_key(resources),
+        unless=lambda: stream_format() is not None or not cacheable(resources),
+    )
@@ -0,0 +1,138 @@
+import hashlib
+from functools import wraps
+from typing import Callable, Optional, Sequence, Tuple
+
+from flask import current_app, make_response, request
+from sqlalchemy import func, literal, select, union_all
+from werkzeug.http import is_resource_modified
+
+from .caching import _view_cache_key
+from .extensions import db, cache
+from .streaming import stream_format
+from .replica import cacheable
+
+# (ETag, Last-Modified) for one representation.
+Validators = Tuple[str, Optional[object]]
+
+
+def _aggregate(index: int, model):
+    return (literal(index), func.count(model.id),
+            func.coalesce(func.sum(model.version), 0), func.max(model.updated_at))
+
+
+def _validators(parts: Sequence) -> Tuple[list, Validators]:
+    """
+    Runs the (index, count, sum(version), max(updated_at)) selects in one
+    UNION ALL round trip and folds them, plus the query string, into a
+    strong ETag and a Last-Modified date.
+    """
+    return fold_validators(db.session.execute(state_statement(parts)).all())
+
+
+def fold_validators(rows: Sequence) -> Tuple[list, Validators]:
+    """The ETag / Last-Modified for the rows of a state_statement."""
+    rows = sorted(rows, key=lambda row: row[0])
+    args = sorted(request.args.items(multi=True))
+    state = repr(([(row[1], row[2], str(row[3])) for row in rows], args))
+    etag = hashlib.sha1(state.encode()).hexdigest()
+    last_modified = max((row[3] for row in rows if row[3] is not None), default=None)
+    return rows, (etag, last_modified)
+
+
+def collection_parts(model) -> list:
+    return [select(*_aggregate(0, model))]
+
+
+def row_parts(model, row_id: int, *related) -> list:
+    where = model.id == row_id
+    parts = [select(*_aggregate(0, model)).where(where)]
+    for i, rel in enumerate(related, start=1):
+        target = rel.property.mapper.class_
+        parts.append(select(*_aggregate(i, target)).select_from(model).join(rel).where(where))
+    return parts
+
+
+def state_statement(parts: Sequence):
+    """The single UNION ALL that collection_state / row_state run."""
+    return union_all(*parts)
+
+
+def collection_state(model) -> Validators:
+    """
+    Validators for a listing of every `model` row: an ETag only. Deleting
+    a row doesn't move max(updated_at), so a Last-Modified would let
+    If-Modified-Since answer 304 for a list that just lost a row; the
+    ETag folds in the row count and does change.
+    """
+    return collection_validators(_validators(collection_parts(model))[1])
+
+
+def collection_validators(validators: Validators) -> Validators:
+    return validators[0], None
+
+
+def row_state(model, row_id: int, *related) -> Optional[Validators]:
+    """
+    Validators for one `model` row plus, for each relationship in
+    `related`, the rows it currently links to (so renaming a ticket's
+    mechanic changes the ticket's ETag). None when the row is missing.
+    """
+    rows, validators = _validators(row_parts(model, row_id, *related))
+    return validators if rows[0][1] else None
+
+
+def not_modified(validators: Validators):
+    """A 304 response when the request's If-None-Match / If-Modified-Since still hold, else None."""
+    etag, last_modified = validators
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return with_validators(current_app.response_class(status=304), validators)
+
+
+def with_validators(response, validators: Validators):
+    etag, last_modified = validators
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def conditional(state: Callable[..., Optional[Validators]], *resources: str, timeout: int = 60):
+    """
+    Adds ETag / Last-Modified to a GET view and answers If-None-Match /
+    If-Modified-Since with 304 before the view runs, so unchanged polls
+    are never queried for or serialised.
+
+    `state(**view_args)` returns the validators, or None to let the view
+    handle a missing row. When `resources` are given the validators are
+    cached under their generations like cached_view, so a repeat poll
+    costs no query at all until one of them is bumped.
+    Streamed (NDJSON/CSV) responses are passed through untouched.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if stream_format() is not None:
+                return view(*args, **kwargs)
+
+            if resources and cacheable(resources):
+                key = _view_cache_key(resources, prefix="validators")
+                validators = cache.get(key)
+                if validators is None:
+                    validators = state(**kwargs)
+                    if validators is not None:
+                        cache.set(key, validators, timeout=timeout)
+            else:
+                validators = state(**kwargs)
+            if validators is None:
+                return view(*args, **kwargs)
+
+            response = not_modified(validators)
+            if response is not None:
+                return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            return with_validators(response, validators)
+        return wrapper
+    return decorator
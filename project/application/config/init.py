@@ -1,10 +1,64 @@
 import os
 
+# Cache backends understood by caching.configure_cache():
+#   simple    - in-process dict, one cache per worker
+#   shared    - file-backed store under CACHE_DIR (tmpfs /dev/shm when available),
+#               shared by every worker on the host, no external service
+#   redis     - CACHE_REDIS_URL, shared across hosts
+#   memcached - CACHE_MEMCACHED_SERVERS (comma separated), shared across hosts
+#   null      - caching disabled
+_REDIS_URL = os.environ.get("CACHE_REDIS_URL") or os.environ.get("REDIS_URL")
+
+
+def _pool_options() -> dict:
+    """
+    SQLAlchemy pool settings for a server database. Each gunicorn worker
+    process has its own pool, so unless DB_POOL_SIZE / DB_MAX_OVERFLOW are
+    set, DB_MAX_CONNECTIONS (this app's share of the server's connections)
+    is split across WEB_CONCURRENCY workers: half kept open, half overflow.
+    An ASGI worker (asgi_app.py) opens a sync and an asyncio pool of this
+    size, so budget twice the connections per worker there.
+    """
+    workers = max(int(os.environ.get("WEB_CONCURRENCY", 2)), 1)
+    per_worker = max(int(os.environ.get("DB_MAX_CONNECTIONS", 20)) // workers, 1)
+    pool_size = int(os.environ.get("DB_POOL_SIZE", max(per_worker // 2, 1)))
+    return {
+        "pool_size": pool_size,
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", max(per_worker - pool_size, 0))),
+        # Fail fast instead of stacking requests behind an exhausted pool.
+        "pool_timeout": float(os.environ.get("DB_POOL_TIMEOUT", 10)),
+        # Recycle before server/proxy idle timeouts drop connections under us.
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+
 class DevelopmentConfig:
     SQLALCHEMY_DATABASE_URI = "sqlite:///app.db"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Optional read replica for read_replica routes; reads stay on the
+    # primary for REPLICA_STICKY_SECONDS after a client's own write.
+    SQLALCHEMY_REPLICA_URI = os.environ.get("DATABASE_REPLICA_URL")
+    REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
     RATELIMIT_DEFAULT = "60 per minute"
-    CACHE_TYPE = "SimpleCache"
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "simple")
+    CACHE_DIR = os.environ.get("CACHE_DIR")
+    CACHE_REDIS_URL = _REDIS_URL
+    CACHE_MEMCACHED_SERVERS = os.environ.get("CACHE_MEMCACHED_SERVERS")
+    # Logged-out tokens live in their own store (caching.revocation_cache_config).
+    REVOCATION_BACKEND = os.environ.get("REVOCATION_BACKEND")
+    REVOCATION_REDIS_URL = os.environ.get("REVOCATION_REDIS_URL")
+    JSON_ENCODER = os.environ.get("JSON_ENCODER", "auto")  # auto | orjson | stdlib
+    # Per-endpoint latency/SQL/cache metrics at /metrics plus Server-Timing headers.
+    PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "false").lower() in ("1", "true", "yes")
+    SERVER_TIMING = os.environ.get("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+    # Log statements slower than SLOW_QUERY_MS (unset disables), with the
+    # query plan captured once per distinct statement when SLOW_QUERY_EXPLAIN.
+    SLOW_QUERY_MS = float(os.environ["SLOW_QUERY_MS"]) if os.environ.get("SLOW_QUERY_MS") else None
+    SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+    # Full per-request statement traces for a sampled fraction of requests.
+    QUERY_TRACE_FILE = os.environ.get("QUERY_TRACE_FILE")
+    QUERY_TRACE_SAMPLE = float(os.environ.get("QUERY_TRACE_SAMPLE", 0.01))
     SECRET_KEY = os.environ.get("SECRET_KEY", "devsecret")
 
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "supersecretjwtkey")
@@ -12,6 +66,24 @@ class DevelopmentConfig:
     JWT_ISSUER = "mechanic_api"
     JWT_EXPIRES_MIN = 60
     JWT_AUDIENCE = "mechanic_api_users"
+    JWT_CLAIMS_CACHE_SIZE = int(os.environ.get("JWT_CLAIMS_CACHE_SIZE", 1024))  # 0 disables
+
+    # werkzeug method string: "pbkdf2:<hash>:<iterations>" or "scrypt:<n>:<r>:<p>";
+    # left out, werkzeug's current default applies. Existing hashes of another
+    # method or a lower cost are upgraded on their next successful login.
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "pbkdf2")
+    # KDF computations running at once per process (0 = unbounded); callers
+    # waiting longer than PASSWORD_HASH_TIMEOUT for a slot get a 503.
+    PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", 2))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 5))
+    # Each item of POST /customers/bulk costs one full password hash.
+    BULK_MAX_PASSWORDS = int(os.environ.get("BULK_MAX_PASSWORDS", 20))
+
+    # ASGI mode (asgi_app.py): async views use an asyncio-driver URL derived
+    # from the database URL unless overridden; everything else runs the WSGI
+    # app on ASGI_SYNC_THREADS threads per worker.
+    ASYNC_DATABASE_URI = os.environ.get("ASYNC_DATABASE_URL")
+    ASGI_SYNC_THREADS = int(os.environ.get("ASGI_SYNC_THREADS", 8))
 
 
 
@@ -20,7 +92,8 @@ class TestingConfig:
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    CACHE_TYPE = "SimpleCache"
+    CACHE_BACKEND = "simple"
+    JSON_ENCODER = os.environ.get("JSON_ENCODER", "auto")
     SECRET_KEY = "testsecret"
 
     RATELIMIT_ENABLED = False    # disable rate limiting for tests
@@ -32,13 +105,43 @@ class TestingConfig:
     JWT_ISSUER = "mechanic_api_test"
     JWT_EXPIRES_MIN = 999
     JWT_AUDIENCE = "mechanic_api_test_users"
+    JWT_CLAIMS_CACHE_SIZE = 1024
+
+    # Cheap hashes keep the suite fast.
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+    PASSWORD_HASH_CONCURRENCY = 0
 
 class ProductionConfig:
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _pool_options()
+    SQLALCHEMY_REPLICA_URI = os.environ.get("DATABASE_REPLICA_URL")
+    REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 5))
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+    METRICS_REQUIRE_TOKEN = True  # /metrics and /metrics/pool answer 403 until METRICS_TOKEN is set
+    PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "false").lower() in ("1", "true", "yes")
+    # Server-Timing exposes internals to clients; opt in explicitly in production.
+    SERVER_TIMING = os.environ.get("SERVER_TIMING", "false").lower() in ("1", "true", "yes")
+
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+    SLOW_QUERY_EXPLAIN = os.environ.get("SLOW_QUERY_EXPLAIN", "true").lower() in ("1", "true", "yes")
+    QUERY_TRACE_FILE = os.environ.get("QUERY_TRACE_FILE")
+    QUERY_TRACE_SAMPLE = float(os.environ.get("QUERY_TRACE_SAMPLE", 0.01))
+    QUERY_TRACE_MAX_BYTES = int(os.environ.get("QUERY_TRACE_MAX_BYTES", 10 * 1024 * 1024))
+    QUERY_TRACE_BACKUPS = int(os.environ.get("QUERY_TRACE_BACKUPS", 5))
 
     RATELIMIT_DEFAULT = "60 per minute"
-    CACHE_TYPE = "SimpleCache"
+
+    # gunicorn runs several workers per host; default to a cache they all share.
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "redis" if _REDIS_URL else "shared")
+    CACHE_DIR = os.environ.get("CACHE_DIR")
+    CACHE_REDIS_URL = _REDIS_URL
+    CACHE_MEMCACHED_SERVERS = os.environ.get("CACHE_MEMCACHED_SERVERS")
+    CACHE_THRESHOLD = int(os.environ.get("CACHE_THRESHOLD", 10000))
+    REVOCATION_BACKEND = os.environ.get("REVOCATION_BACKEND")
+    REVOCATION_REDIS_URL = os.environ.get("REVOCATION_REDIS_URL")
+
+    JSON_ENCODER = os.environ.get("JSON_ENCODER", "auto")
 
     SECRET_KEY = os.environ.get("SECRET_KEY")
 
@@ -47,5 +150,17 @@ class ProductionConfig:
     JWT_ISSUER = "mechanic_api"
     JWT_EXPIRES_MIN = 60
     JWT_AUDIENCE = "mechanic_api_users"
+    JWT_CLAIMS_CACHE_SIZE = int(os.environ.get("JWT_CLAIMS_CACHE_SIZE", 1024))
+
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "pbkdf2")
+    PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", 2))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 5))
+    BULK_MAX_PASSWORDS = int(os.environ.get("BULK_MAX_PASSWORDS", 20))
+
+    # ASGI mode (asgi_app.py): async views use an asyncio-driver URL derived
+    # from the database URL unless overridden; everything else runs the WSGI
+    # app on ASGI_SYNC_THREADS threads per worker.
+    ASYNC_DATABASE_URI = os.environ.get("ASYNC_DATABASE_URL")
+    ASGI_SYNC_THREADS = int(os.environ.get("ASGI_SYNC_THREADS", 8))
 
 
@@ -0,0 +1,127 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (ms) of the checkout-wait histogram; the last bucket is +Inf.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# How many recent checkout waits the percentiles are computed over.
+RECENT_WAITS = 1000
+
+
+class PoolStats:
+    """Checkout wait accounting for one pool (one per worker process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.recent = deque(maxlen=RECENT_WAITS)
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for i, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+            self.recent.append(wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self.recent)
+            total = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms": {
+                    "mean": self.wait_total_ms / total if total else 0.0,
+                    "max": self.wait_max_ms,
+                    "p50": _percentile(recent, 0.50),
+                    "p95": _percentile(recent, 0.95),
+                    "p99": _percentile(recent, 0.99),
+                    "buckets": {
+                        **{f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS_MS, self.buckets)},
+                        "le_inf": self.buckets[-1],
+                    },
+                },
+            }
+
+
+def _percentile(ordered, q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout: the wait for a free connection
+    (or for a new one to be opened) and checkouts that hit pool_timeout.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        began = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeout:
+            self.stats.record((time.perf_counter() - began) * 1000, timed_out=True)
+            raise
+        self.stats.record((time.perf_counter() - began) * 1000)
+        return conn
+
+    def recreate(self):
+        # dispose()/recreate() hand back a new pool; keep the counters.
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def configure_pool(app) -> None:
+    """
+    Swaps in InstrumentedQueuePool when the config sizes a queue pool
+    (SQLALCHEMY_ENGINE_OPTIONS has pool_size). Must run before db.init_app().
+    """
+    options = app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    if "pool_size" in options and "poolclass" not in options:
+        app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {**options, "poolclass": InstrumentedQueuePool}
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Point-in-time pool occupancy, plus wait stats when instrumented."""
+    pool = engine.pool
+    status: Dict[str, Any] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        size = pool.size()
+        status.update({
+            "size": size,
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # overflow() counts from -size: below zero means unopened slots.
+            "overflow_in_use": max(pool.overflow(), 0),
+            "utilisation": pool.checkedout() / (size + max(pool._max_overflow, 0)) if size else 0.0,
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -6,12 +6,16 @@ from flask_limiter.util import get_remote_address
 from flask_caching import Cache
 from flask_migrate import Migrate
 
+from .session import RoutingSession
+
 
 class Base(DeclarativeBase):
     pass
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={"class_": RoutingSession})
 ma = Marshmallow()
 limiter = Limiter(key_func=get_remote_address)
 cache = Cache()
+# Token denylist, kept apart so response-cache evictions never drop it.
+revocations = Cache()
 migrate = Migrate()
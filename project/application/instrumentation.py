@@ -0,0 +1,210 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db, cache
+
+# Histogram upper bounds; the +Inf bucket is implicit.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """
+    Per-process request metrics, rendered in the Prometheus text format.
+    With several gunicorn workers each one reports its own numbers; the
+    scraper (or a sum() in PromQL) aggregates them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[str, _Histogram] = {}
+        self.size: Dict[str, _Histogram] = {}
+        self.requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.sql_count: Dict[str, int] = defaultdict(int)
+        self.sql_seconds: Dict[str, float] = defaultdict(float)
+        self.cache_ops: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def record(self, endpoint: str, method: str, status: int, stats: "RequestStats",
+               seconds: float, size) -> None:
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            self.latency.setdefault(endpoint, _Histogram(LATENCY_BUCKETS)).observe(seconds)
+            if size is not None:
+                self.size.setdefault(endpoint, _Histogram(SIZE_BUCKETS)).observe(size)
+            self.sql_count[endpoint] += stats.sql_count
+            self.sql_seconds[endpoint] += stats.sql_seconds
+            for (namespace, result), n in stats.cache.items():
+                self.cache_ops[(endpoint, namespace, result)] += n
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines += _header("http_requests_total", "counter", "Requests by endpoint, method and status")
+            for (endpoint, method, status), n in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {n}')
+            lines += _histogram("http_request_duration_seconds", "Time to build the response", self.latency)
+            lines += _histogram("http_response_size_bytes", "Response body size (unstreamed)", self.size)
+            lines += _header("db_statements_total", "counter", "SQL statements executed per endpoint")
+            lines += [f'db_statements_total{{endpoint="{e}"}} {n}' for e, n in sorted(self.sql_count.items())]
+            lines += _header("db_statement_seconds_total", "counter", "Time spent in SQL per endpoint")
+            lines += [f'db_statement_seconds_total{{endpoint="{e}"}} {s:.6f}' for e, s in sorted(self.sql_seconds.items())]
+            lines += _header("cache_requests_total", "counter", "Cache lookups by key namespace and result")
+            for (endpoint, namespace, result), n in sorted(self.cache_ops.items()):
+                lines.append(
+                    f'cache_requests_total{{endpoint="{endpoint}",namespace="{namespace}",result="{result}"}} {n}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _header(name: str, kind: str, help_text: str):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def _histogram(name: str, help_text: str, series: Dict[str, _Histogram]):
+    lines = _header(name, "histogram", help_text)
+    for endpoint, hist in sorted(series.items()):
+        cumulative = 0
+        for bound, n in zip(hist.buckets, hist.counts):
+            cumulative += n
+            lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="+Inf"}} {hist.count}')
+        lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {hist.sum:.6f}')
+        lines.append(f'{name}_count{{endpoint="{endpoint}"}} {hist.count}')
+    return lines
+
+
+class RequestStats:
+    __slots__ = ("started", "sql_count", "sql_seconds", "cache")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.cache: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def server_timing(self, total: float) -> str:
+        hits = sum(n for (_, result), n in self.cache.items() if result == "hit")
+        misses = sum(n for (_, result), n in self.cache.items() if result == "miss")
+        return ", ".join((
+            f"app;dur={total * 1000:.1f}",
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.sql_count} queries"',
+            f'cache;desc="{hits} hit {misses} miss"',
+        ))
+
+
+def _current() -> "RequestStats":
+    return g.get("_perf") if has_request_context() else None
+
+
+# ---- SQL ----
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current() is not None:
+        conn.info.setdefault("_perf_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current()
+    started = conn.info.get("_perf_started")
+    if stats is not None and started:
+        stats.sql_count += 1
+        stats.sql_seconds += time.perf_counter() - started.pop()
+
+
+def _handle_error(context):
+    # A statement that raised never reaches after_cursor_execute.
+    started = context.connection.info.get("_perf_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+# ---- Cache ----
+class _CountingBackend:
+    """
+    Wraps the Flask-Caching backend so every get/get_many is counted as a
+    hit or miss against the current request, by key namespace ("view",
+    "validators", "generation", ...). Everything else passes through.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+    def get(self, key):
+        value = self._backend.get(key)
+        _count(key, value)
+        return value
+
+    def get_many(self, *keys):
+        values = self._backend.get_many(*keys)
+        for key, value in zip(keys, values):
+            _count(key, value)
+        return values
+
+
+def _count(key: str, value) -> None:
+    stats = _current()
+    if stats is not None:
+        stats.cache[(str(key).split("/", 1)[0], "miss" if value is None else "hit")] += 1
+
+
+def init_instrumentation(app) -> None:
+    """
+    Installs request timing, SQL and cache counters when
+    PERF_INSTRUMENTATION is on; otherwise registers nothing, so there is
+    no per-request cost. Must run after db.init_app() and cache.init_app().
+    """
+    if not app.config.get("PERF_INSTRUMENTATION"):
+        return
+
+    registry = app.extensions["perf_registry"] = Registry()
+    server_timing = app.config.get("SERVER_TIMING", True)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(engine, "handle_error", _handle_error)
+    backends = app.extensions["cache"]
+    backends[cache] = _CountingBackend(backends[cache])
+
+    @app.before_request
+    def _start_request_stats():
+        g._perf = RequestStats()
+
+    @app.after_request
+    def _record_request_stats(response):
+        stats = g.pop("_perf", None)
+        if stats is None:
+            return response
+        total = time.perf_counter() - stats.started
+        endpoint = request.endpoint or "unmatched"
+        size = None if response.is_streamed else response.calculate_content_length()
+        registry.record(endpoint, request.method, response.status_code, stats, total, size)
+        if server_timing:
+            response.headers["Server-Timing"] = stats.server_timing(total)
+        return response
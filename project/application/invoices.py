@@ -0,0 +1,150 @@
+import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+
+from .extensions import db, cache
+from .models import Inventory, ServiceTicket, service_ticket_parts
+from .pagination import keyset_page
+
+_TOTAL_KEY = "invoice-total/%d"
+
+# Backstop for a total cached by a read that raced a write's forget_totals().
+TOTAL_TIMEOUT = 300
+
+GROUPINGS = ("ticket", "customer", "date")
+
+_line_total = Inventory.price * service_ticket_parts.c.quantity
+
+
+def _summed():
+    return func.coalesce(func.sum(_line_total), 0)
+
+
+def _with_parts(stmt):
+    return (
+        stmt.outerjoin(service_ticket_parts, service_ticket_parts.c.ticket_id == ServiceTicket.id)
+        .outerjoin(Inventory, Inventory.id == service_ticket_parts.c.inventory_id)
+    )
+
+
+def _money(value) -> float:
+    return round(float(value or 0), 2)
+
+
+def invoice_lines(ticket_id: int) -> List[dict]:
+    """The ticket's parts priced at quantity x current price, in part id order."""
+    rows = db.session.execute(
+        select(Inventory.id, Inventory.name, Inventory.price, service_ticket_parts.c.quantity,
+               _line_total.label("line_total"))
+        .join(service_ticket_parts, service_ticket_parts.c.inventory_id == Inventory.id)
+        .where(service_ticket_parts.c.ticket_id == ticket_id)
+        .order_by(Inventory.id)
+    ).all()
+    return [{
+        "part_id": r.id,
+        "name": r.name,
+        "unit_price": r.price,
+        "quantity": r.quantity,
+        "line_total": _money(r.line_total),
+    } for r in rows]
+
+
+def ticket_totals(ticket_ids: Iterable[int]) -> Dict[int, float]:
+    """
+    Invoice total per ticket id. Totals come from the cache where present;
+    the rest are summed in one GROUP BY and cached. Tickets with no parts
+    (or that don't exist) total 0.
+    """
+    ticket_ids = list(dict.fromkeys(ticket_ids))
+    if not ticket_ids:
+        return {}
+    cached = cache.get_many(*[_TOTAL_KEY % tid for tid in ticket_ids])
+    totals = {tid: value for tid, value in zip(ticket_ids, cached) if value is not None}
+
+    missing = [tid for tid in ticket_ids if tid not in totals]
+    if missing:
+        rows = db.session.execute(
+            select(service_ticket_parts.c.ticket_id, _summed())
+            .join(Inventory, Inventory.id == service_ticket_parts.c.inventory_id)
+            .where(service_ticket_parts.c.ticket_id.in_(missing))
+            .group_by(service_ticket_parts.c.ticket_id)
+        ).all()
+        computed = {tid: 0.0 for tid in missing}
+        computed.update({tid: _money(total) for tid, total in rows})
+        cache.set_many({_TOTAL_KEY % tid: total for tid, total in computed.items()}, timeout=TOTAL_TIMEOUT)
+        totals.update(computed)
+    return totals
+
+
+def forget_totals(ticket_ids: Iterable[int]) -> None:
+    """Drops cached totals; call after committing a change to their parts."""
+    keys = [_TOTAL_KEY % tid for tid in set(ticket_ids)]
+    if keys:
+        cache.delete_many(*keys)
+
+
+def tickets_using_part(part_id: int) -> List[int]:
+    """Ids of the tickets whose totals depend on `part_id`'s price."""
+    return list(db.session.scalars(
+        select(service_ticket_parts.c.ticket_id).where(service_ticket_parts.c.inventory_id == part_id)
+    ))
+
+
+def _filters(start: Optional[datetime.date], end: Optional[datetime.date], customer_id: Optional[int]):
+    where = []
+    if start is not None:
+        where.append(ServiceTicket.service_date >= start)
+    if end is not None:
+        where.append(ServiceTicket.service_date <= end)
+    if customer_id is not None:
+        where.append(ServiceTicket.customer_id == customer_id)
+    return where
+
+
+def totals_by_ticket(start=None, end=None, customer_id=None, after_id=None, limit=25):
+    """One keyset page of tickets in the range, with their (cached) totals."""
+    stmt = select(ServiceTicket.id, ServiceTicket.customer_id, ServiceTicket.service_date).where(
+        *_filters(start, end, customer_id)
+    )
+    rows, next_cursor = keyset_page(stmt, ServiceTicket.id, after_id, limit, scalars=False)
+    totals = ticket_totals(r.id for r in rows)
+    return [{
+        "ticket_id": r.id,
+        "customer_id": r.customer_id,
+        "service_date": r.service_date.isoformat(),
+        "total": totals[r.id],
+    } for r in rows], next_cursor
+
+
+def totals_by_customer(start=None, end=None, customer_id=None, after_id=None, limit=25):
+    """One keyset page of customers with ticket count and total, in one GROUP BY."""
+    stmt = _with_parts(
+        select(ServiceTicket.customer_id, func.count(func.distinct(ServiceTicket.id)).label("tickets"),
+               _summed().label("total"))
+        .select_from(ServiceTicket)
+    ).where(*_filters(start, end, customer_id)).group_by(ServiceTicket.customer_id)
+    rows, next_cursor = keyset_page(stmt, ServiceTicket.customer_id, after_id, limit, scalars=False)
+    return [{
+        "customer_id": r.customer_id,
+        "tickets": r.tickets,
+        "total": _money(r.total),
+    } for r in rows], next_cursor
+
+
+def totals_by_date(start=None, end=None, customer_id=None):
+    """Ticket count and total per service date in the range, in one GROUP BY."""
+    rows = db.session.execute(
+        _with_parts(
+            select(ServiceTicket.service_date, func.count(func.distinct(ServiceTicket.id)).label("tickets"),
+                   _summed().label("total"))
+            .select_from(ServiceTicket)
+        ).where(*_filters(start, end, customer_id))
+        .group_by(ServiceTicket.service_date)
+        .order_by(ServiceTicket.service_date)
+    ).all()
+    return [{
+        "service_date": r.service_date.isoformat(),
+        "tickets": r.tickets,
+        "total": _money(r.total),
+    } for r in rows]
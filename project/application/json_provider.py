@@ -0,0 +1,103 @@
+import math
+from typing import Any, Optional
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+_COMPACT = (",", ":")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """True when a NaN or ±Infinity float appears anywhere in `obj`."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+    return False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    DefaultJSONProvider that encodes compact output (every jsonify /
+    response() outside debug mode) with orjson, producing the same
+    document the stdlib provider would:
+
+    - keys are sorted, as with sort_keys=True;
+    - date/datetime/dataclass values are passed through to Flask's
+      `default`, so dates stay RFC 822 strings exactly as before;
+    - output containing non-ASCII text, integers over 64 bits, or anything
+      else orjson rejects is re-encoded by the stdlib provider, so
+      ensure_ascii escaping is byte-for-byte unchanged;
+    - NaN and ±Infinity, which orjson writes as null, are re-encoded by the
+      stdlib provider too, so they stay NaN/Infinity.
+
+    Floats use the shortest round-trip repr like the stdlib. Only the
+    exponent spelling of very large/small values differs ("1e16" vs
+    "1e+16"); the parsed value is identical.
+
+    Non-compact output (debug mode, explicit indent) and loads() are left
+    to the stdlib provider.
+    """
+
+    _options = (
+        (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+         | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if orjson is not None else 0
+    )
+
+    def _fast_dumps(self, obj: Any) -> Optional[bytes]:
+        if not self.sort_keys:
+            return None
+        try:
+            data = orjson.dumps(obj, default=self.default, option=self._options)
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            return None
+        if self.ensure_ascii and not data.isascii():
+            return None
+        # Only payloads with a null in them can hide a non-finite float.
+        if b"null" in data and _has_non_finite(obj):
+            return None
+        return data
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs == {"separators": _COMPACT}:
+            data = self._fast_dumps(obj)
+            if data is not None:
+                return data.decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+
+        data = self._fast_dumps(self._prepare_response_obj(args, kwargs))
+        if data is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+
+
+PROVIDERS = {
+    "stdlib": DefaultJSONProvider,
+    "orjson": OrjsonProvider,
+}
+
+
+def init_json(app) -> None:
+    """
+    Installs the JSON provider named by JSON_ENCODER: "stdlib", "orjson",
+    or "auto" (orjson when importable, otherwise stdlib).
+    """
+    name = (app.config.get("JSON_ENCODER") or "auto").lower()
+    if name == "auto":
+        name = "orjson" if orjson is not None else "stdlib"
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown JSON_ENCODER {name!r}; expected auto, stdlib or orjson")
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_ENCODER=orjson but the orjson package is not installed")
+    app.json = PROVIDERS[name](app)
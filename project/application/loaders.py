@@ -0,0 +1,52 @@
+from typing import Dict, List, Tuple
+
+from marshmallow import fields
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+_options_cache: Dict[Tuple[int, type], List] = {}
+
+
+def loader_options(schema, model=None) -> List:
+    """
+    Returns ORM loader options that eager-load every relationship the
+    schema is going to dump through a Nested field.
+
+    Collections use selectinload (one extra IN query per relationship, no
+    row multiplication); many-to-one relationships use joinedload. Nested
+    schemas are walked recursively, so the statement count for a dump is
+    fixed by the schema shape rather than by the number of rows.
+    """
+    model = model or schema.opts.model
+    key = (id(schema), model)
+    if key not in _options_cache:
+        _options_cache[key] = _build_options(schema, model)
+    return _options_cache[key]
+
+
+def _build_options(schema, model) -> List:
+    relationships = inspect(model).relationships
+    options = []
+    for name, field in schema.dump_fields.items():
+        nested = _nested_schema(field)
+        if nested is None:
+            continue
+        rel_name = field.attribute or name
+        if rel_name not in relationships:
+            continue
+        rel = relationships[rel_name]
+        strategy = selectinload if rel.uselist else joinedload
+        option = strategy(getattr(model, rel_name))
+        children = _build_options(nested, rel.mapper.class_)
+        if children:
+            option = option.options(*children)
+        options.append(option)
+    return options
+
+
+def _nested_schema(field):
+    if isinstance(field, fields.List):
+        field = field.inner
+    if isinstance(field, fields.Nested):
+        return field.schema
+    return None
@@ -1,7 +1,7 @@
 from typing import List
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Date, Float, ForeignKey
+from sqlalchemy import String, Date, DateTime, Float, ForeignKey, Index, event, func, update
 from .extensions import db
 
 # ---- Association Tables ----
@@ -9,18 +9,57 @@ service_mechanics = db.Table(
     "service_mechanics",
     db.metadata,
     db.Column("ticket_id", ForeignKey("service_tickets.id"), primary_key=True),
-    db.Column("mechanic_id", ForeignKey("mechanics.id"), primary_key=True),
+    # Reverse lookups (leaderboard, mechanic deletion) need mechanic_id leading.
+    db.Column("mechanic_id", ForeignKey("mechanics.id"), primary_key=True, index=True),
 )
 
 service_ticket_parts = db.Table(
     "service_ticket_parts",
     db.metadata,
     db.Column("ticket_id", ForeignKey("service_tickets.id"), primary_key=True),
-    db.Column("inventory_id", ForeignKey("inventory.id"), primary_key=True),
+    db.Column("inventory_id", ForeignKey("inventory.id"), primary_key=True, index=True),
+    db.Column("quantity", db.Integer, nullable=False, default=1, server_default="1"),
 )
 
+# ---- Row versioning ----
+def _utcnow() -> datetime:
+    # Stored naive, always UTC.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class Versioned:
+    """
+    Row version and last-write time, used for ETag / Last-Modified.
+    Both are bumped on every ORM flush of a dirty row (including changes
+    to its many-to-many collections); Core UPDATEs must bump them too.
+    """
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default="1")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=_utcnow, server_default=func.current_timestamp()
+    )
+
+
+@event.listens_for(Versioned, "before_update", propagate=True)
+def _bump_version(mapper, connection, target):
+    target.version = (target.version or 0) + 1
+    target.updated_at = _utcnow()
+
+
+def touch(model, row_id: int) -> None:
+    """
+    The before_update bump for a row changed only through Core writes
+    (e.g. its association rows), so its ETag still moves.
+    """
+    db.session.execute(
+        update(model)
+        .where(model.id == row_id)
+        .values(version=model.version + 1, updated_at=_utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
 # ---- Models ----
-class Customer(db.Model):
+class Customer(Versioned, db.Model):
     __tablename__ = "customers"
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -32,23 +71,33 @@ class Customer(db.Model):
         back_populates="customer", cascade="all, delete-orphan"
     )
 
-class Mechanic(db.Model):
+class Mechanic(Versioned, db.Model):
     __tablename__ = "mechanics"
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     phone: Mapped[str] = mapped_column(String(20), nullable=False)
     salary: Mapped[float] = mapped_column(Float, nullable=False)
+    # Denormalised count of service_mechanics rows, kept current by
+    # ticket_counts.adjust_ticket_counts() wherever assignments change.
+    ticket_count: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
 
     tickets: Mapped[List["ServiceTicket"]] = db.relationship(
         secondary=service_mechanics, back_populates="mechanics"
     )
 
-class ServiceTicket(db.Model):
+# Leaderboard top-N: walk the index in order and stop after N rows.
+Index("ix_mechanics_leaderboard", Mechanic.ticket_count.desc(), Mechanic.id)
+
+class ServiceTicket(Versioned, db.Model):
     __tablename__ = "service_tickets"
+    __table_args__ = (
+        # Serves "this customer's tickets, in id order" (my-tickets keyset pages).
+        Index("ix_service_tickets_customer_id", "customer_id", "id"),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
-    VIN: Mapped[str] = mapped_column(String(100), nullable=False)
-    service_date: Mapped[datetime.date] = mapped_column(Date, nullable=False)
+    VIN: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    service_date: Mapped[datetime.date] = mapped_column(Date, nullable=False, index=True)
     service_desc: Mapped[str] = mapped_column(String(255), nullable=False)
 
     customer_id: Mapped[int] = mapped_column(ForeignKey("customers.id"))
@@ -62,7 +111,7 @@ class ServiceTicket(db.Model):
         secondary=service_ticket_parts, back_populates="tickets"
     )
 
-class Inventory(db.Model):
+class Inventory(Versioned, db.Model):
     __tablename__ = "inventory"
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
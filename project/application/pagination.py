@@ -0,0 +1,117 @@
+import base64
+import binascii
+import json
+from typing import Any, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text
+
+from .extensions import db, cache
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 100
+
+COUNT_MODES = ("exact", "estimate", "none")
+ESTIMATED_COUNT_TIMEOUT = 300
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Returns an opaque cursor pointing just past the row with `last_id`.
+    """
+    raw = json.dumps({"id": int(last_id)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Inverse of encode_cursor. Returns None for a missing/empty cursor and
+    raises ValueError for anything that was not produced by encode_cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(data["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_limit(raw: Optional[str], default: int = DEFAULT_LIMIT, maximum: int = MAX_LIMIT) -> int:
+    """
+    Parses a `limit` query arg and clamps it to [1, maximum].
+    """
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    return min(max(value, 1), maximum)
+
+
+def keyset_page(stmt, column, after_id: Optional[int], limit: int,
+                scalars: bool = True) -> Tuple[Sequence[Any], Optional[str]]:
+    """
+    Runs `stmt` as one keyset page ordered by `column` (a unique, indexed
+    integer column such as a primary key). Pass scalars=False when `stmt`
+    selects plain columns rather than one ORM entity.
+
+    Fetches one extra row to learn whether a next page exists, so the cost
+    of a page is an index seek plus `limit` rows no matter how deep it is.
+    """
+    result = db.session.execute(keyset_statement(stmt, column, after_id, limit))
+    rows = result.scalars().all() if scalars else result.all()
+    return finish_keyset_page(rows, column, limit)
+
+
+def keyset_statement(stmt, column, after_id: Optional[int], limit: int):
+    """The statement keyset_page runs: rows after `after_id`, plus one."""
+    if after_id is not None:
+        stmt = stmt.where(column > after_id)
+    return stmt.order_by(column.asc()).limit(limit + 1)
+
+
+def finish_keyset_page(rows: Sequence[Any], column, limit: int) -> Tuple[Sequence[Any], Optional[str]]:
+    """Trims the look-ahead row off a keyset_statement result and builds the next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(getattr(rows[-1], column.key))
+
+
+
+def count_rows(model, mode: str = "exact") -> Optional[int]:
+    """
+    Row count for `model`'s table in the requested mode:
+      exact    - SELECT count(*), O(table size)
+      estimate - planner statistics on Postgres, a cached exact count elsewhere
+      none     - skip counting entirely (returns None)
+    """
+    if mode not in COUNT_MODES:
+        raise ValueError(f"count must be one of {', '.join(COUNT_MODES)}")
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        return estimate_count(model)
+    return db.session.execute(select(func.count()).select_from(model)).scalar() or 0
+
+
+def estimate_count(model) -> int:
+    table = model.__table__
+    if db.session.get_bind().dialect.name == "postgresql":
+        estimate = db.session.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": table.fullname},
+        ).scalar()
+        # reltuples is -1 (or 0) until the table has been vacuumed/analyzed.
+        if estimate is not None and estimate > 0:
+            return int(estimate)
+        return count_rows(model, "exact")
+
+    key = f"count/{table.fullname}"
+    total = cache.get(key)
+    if total is None:
+        total = count_rows(model, "exact")
+        cache.set(key, total, timeout=ESTIMATED_COUNT_TIMEOUT)
+    return total
@@ -0,0 +1,102 @@
+import threading
+from typing import Callable, Optional, Tuple, TypeVar
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+T = TypeVar("T")
+
+# Parameters werkzeug fills in when a method string leaves them out.
+_DEFAULTS = {
+    "pbkdf2": ("sha256", str(DEFAULT_PBKDF2_ITERATIONS)),
+    "scrypt": (str(2 ** 15), "8", "1"),
+}
+
+
+class HasherBusy(RuntimeError):
+    """Every KDF slot stayed taken for PASSWORD_HASH_TIMEOUT seconds."""
+
+
+def policy_method(method: Optional[str] = None) -> str:
+    """
+    PASSWORD_HASH_METHOD with werkzeug's defaults spelled out, i.e. the
+    prefix a hash made under the current policy starts with
+    ("pbkdf2" -> "pbkdf2:sha256:<default iterations>").
+    """
+    method = method or current_app.config.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+    name, *params = method.split(":")
+    defaults = _DEFAULTS.get(name, ())
+    params += defaults[len(params):]
+    return ":".join([name] + params)
+
+
+class KdfLimiter:
+    """
+    Caps how many KDF computations run at once. The work runs in the
+    caller's thread (hashlib releases the GIL inside pbkdf2/scrypt), so a
+    request waits no longer than the hash itself takes; the limit only
+    stops a login storm from occupying more than `slots` cores. Callers
+    that can't get a slot within `timeout` seconds get HasherBusy instead
+    of piling up. slots=0 is unbounded.
+    """
+
+    def __init__(self, slots: int, timeout: float):
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(slots) if slots > 0 else None
+
+    def run(self, fn: Callable[..., T], *args) -> T:
+        if self._slots is None:
+            return fn(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HasherBusy("Password hashing is saturated")
+        try:
+            return fn(*args)
+        finally:
+            self._slots.release()
+
+
+def kdf_limiter() -> KdfLimiter:
+    """The current app's KdfLimiter, sized by PASSWORD_HASH_CONCURRENCY."""
+    extensions = current_app.extensions
+    if "kdf_limiter" not in extensions:
+        config = current_app.config
+        extensions["kdf_limiter"] = KdfLimiter(
+            int(config.get("PASSWORD_HASH_CONCURRENCY", 0)),
+            float(config.get("PASSWORD_HASH_TIMEOUT", 5)),
+        )
+    return extensions["kdf_limiter"]
+
+
+def hash_password(password: str) -> str:
+    """Hashes `password` under the configured policy. May raise HasherBusy."""
+    return kdf_limiter().run(generate_password_hash, password, policy_method())
+
+
+def _weaker(stored: str, policy: str) -> bool:
+    """
+    True when a hash made with method `stored` should be upgraded to
+    `policy`: a different algorithm or digest, or the same one at a lower
+    cost. A policy set below an existing hash's cost never downgrades it.
+    """
+    stored_name, *stored_params = policy_method(stored).split(":")
+    policy_name, *policy_params = policy.split(":")
+    if stored_name != policy_name:
+        return True
+    if stored_name == "pbkdf2":
+        if stored_params[0] != policy_params[0]:
+            return True
+        stored_params, policy_params = stored_params[1:], policy_params[1:]
+    try:
+        return any(int(have) < int(want) for have, want in zip(stored_params, policy_params))
+    except ValueError:
+        return stored_params != policy_params
+
+
+def verify_password(stored_hash: str, password: str) -> Tuple[bool, bool]:
+    """
+    Returns (matches, needs_rehash). needs_rehash is True when the hash
+    was made under a different method, or a lower cost, than the current
+    policy. May raise HasherBusy.
+    """
+    matches = kdf_limiter().run(check_password_hash, stored_hash, password)
+    return matches, matches and _weaker(stored_hash.split("$", 1)[0], policy_method())
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from logging.handlers import RotatingFileHandler
+from typing import Any, Optional
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from .extensions import db
+
+slow_log = logging.getLogger("mechanic_api.sql.slow")
+
+# Distinct statements EXPLAINed per process; beyond this new ones are skipped.
+MAX_EXPLAINED = 500
+
+_EXPLAIN_PREFIX = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+
+
+def param_shape(parameters: Any, executemany: bool = False) -> Any:
+    """
+    The shape of bound parameters with the values left out (they may hold
+    emails or password hashes): type names keyed like the originals, and
+    for executemany the row count plus the first row's shape.
+    """
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "each": param_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__
+
+
+def _endpoint() -> str:
+    return (request.endpoint or "unmatched") if has_request_context() else "-"
+
+
+class QueryLog:
+    """
+    Engine listeners behind SLOW_QUERY_MS (log statements over the
+    threshold, optionally with their plan) and QUERY_TRACE_FILE (write
+    every statement of a QUERY_TRACE_SAMPLE fraction of requests).
+    """
+
+    def __init__(self, threshold_ms: Optional[float], explain: bool, sample: float,
+                 trace_logger: Optional[logging.Logger] = None):
+        self.threshold = threshold_ms / 1000 if threshold_ms else None
+        self.explain = explain
+        self.sample = sample if trace_logger is not None else 0.0
+        self.trace_logger = trace_logger
+        self.explained = set()
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("_query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+
+        if self.threshold is not None and elapsed >= self.threshold:
+            self._log_slow(conn, statement, parameters, executemany, elapsed)
+
+        trace = self._trace()
+        if trace is not None:
+            trace.append({
+                "sql": statement,
+                "params": param_shape(parameters, executemany),
+                "ms": round(elapsed * 1000, 3),
+                "rows": cursor.rowcount,
+            })
+
+    def failed(self, context):
+        # A statement that raised never reaches after_cursor_execute.
+        started = context.connection.info.get("_query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    def _log_slow(self, conn, statement, parameters, executemany, elapsed):
+        record = {
+            "endpoint": _endpoint(),
+            "ms": round(elapsed * 1000, 1),
+            "sql": statement,
+            "params": param_shape(parameters, executemany),
+        }
+        plan = None if executemany else self._explain_once(conn, statement, parameters)
+        if plan is not None:
+            record["plan"] = plan
+        slow_log.warning("slow query %s", json.dumps(record, default=str))
+
+    def _explain_once(self, conn, statement, parameters) -> Optional[list]:
+        prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+        if not self.explain or prefix is None:
+            return None
+        head = statement.lstrip()[:6].upper()
+        if not head.startswith(("SELECT", "WITH")):
+            return None  # plans for reads only; EXPLAIN never runs DML here
+        digest = hashlib.sha1(statement.encode()).hexdigest()
+        if digest in self.explained or len(self.explained) >= MAX_EXPLAINED:
+            return None
+        self.explained.add(digest)
+        # Raw DBAPI cursor on the same connection: sees the same transaction
+        # and doesn't re-enter these listeners. The savepoint keeps a failed
+        # EXPLAIN from aborting the request's transaction on PostgreSQL.
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("SAVEPOINT query_log_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = [" ".join(str(col) for col in row) for row in cursor.fetchall()]
+            except Exception as err:  # a plan is best-effort diagnostics only
+                cursor.execute("ROLLBACK TO SAVEPOINT query_log_explain")
+                plan = [f"EXPLAIN failed: {err}"]
+            cursor.execute("RELEASE SAVEPOINT query_log_explain")
+            return plan
+        except Exception as err:
+            return [f"EXPLAIN failed: {err}"]
+        finally:
+            cursor.close()
+
+    def _trace(self) -> Optional[list]:
+        if not self.sample or not has_request_context():
+            return None
+        if "_query_trace" not in g:
+            g._query_trace = [] if random.random() < self.sample else None
+        return g._query_trace
+
+    def write_trace(self, exc=None) -> None:
+        statements = g.pop("_query_trace", None)
+        if statements:
+            self.trace_logger.info(json.dumps({
+                "ts": time.time(),
+                "endpoint": request.endpoint or "unmatched",
+                "method": request.method,
+                "path": request.path,
+                "statements": statements,
+            }, default=str))
+
+
+def _trace_logger(config) -> logging.Logger:
+    # One logger per trace file, writing JSON lines with size-based rotation.
+    path = os.path.abspath(config["QUERY_TRACE_FILE"])
+    logger = logging.getLogger("mechanic_api.sql.trace").getChild(hashlib.sha1(path.encode()).hexdigest()[:8])
+    if not logger.handlers:
+        handler = RotatingFileHandler(
+            path,
+            maxBytes=int(config.get("QUERY_TRACE_MAX_BYTES", 10 * 1024 * 1024)),
+            backupCount=int(config.get("QUERY_TRACE_BACKUPS", 5)),
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def init_query_log(app) -> None:
+    """
+    Installs the slow-query log and sampled trace file when configured
+    (SLOW_QUERY_MS, QUERY_TRACE_FILE); otherwise registers nothing. Must
+    run after db.init_app().
+    """
+    config = app.config
+    threshold = config.get("SLOW_QUERY_MS")
+    sample = float(config.get("QUERY_TRACE_SAMPLE", 0.01)) if config.get("QUERY_TRACE_FILE") else 0.0
+    if not threshold and not sample:
+        return
+
+    query_log = app.extensions["query_log"] = QueryLog(
+        threshold,
+        config.get("SLOW_QUERY_EXPLAIN", False),
+        sample,
+        _trace_logger(config) if sample else None,
+    )
+    if sample:
+        app.teardown_request(query_log.write_trace)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, "before_cursor_execute", query_log.before)
+            event.listen(engine, "after_cursor_execute", query_log.after)
+            event.listen(engine, "handle_error", query_log.failed)
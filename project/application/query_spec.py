@@ -0,0 +1,220 @@
+import base64
+import binascii
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from marshmallow import ValidationError, fields as ma_fields
+from sqlalchemy import and_, inspect, or_
+from sqlalchemy.orm import load_only
+
+from .extensions import db
+from .serializers import compile_schema
+
+# filter[<field>]=v is eq; filter[<field>][<op>]=v for the rest.
+OPERATORS = {
+    "eq": lambda col, v: col == v,
+    "ne": lambda col, v: col != v,
+    "lt": lambda col, v: col < v,
+    "lte": lambda col, v: col <= v,
+    "gt": lambda col, v: col > v,
+    "gte": lambda col, v: col >= v,
+    "in": lambda col, v: col.in_(v),
+}
+
+_FILTER_ARG = re.compile(r"^filter\[(\w+)\](?:\[(\w+)\])?$")
+
+
+class QuerySpec(NamedTuple):
+    filters: List[Tuple[str, str, Any]]
+    sort: List[Tuple[str, bool]]  # (field, descending)
+    fields: Optional[Tuple[str, ...]]
+
+
+class CollectionSpec:
+    """
+    What one collection endpoint lets clients ask for: the fields that
+    may appear in filter[...] and sort=, and the (single-object) schema
+    whose dump fields fields= picks from. Filter values are parsed by the schema's
+    own fields, so ?filter[service_date][gte]=2025-09-01 compares dates.
+    Everything compiles to SQL; nothing is filtered in Python.
+    """
+
+    def __init__(self, schema, filters: Sequence[str] = (), sorts: Sequence[str] = ("id",)):
+        self.schema = schema
+        self.model = schema.opts.model
+        self.filters = tuple(filters)
+        self.sorts = tuple(sorts)
+        self._full_dump = compile_schema(schema)
+        self._subsets: Dict[Tuple[str, ...], Tuple[Any, Any]] = {}
+
+    # ---- parsing ----
+    def parse(self, args) -> QuerySpec:
+        """Reads filter[...], sort= and fields= from `args`. Raises ValueError."""
+        filters = []
+        for key, raw in args.items(multi=True):
+            match = _FILTER_ARG.match(key)
+            if not match:
+                continue
+            name, op = match.group(1), match.group(2) or "eq"
+            if name not in self.filters:
+                raise ValueError(f"Cannot filter on {name}; allowed: {', '.join(self.filters)}")
+            if op not in OPERATORS:
+                raise ValueError(f"Unknown operator {op}; allowed: {', '.join(OPERATORS)}")
+            value = [self.parse_value(name, v) for v in raw.split(",")] if op == "in" else self.parse_value(name, raw)
+            filters.append((name, op, value))
+
+        sort = []
+        for item in filter(None, (args.get("sort") or "").split(",")):
+            name = item.lstrip("-")
+            if name not in self.sorts:
+                raise ValueError(f"Cannot sort on {name}; allowed: {', '.join(self.sorts)}")
+            sort.append((name, item.startswith("-")))
+
+        fields = None
+        if args.get("fields"):
+            fields = tuple(dict.fromkeys(f.strip() for f in args["fields"].split(",") if f.strip()))
+            unknown = [f for f in fields if f not in self.schema.dump_fields]
+            if unknown or not fields:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}; allowed: {', '.join(self.schema.dump_fields)}")
+        return QuerySpec(filters, sort, fields)
+
+    def parse_value(self, name: str, raw):
+        """`raw` as the named field would load it (date, float, ...)."""
+        try:
+            return self.schema.fields[name].deserialize(raw)
+        except ValidationError as err:
+            raise ValueError(f"filter[{name}]: {' '.join(err.messages)}")
+
+    # ---- compiling ----
+    def column(self, name: str):
+        field = self.schema.fields[name]
+        return getattr(self.model, field.attribute or name)
+
+    def where(self, spec: QuerySpec) -> list:
+        return [OPERATORS[op](self.column(name), value) for name, op, value in spec.filters]
+
+    def order_by(self, spec: QuerySpec) -> list:
+        """The requested order, with id as the tiebreaker that keeps it total."""
+        clauses = [self.column(name).desc() if desc else self.column(name).asc() for name, desc in spec.sort]
+        if not any(name == "id" for name, _ in spec.sort):
+            clauses.append(self.model.id.asc())
+        return clauses
+
+    def _fields(self, spec: QuerySpec) -> Tuple[str, ...]:
+        return spec.fields or tuple(self.schema.dump_fields)
+
+    def columns(self, spec: QuerySpec) -> list:
+        """Model columns for a Core select of the requested (non-nested) fields."""
+        columns = []
+        for name in self._fields(spec):
+            if isinstance(self.schema.fields[name], ma_fields.Nested):
+                raise ValueError(f"{name} is nested; load ORM objects instead")
+            column = self.column(name)
+            if column not in columns:
+                columns.append(column)
+        return columns
+
+    def load_only(self, spec: QuerySpec, *extra: str):
+        """
+        load_only() for the requested column fields plus `extra` (e.g. a
+        sort key). The primary key is always loaded: cursors and nested
+        loaders need it, and fields= may name nested fields only.
+        """
+        mapper = inspect(self.model)
+        names = [mapper.get_property_by_column(c).key for c in mapper.primary_key]
+        names += [self.schema.fields[n].attribute or n for n in self._fields(spec) + extra]
+        return load_only(*[getattr(self.model, n) for n in dict.fromkeys(names) if n in mapper.column_attrs])
+
+    def subset(self, spec: QuerySpec):
+        """The schema narrowed to the requested fields (the schema itself when none)."""
+        if spec.fields is None:
+            return self.schema
+        return self._subset(spec.fields)[0]
+
+    def dumper(self, spec: QuerySpec):
+        """A compiled one-row dump of just the requested fields; cached per field set."""
+        if spec.fields is None:
+            return self._full_dump
+        return self._subset(spec.fields)[1]
+
+    def _subset(self, fields: Tuple[str, ...]):
+        if fields not in self._subsets:
+            schema = type(self.schema)(only=fields)
+            self._subsets[fields] = (schema, compile_schema(schema))
+        return self._subsets[fields]
+
+
+# ---- Keyset pages in any sort= order ----
+def encode_seek(key_values: Sequence[Any], last_id: int) -> str:
+    raw = json.dumps({"k": list(key_values), "id": int(last_id)}, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_seek(cursor: Optional[str]) -> Optional[Tuple[List[Any], int]]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        keys = data.get("k")
+        return (keys if isinstance(keys, list) else [keys]), int(data["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError("Invalid cursor")
+
+
+def _seek_keys(spec: QuerySpec) -> List[Tuple[str, bool]]:
+    """The keys a page boundary is compared on: sort= up to id, or with id appended."""
+    keys = []
+    for name, desc in spec.sort:
+        keys.append((name, desc))
+        if name == "id":
+            return keys  # unique, so later keys never decide anything
+    return keys + [("id", False)]
+
+
+def seek_page(collection: CollectionSpec, spec: QuerySpec, stmt, cursor: Optional[str], limit: int):
+    """
+    One keyset page of ORM rows in sort= order (one key or several), id
+    breaking ties. The cursor carries the last row's sort values and id,
+    so deep pages stay an index seek. Raises ValueError for a bad cursor.
+    """
+    rows = db.session.scalars(seek_statement(collection, spec, stmt, cursor, limit)).all()
+    return finish_seek_page(collection, spec, rows, limit)
+
+
+def seek_statement(collection: CollectionSpec, spec: QuerySpec, stmt, cursor: Optional[str], limit: int):
+    """The statement seek_page runs: the page after `cursor`, plus one row."""
+    after = decode_seek(cursor)
+    if after is not None:
+        last_keys, last_id = after
+        keys = _seek_keys(spec)
+        named = [name for name, _ in keys if name != "id"]
+        if len(last_keys) < len(named):
+            raise ValueError("Invalid cursor")
+        values = {name: collection.parse_value(name, raw) for name, raw in zip(named, last_keys)}
+        values["id"] = last_id
+
+        # (a, b, id) after (x, y, z): a past x, or a = x and b past y, or ...
+        def column(name):
+            return collection.model.id if name == "id" else collection.column(name)
+
+        stmt = stmt.where(or_(*(
+            and_(
+                *(column(prior) == values[prior] for prior, _ in keys[:i]),
+                column(name) < values[name] if desc else column(name) > values[name],
+            )
+            for i, (name, desc) in enumerate(keys)
+        )))
+    return stmt.order_by(*collection.order_by(spec)).limit(limit + 1)
+
+
+def finish_seek_page(collection: CollectionSpec, spec: QuerySpec, rows: Sequence, limit: int):
+    """Trims the look-ahead row off a seek_statement result and builds the next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    fields = collection.schema.fields
+    key_values = [fields[name].serialize(name, last) for name, _ in _seek_keys(spec) if name != "id"]
+    return rows, encode_seek(key_values, last.id)
@@ -0,0 +1,92 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, request
+from flask_limiter.util import get_remote_address
+
+from .extensions import cache
+from .session import REPLICA_BIND
+
+_STICKY_KEY = "sticky-primary/%s"
+_RECENT_WRITE_KEY = "recent-write/%s"
+
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def configure_replica(app) -> None:
+    """
+    Registers SQLALCHEMY_REPLICA_URI as the "replica" bind and installs the
+    read-your-writes hook. Must run before db.init_app(). No-op without a
+    replica URI, in which case read_replica routes simply use the primary.
+    """
+    uri = app.config.get("SQLALCHEMY_REPLICA_URI")
+    if not uri:
+        return
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    binds[REPLICA_BIND] = uri
+    app.config["SQLALCHEMY_BINDS"] = binds
+    app.after_request(_stick_after_write)
+
+
+def _client_key() -> str:
+    # Per token when authenticated, else per address (as the rate limiter).
+    auth = request.headers.get("Authorization")
+    ident = f"auth:{auth}" if auth else f"addr:{get_remote_address()}"
+    return hashlib.sha1(ident.encode()).hexdigest()
+
+
+def _stick_after_write(response):
+    # A client that just wrote reads from the primary for a short window,
+    # so replication lag can't hide its own write from it.
+    if request.method not in _SAFE_METHODS and response.status_code < 400:
+        window = current_app.config.get("REPLICA_STICKY_SECONDS", 5)
+        if window > 0:
+            cache.set(_STICKY_KEY % _client_key(), True, timeout=window)
+    return response
+
+
+def read_replica(view):
+    """
+    Lets a read-only view's queries run on the replica, unless the client
+    wrote within the last REPLICA_STICKY_SECONDS. Put it above any
+    decorator that queries (cached_view, conditional) so they route too.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        route_reads()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def route_reads() -> None:
+    """Sets g.db_route / g.read_your_writes for the current read (see read_replica)."""
+    if current_app.config.get("SQLALCHEMY_REPLICA_URI"):
+        if cache.get(_STICKY_KEY % _client_key()):
+            g.read_your_writes = True
+        else:
+            g.db_route = REPLICA_BIND
+
+
+def note_write(*resources: str) -> None:
+    """
+    Records that `resources` just changed on the primary (called by
+    caching.bump), so replica reads aren't cached until the replica has
+    had REPLICA_STICKY_SECONDS to catch up.
+    """
+    window = current_app.config.get("REPLICA_STICKY_SECONDS", 5)
+    if current_app.config.get("SQLALCHEMY_REPLICA_URI") and window > 0:
+        cache.set_many({_RECENT_WRITE_KEY % r: True for r in resources}, timeout=window)
+
+
+def cacheable(resources) -> bool:
+    """
+    False when a response built now must not be cached: the client is
+    pinned to the primary after its own write, or the read is going to a
+    replica that may not have the latest write to `resources` yet. An
+    entry cached in either case could hide that write for the full TTL.
+    """
+    if g.get("read_your_writes", False):
+        return False
+    if g.get("db_route") == REPLICA_BIND and resources:
+        return not any(cache.get_many(*(_RECENT_WRITE_KEY % r for r in resources)))
+    return True
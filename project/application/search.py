@@ -0,0 +1,233 @@
+import re
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import click
+from flask import jsonify, request
+from flask.cli import AppGroup
+from sqlalchemy import Column, Integer, MetaData, Table, Text, event, func, inspect, literal_column, select, text
+from sqlalchemy.dialects import postgresql
+
+from .extensions import db
+from .caching import bump
+from .models import Customer, Inventory, ServiceTicket
+from .pagination import parse_limit
+
+# Columns folded into each model's searchable text.
+SEARCHABLE = {
+    ServiceTicket: ("VIN", "service_desc"),
+    Customer: ("name", "email", "phone"),
+    Inventory: ("name",),
+}
+
+# The trigram index can't match fragments shorter than this.
+MIN_TERM = 3
+
+# Kept out of db.metadata: on SQLite these are FTS5 virtual tables, which
+# create_all and alembic autogenerate can't express. See _create_tables.
+_search_metadata = MetaData()
+TABLES = {
+    model: Table(
+        f"search_{model.__tablename__}", _search_metadata,
+        Column("rowid", Integer, primary_key=True),
+        Column("body", Text, nullable=False),
+    )
+    for model in SEARCHABLE
+}
+
+
+def _body(model, values) -> str:
+    return " ".join(str(values[name]) for name in SEARCHABLE[model] if values.get(name) is not None)
+
+
+# ---- DDL ----
+def create_statements(dialect: str) -> List[str]:
+    """DDL for the search tables on `dialect` (mirrored by the 7f3b8d2c6e90 migration)."""
+    statements = []
+    if dialect == "postgresql":
+        statements.append("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in TABLES.values():
+        if dialect == "sqlite":
+            statements.append(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table.name} USING fts5(body, tokenize='trigram')"
+            )
+        elif dialect == "postgresql":
+            statements += [
+                f"CREATE TABLE IF NOT EXISTS {table.name} (rowid INTEGER PRIMARY KEY, body TEXT NOT NULL)",
+                f"CREATE INDEX IF NOT EXISTS ix_{table.name}_trgm ON {table.name} USING gin (body gin_trgm_ops)",
+            ]
+        else:
+            statements.append(f"CREATE TABLE IF NOT EXISTS {table.name} (rowid INTEGER PRIMARY KEY, body TEXT NOT NULL)")
+    return statements
+
+
+def drop_statements() -> List[str]:
+    return [f"DROP TABLE IF EXISTS {table.name}" for table in TABLES.values()]
+
+
+@event.listens_for(db.metadata, "after_create")
+def _create_tables(target, connection, **kw):
+    for statement in create_statements(connection.dialect.name):
+        connection.execute(text(statement))
+
+
+@event.listens_for(db.metadata, "before_drop")
+def _drop_tables(target, connection, **kw):
+    for statement in drop_statements():
+        connection.execute(text(statement))
+
+
+# ---- Keeping the index in sync ----
+def _rows(model, bodies: Dict[int, str]) -> List[dict]:
+    return [{"rowid": rid, "body": body} for rid, body in bodies.items()]
+
+
+def _upsert(connection, model, bodies: Dict[int, str]) -> None:
+    table = TABLES[model]
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        # FTS5 honours OR REPLACE on rowid.
+        connection.execute(table.insert().prefix_with("OR REPLACE"), _rows(model, bodies))
+    elif dialect == "postgresql":
+        stmt = postgresql.insert(table)
+        connection.execute(
+            stmt.on_conflict_do_update(index_elements=[table.c.rowid], set_={"body": stmt.excluded.body}),
+            _rows(model, bodies),
+        )
+    else:
+        connection.execute(table.delete().where(table.c.rowid.in_(list(bodies))))
+        connection.execute(table.insert(), _rows(model, bodies))
+
+
+def index_rows(model, rows: Dict[int, dict]) -> None:
+    """
+    Indexes newly inserted rows written with Core (bulk inserts), which
+    the ORM events below never see. `rows` maps id -> column values.
+    Runs in the caller's transaction.
+    """
+    if model in SEARCHABLE and rows:
+        db.session.execute(TABLES[model].insert(), _rows(model, {rid: _body(model, values) for rid, values in rows.items()}))
+
+
+def _after_insert(mapper, connection, target):
+    model = mapper.class_
+    body = _body(model, {name: getattr(target, name) for name in SEARCHABLE[model]})
+    connection.execute(TABLES[model].insert(), _rows(model, {target.id: body}))
+
+
+def _after_update(mapper, connection, target):
+    model = mapper.class_
+    state = inspect(target)
+    # Version bumps from collection changes don't touch the text.
+    if any(state.attrs[name].history.has_changes() for name in SEARCHABLE[model]):
+        _upsert(connection, model, {target.id: _body(model, {name: getattr(target, name) for name in SEARCHABLE[model]})})
+
+
+def _after_delete(mapper, connection, target):
+    table = TABLES[mapper.class_]
+    connection.execute(table.delete().where(table.c.rowid == target.id))
+
+
+for _model in SEARCHABLE:
+    event.listen(_model, "after_insert", _after_insert)
+    event.listen(_model, "after_update", _after_update)
+    event.listen(_model, "after_delete", _after_delete)
+
+
+def rebuild(model) -> int:
+    """Re-indexes every `model` row from scratch; returns the row count."""
+    table = TABLES[model]
+    columns = [getattr(model, name) for name in SEARCHABLE[model]]
+    body = func.coalesce(columns[0], "")
+    for column in columns[1:]:
+        body = body + " " + func.coalesce(column, "")
+    db.session.execute(table.delete())
+    db.session.execute(table.insert().from_select(["rowid", "body"], select(model.id, body)))
+    return db.session.scalar(select(func.count()).select_from(table))
+
+
+# ---- Querying ----
+def parse_terms(q: str) -> List[str]:
+    """
+    Splits ?q= into terms; every term must appear (as a substring) in a
+    match. Raises ValueError when nothing searchable is left.
+    """
+    terms = [term for term in re.split(r"\s+", (q or "").strip()) if len(term) >= MIN_TERM]
+    if not terms:
+        raise ValueError(f"q needs at least one term of {MIN_TERM} or more characters")
+    return terms
+
+
+def _fts5_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_ids(model, q: str, page: int, limit: int) -> Tuple[List[int], bool]:
+    """
+    One page of `model` ids matching every term of `q`, best match first,
+    plus whether another page follows. SQLite ranks with FTS5's bm25;
+    Postgres filters through the trigram index and ranks by similarity.
+    """
+    terms = parse_terms(q)
+    table = TABLES[model]
+    dialect = db.session.get_bind().dialect.name
+    stmt = select(table.c.rowid)
+    if dialect == "sqlite":
+        stmt = stmt.where(table.c.body.op("MATCH")(" ".join(_fts5_phrase(t) for t in terms))) \
+            .order_by(literal_column("rank"), table.c.rowid)
+    else:
+        stmt = stmt.where(*[table.c.body.ilike(_like_pattern(t), escape="\\") for t in terms])
+        if dialect == "postgresql":
+            stmt = stmt.order_by(func.similarity(table.c.body, " ".join(terms)).desc(), table.c.rowid)
+        else:
+            stmt = stmt.order_by(table.c.rowid)
+    ids = list(db.session.scalars(stmt.offset((page - 1) * limit).limit(limit + 1)))
+    return ids[:limit], len(ids) > limit
+
+
+def in_order(rows: Sequence, ids: Sequence[int]) -> list:
+    """`rows` (anything with .id) rearranged into `ids` order."""
+    by_id = {row.id: row for row in rows}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def search_response(model, load: Callable[[List[int]], Sequence], dump: Callable, size_arg: str = "limit"):
+    """
+    The ?q= branch of a list view: ?q=brake pads&page=1&<size_arg>=25.
+    `load(ids)` fetches the matching rows (in any order) and `dump`
+    serialises the list; results keep their rank order.
+    """
+    try:
+        page = int(request.args.get("page", 1))
+        if page < 1:
+            raise ValueError("page must be 1 or more")
+        limit = parse_limit(request.args.get(size_arg))
+        ids, has_more = search_ids(model, request.args.get("q", ""), page, limit)
+    except ValueError as err:
+        return jsonify({"error": str(err)}), 400
+
+    rows = load(ids) if ids else []
+    return jsonify({
+        "q": request.args["q"],
+        "page": page,
+        size_arg: limit,
+        "has_more": has_more,
+        "items": dump(in_order(rows, ids)),
+    }), 200
+
+
+search_cli = AppGroup("search", help="Full-text search index.")
+
+
+# CLI: flask --app flask_app search rebuild
+@search_cli.command("rebuild")
+def rebuild_command():
+    """Rebuild the ticket, customer and part search indexes."""
+    for model in SEARCHABLE:
+        count = rebuild(model)
+        click.echo(f"Indexed {count} {model.__tablename__} row(s).")
+    db.session.commit()
+    bump("tickets", "customers", "inventory")  # cached ?q= responses
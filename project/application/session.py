@@ -0,0 +1,25 @@
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+
+
+class RoutingSession(Session):
+    """
+    db.session class that sends reads to the "replica" bind while a view
+    marked with replica.read_replica is running (g.db_route == "replica").
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary,
+    as does everything when no replica is configured.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_replica(clause):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause) -> bool:
+        if not has_request_context() or g.get("db_route") != REPLICA_BIND:
+            return False
+        if self._flushing or getattr(clause, "is_dml", False):
+            return False
+        return REPLICA_BIND in self._db.engines
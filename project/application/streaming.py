@@ -0,0 +1,72 @@
+import csv
+import io
+from typing import Callable, Optional, Sequence
+
+from flask import Response, current_app, request, stream_with_context
+
+from .extensions import db
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+CSV_MIMETYPE = "text/csv"
+STREAM_FORMATS = (NDJSON_MIMETYPE, CSV_MIMETYPE)
+
+# Rows fetched per round trip; also the unit each yielded chunk is built from.
+YIELD_PER = 500
+
+
+def stream_format() -> Optional[str]:
+    """
+    Returns the streaming mimetype the client asked for via Accept, or None
+    when plain JSON is preferred (including */* and a missing header).
+    """
+    best = request.accept_mimetypes.best_match(("application/json",) + STREAM_FORMATS)
+    return best if best in STREAM_FORMATS else None
+
+
+def stream_response(stmt, dump: Callable, fmt: str, columns: Sequence[str], scalars: bool = True) -> Response:
+    """
+    Streams every row of `stmt` as NDJSON or CSV.
+
+    Rows are pulled with yield_per (a server-side cursor where the driver
+    supports one) and each partition is encoded and yielded before the next
+    is fetched, so memory stays flat however many rows are exported.
+    `dump(row)` turns one row into a dict; `columns` fixes the CSV header.
+    """
+    encode = _ndjson_chunk if fmt == NDJSON_MIMETYPE else _csv_chunk
+    json_dumps = current_app.json.dumps
+
+    def generate():
+        if fmt == CSV_MIMETYPE:
+            yield _csv_line(columns)
+        result = db.session.execute(stmt.execution_options(yield_per=YIELD_PER))
+        if scalars:
+            result = result.scalars()
+        for partition in result.partitions():
+            yield encode([dump(row) for row in partition], columns, json_dumps)
+
+    return Response(stream_with_context(generate()), mimetype=fmt)
+
+
+def _ndjson_chunk(items, columns, json_dumps) -> str:
+    return "".join(json_dumps(item, separators=(",", ":")) + "\n" for item in items)
+
+
+def _csv_chunk(items, columns, json_dumps) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for item in items:
+        writer.writerow([_csv_cell(item.get(c)) for c in columns])
+    return buf.getvalue()
+
+
+def _csv_line(values) -> str:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(values)
+    return buf.getvalue()
+
+
+def _csv_cell(value):
+    # Nested collections (e.g. a ticket's mechanics) flatten to "1;2;3".
+    if isinstance(value, list):
+        return ";".join(str(v.get("id") if isinstance(v, dict) else v) for v in value)
+    return "" if value is None else value
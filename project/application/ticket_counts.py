@@ -0,0 +1,59 @@
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import func, select, update
+
+from .extensions import db
+from .models import Mechanic, service_mechanics
+
+
+def adjust_ticket_counts(added: Iterable[int] = (), removed: Iterable[int] = ()) -> None:
+    """
+    Applies mechanic assignment changes to the denormalised
+    Mechanic.ticket_count. Pass the mechanic id of every service_mechanics
+    row inserted (`added`) or deleted (`removed`); ids may repeat.
+
+    Runs in the caller's transaction with one UPDATE per distinct delta
+    (usually a single statement), so counts commit or roll back together
+    with the assignment rows. Every write to service_mechanics must call
+    this; reconcile_ticket_counts() repairs any drift.
+    """
+    deltas = Counter(added)
+    deltas.subtract(Counter(removed))
+    by_delta = {}
+    for mechanic_id, delta in deltas.items():
+        if delta:
+            by_delta.setdefault(delta, []).append(mechanic_id)
+    for delta, ids in by_delta.items():
+        db.session.execute(
+            update(Mechanic)
+            .where(Mechanic.id.in_(ids))
+            .values(ticket_count=Mechanic.ticket_count + delta)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _actual_count():
+    return (
+        select(func.count())
+        .select_from(service_mechanics)
+        .where(service_mechanics.c.mechanic_id == Mechanic.id)
+        .scalar_subquery()
+    )
+
+
+def reconcile_ticket_counts() -> int:
+    """
+    Recomputes every Mechanic.ticket_count from service_mechanics and
+    returns how many mechanics had drifted. Does not commit.
+    """
+    actual = _actual_count()
+    drifted = db.session.scalar(select(func.count()).select_from(Mechanic).where(Mechanic.ticket_count != actual))
+    if drifted:
+        db.session.execute(
+            update(Mechanic)
+            .where(Mechanic.ticket_count != actual)
+            .values(ticket_count=actual)
+            .execution_options(synchronize_session=False)
+        )
+    return drifted
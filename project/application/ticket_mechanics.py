@@ -0,0 +1,86 @@
+from typing import Any, Iterable, List, Set
+
+from sqlalchemy import delete, select
+
+from .extensions import db
+from .models import Mechanic, ServiceTicket, service_mechanics, touch
+from .ticket_counts import adjust_ticket_counts
+
+
+def parse_ids(raw: Any, field: str) -> List[int]:
+    """
+    Validates a list of mechanic ids from a request body, keeping order
+    and dropping repeats. Raises ValueError naming `field`.
+    """
+    if raw is None:
+        return []
+    if not isinstance(raw, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in raw):
+        raise ValueError(f"{field} must be a list of integers")
+    return list(dict.fromkeys(raw))
+
+
+def missing_mechanics(ids: Iterable[int]) -> List[int]:
+    """The ids (in the given order) with no Mechanic row. One query."""
+    ids = list(ids)
+    if not ids:
+        return []
+    known = set(db.session.scalars(select(Mechanic.id).where(Mechanic.id.in_(ids))))
+    return [i for i in ids if i not in known]
+
+
+def _assigned(ticket_id: int, among: Set[int] = None) -> Set[int]:
+    stmt = select(service_mechanics.c.mechanic_id).where(service_mechanics.c.ticket_id == ticket_id)
+    if among is not None:
+        stmt = stmt.where(service_mechanics.c.mechanic_id.in_(among))
+    return set(db.session.scalars(stmt))
+
+
+def _apply(ticket_id: int, to_insert: Set[int], to_delete: Set[int], bump_version: bool = True) -> bool:
+    if to_delete:
+        db.session.execute(
+            delete(service_mechanics)
+            .where(service_mechanics.c.ticket_id == ticket_id)
+            .where(service_mechanics.c.mechanic_id.in_(to_delete))
+        )
+    if to_insert:
+        db.session.execute(
+            service_mechanics.insert(),
+            [{"ticket_id": ticket_id, "mechanic_id": mid} for mid in sorted(to_insert)]
+        )
+    if not (to_insert or to_delete):
+        return False
+    adjust_ticket_counts(added=to_insert, removed=to_delete)
+    if bump_version:
+        touch(ServiceTicket, ticket_id)
+    return True
+
+
+def change_mechanics(ticket_id: int, add: Iterable[int] = (), remove: Iterable[int] = ()) -> bool:
+    """
+    Adds and removes mechanic assignments on one ticket with set-based
+    statements on service_mechanics: one SELECT of the affected pairs,
+    then at most one DELETE and one multi-row INSERT, whatever the list
+    sizes. An id in both lists ends up removed. Ids must already be
+    validated. Returns whether anything changed; does not commit.
+    """
+    add, remove = set(add), set(remove)
+    current = _assigned(ticket_id, add | remove)
+    return _apply(ticket_id, add - remove - current, remove & current)
+
+
+def replace_mechanics(ticket_id: int, ids: Iterable[int]) -> bool:
+    """
+    Makes `ids` the ticket's full set of mechanics, writing only the
+    difference. Same statement count and contract as change_mechanics().
+    """
+    wanted = set(ids)
+    current = _assigned(ticket_id)
+    return _apply(ticket_id, wanted - current, current - wanted)
+
+
+def assign_new_ticket(ticket_id: int, ids: Iterable[int]) -> None:
+    """
+    Links a just-inserted (flushed) ticket to `ids` with one multi-row
+    INSERT. Ids must already be validated; does not commit.
+    """
+    _apply(ticket_id, set(ids), set(), bump_version=False)
@@ -0,0 +1,73 @@
+from typing import Dict, List
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from .extensions import db
+from .models import Inventory, ServiceTicket, service_ticket_parts, touch
+
+# Dialects with INSERT .. ON CONFLICT; others take the delete-then-insert path.
+_UPSERT_INSERT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def missing_parts(part_ids) -> List[int]:
+    """The ids (in the given order) with no Inventory row. One query."""
+    part_ids = list(part_ids)
+    if not part_ids:
+        return []
+    known = set(db.session.scalars(select(Inventory.id).where(Inventory.id.in_(part_ids))))
+    return [i for i in part_ids if i not in known]
+
+
+def attach_parts(ticket_id: int, quantities: Dict[int, int], overwrite: bool = True) -> bool:
+    """
+    Upserts the ticket's service_ticket_parts rows for `quantities`
+    ({part_id: quantity}) in one statement. A part already on the ticket
+    gets the new quantity, or keeps its own when `overwrite` is False.
+    Ids must already be validated. Returns whether any row was written
+    (and the ticket's version bumped); does not commit.
+    """
+    if not quantities:
+        return False
+    rows = [{"ticket_id": ticket_id, "inventory_id": pid, "quantity": qty} for pid, qty in sorted(quantities.items())]
+    key = [service_ticket_parts.c.ticket_id, service_ticket_parts.c.inventory_id]
+
+    insert = _UPSERT_INSERT.get(db.engine.dialect.name)
+    if insert is not None:
+        stmt = insert(service_ticket_parts).values(rows)
+        if overwrite:
+            stmt = stmt.on_conflict_do_update(index_elements=key, set_={"quantity": stmt.excluded.quantity})
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=key)
+        written = db.session.execute(stmt).rowcount
+    else:
+        existing = service_ticket_parts.c.inventory_id.in_(list(quantities))
+        where = (service_ticket_parts.c.ticket_id == ticket_id) & existing
+        if overwrite:
+            db.session.execute(delete(service_ticket_parts).where(where))
+        else:
+            present = set(db.session.scalars(select(service_ticket_parts.c.inventory_id).where(where)))
+            rows = [row for row in rows if row["inventory_id"] not in present]
+        if rows:
+            db.session.execute(service_ticket_parts.insert(), rows)
+        written = len(rows)
+    if written:
+        touch(ServiceTicket, ticket_id)
+    return bool(written)
+
+
+def part_lines(ticket_id: int) -> List[dict]:
+    """The ticket's parts with their quantities, in part id order."""
+    rows = db.session.execute(
+        select(Inventory.id, Inventory.name, Inventory.price, service_ticket_parts.c.quantity)
+        .join(service_ticket_parts, service_ticket_parts.c.inventory_id == Inventory.id)
+        .where(service_ticket_parts.c.ticket_id == ticket_id)
+        .order_by(Inventory.id)
+    ).all()
+    return [
+        {"part_id": r.id, "name": r.name, "price": r.price, "quantity": r.quantity}
+        for r in rows
+    ]
@@ -0,0 +1,222 @@
+"""
+Requests/sec and latency percentiles for the read endpoints at high
+concurrency, served by gunicorn (WSGI, flask_app.py) and by uvicorn
+(ASGI, asgi_app.py) against the same seeded database.
+
+    python -m project.benchmarks.bench_async --concurrency 256 --duration 20
+    python -m project.benchmarks.bench_async --database-url postgresql://u:p@localhost/bench
+
+SQLite answers in microseconds, so the async mode only pays off against a
+networked database; use --database-url for numbers that mean something.
+The response cache is off by default (--cache null) so every request
+reaches the database.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from project.application import create_app
+from project.application.config.init import ProductionConfig
+from project.application.extensions import db
+
+
+def bench_config():
+    """ProductionConfig without rate limits or query logging, read from the env the harness sets."""
+    class BenchConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = os.environ["BENCH_DATABASE_URL"]
+        CACHE_BACKEND = os.environ.get("BENCH_CACHE", "null")
+        RATELIMIT_ENABLED = False
+        SLOW_QUERY_MS = None
+        QUERY_TRACE_FILE = None
+        ASGI_SYNC_THREADS = int(os.environ.get("ASGI_SYNC_THREADS", 8))
+    return BenchConfig
+
+
+# Server factories: gunicorn 'project.benchmarks.bench_async:wsgi_app()',
+# uvicorn --factory project.benchmarks.bench_async:asgi_app
+def wsgi_app():
+    return create_app(bench_config())
+
+
+def asgi_app():
+    from project.application.asgi import AsgiApp
+    return AsgiApp(wsgi_app())
+
+
+def percentiles(samples):
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(samples)}
+
+
+def seed(args):
+    app = wsgi_app()
+    with app.app_context():
+        db.create_all(bind_key=None)
+    client = app.test_client()
+    client.post("/mechanics/bulk", json=[
+        {"name": f"Mechanic {i}", "email": f"m{i}@example.com", "phone": "555", "salary": 3000 + i % 50 * 100}
+        for i in range(args.mechanics)
+    ])
+    client.post("/inventory/bulk", json=[{"name": f"Part {i}", "price": float(i % 90 + 1)} for i in range(args.parts)])
+    customer_id = client.post("/customers/", json={
+        "name": "Bench", "email": "bench@example.com", "phone": "555", "password": "Secret123!"
+    }).get_json()["id"]
+    client.post("/service_tickets/bulk", json=[
+        {"VIN": f"BENCH{i:06d}", "service_date": f"2025-09-{i % 28 + 1:02d}", "service_desc": "Service",
+         "customer_id": customer_id, "mechanic_ids": [i % args.mechanics + 1]}
+        for i in range(args.tickets)
+    ])
+    return [
+        "/mechanics/?sort=-salary&fields=id,name",
+        "/mechanics/leaderboard?limit=10",
+        "/mechanics/7",
+        "/inventory/?filter[price][lte]=20&sort=-price",
+        "/inventory/11",
+        "/service_tickets/?limit=25",
+        "/service_tickets/?limit=25&sort=-service_date",
+        "/service_tickets/5",
+    ]
+
+
+# ---- Servers ----
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, args, env):
+    port = _free_port()
+    if mode == "sync":
+        cmd = [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", "-w", str(args.workers),
+               "-k", "gthread", "--threads", str(args.threads), "--backlog", "4096",
+               "--log-level", "warning", "project.benchmarks.bench_async:wsgi_app()"]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "project.benchmarks.bench_async:asgi_app", "--factory",
+               "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers),
+               "--backlog", "4096", "--no-access-log", "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1):
+                return proc, port
+        except OSError:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{mode} server exited with {proc.returncode}")
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{mode} server did not start")
+
+
+# ---- Load ----
+async def _read_response(reader):
+    """Reads one HTTP/1.1 response; returns (status, keep_alive)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status, headers.get("connection", "").lower() != "close"
+
+
+async def _client(port, paths, offset, stop_at, record_from, latencies, errors):
+    reader = writer = None
+    i = offset
+    while time.perf_counter() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        began = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode())
+            await writer.drain()
+            status, keep_alive = await _read_response(reader)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            errors.append(path)
+            if writer is not None:
+                writer.close()
+            writer = None
+            continue
+        if began >= record_from:
+            latencies.append((time.perf_counter() - began) * 1000)
+            if status != 200:
+                errors.append(path)
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, paths, args):
+    latencies, errors = [], []
+    record_from = time.perf_counter() + args.warmup
+    stop_at = record_from + args.duration
+    await asyncio.gather(*(
+        _client(port, paths, n, stop_at, record_from, latencies, errors) for n in range(args.concurrency)
+    ))
+    return len(latencies) / args.duration, percentiles(latencies), len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="server database to use instead of a throwaway SQLite file")
+    parser.add_argument("--cache", default="null", help="CACHE_BACKEND for both servers")
+    parser.add_argument("--concurrency", type=int, default=256, help="open client connections")
+    parser.add_argument("--duration", type=float, default=20, help="measured seconds per mode")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds per mode")
+    parser.add_argument("--workers", type=int, default=2, help="server processes per mode")
+    parser.add_argument("--threads", type=int, default=8, help="gthread threads per gunicorn worker")
+    parser.add_argument("--mechanics", type=int, default=200)
+    parser.add_argument("--parts", type=int, default=500)
+    parser.add_argument("--tickets", type=int, default=5000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-async-")
+    url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    env = {**os.environ, "BENCH_DATABASE_URL": url, "BENCH_CACHE": args.cache,
+           "WEB_CONCURRENCY": str(args.workers), "ASGI_SYNC_THREADS": str(args.threads)}
+    os.environ.update(env)
+    try:
+        paths = seed(args)
+        print(f"{args.concurrency} connections, {args.workers} workers, {args.duration:.0f}s per mode, "
+              f"cache={args.cache}, {url.split('://')[0]}")
+        print(f"{'mode':<6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  errors")
+        for mode in ("sync", "async"):
+            proc, port = start_server(mode, args, env)
+            try:
+                rps, stats, errors = asyncio.run(load(port, paths, args))
+            finally:
+                proc.terminate()
+                proc.wait()
+            print(f"{mode:<6} {rps:>9.0f} " + " ".join(f"{stats[k]:>8.1f}" for k in ("p50", "p95", "p99", "max"))
+                  + f"  {errors}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Measures the per-request overhead of token_required with the verified
+claims cache disabled ("before", JWT_CLAIMS_CACHE_SIZE=0) and enabled
+("after"). Only the decorator runs; the wrapped view does nothing.
+
+    python -m project.benchmarks.bench_auth --requests 20000
+"""
+import argparse
+import time
+
+from project.application import create_app
+from project.application.auth import encode_token, token_required
+from project.application.config.init import TestingConfig
+
+
+@token_required
+def _noop(customer_id):
+    return customer_id
+
+
+def per_request_us(size, requests):
+    class BenchConfig(TestingConfig):
+        JWT_CLAIMS_CACHE_SIZE = size
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        token = encode_token(1)
+    with app.test_request_context(headers={"Authorization": f"Bearer {token}"}):
+        _noop()  # warm up (and fill the cache when enabled)
+        began = time.perf_counter()
+        for _ in range(requests):
+            _noop()
+        return (time.perf_counter() - began) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    before = per_request_us(0, args.requests)
+    after = per_request_us(1024, args.requests)
+    print(f"{'claims cache':<14}  {'us/request':>10}")
+    print(f"{'off (before)':<14}  {before:>10.1f}")
+    print(f"{'on (after)':<14}  {after:>10.1f}")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Seeds a large synthetic dataset into a throwaway SQLite file and times the
+SQL behind each index-sensitive endpoint, first without the secondary
+indexes declared in models.py ("before") and then with them ("after").
+
+    python -m project.benchmarks.bench_indexes --tickets 200000
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import delete, func, insert, select, text
+
+from project.application import create_app
+from project.application.config.init import TestingConfig
+from project.application.extensions import db
+from project.application.models import (
+    Customer, Inventory, Mechanic, ServiceTicket, service_mechanics, service_ticket_parts,
+)
+
+CHUNK = 10000
+
+
+def _chunks(rows):
+    for i in range(0, len(rows), CHUNK):
+        yield rows[i:i + CHUNK]
+
+
+def seed(args):
+    rng = random.Random(42)
+    conn = db.session.connection()
+    conn.execute(insert(Customer), [
+        {"name": f"Customer {i}", "email": f"c{i}@example.com", "phone": "555-000-0000", "password_hash": "x"}
+        for i in range(1, args.customers + 1)
+    ])
+    conn.execute(insert(Mechanic), [
+        {"name": f"Mechanic {i}", "email": f"m{i}@example.com", "phone": "555-000-0000", "salary": 4000.0}
+        for i in range(1, args.mechanics + 1)
+    ])
+    conn.execute(insert(Inventory), [
+        {"name": f"Part {i}", "price": round(rng.uniform(5, 500), 2)}
+        for i in range(1, args.parts + 1)
+    ])
+
+    start = date(2020, 1, 1)
+    tickets = [{
+        "VIN": f"1HGCM{i:012d}",
+        "service_date": start + timedelta(days=rng.randrange(2000)),
+        "service_desc": "Synthetic job",
+        "customer_id": rng.randint(1, args.customers),
+    } for i in range(1, args.tickets + 1)]
+    for chunk in _chunks(tickets):
+        conn.execute(insert(ServiceTicket), chunk)
+
+    mech_rows, part_rows = [], []
+    for ticket_id in range(1, args.tickets + 1):
+        for mechanic_id in rng.sample(range(1, args.mechanics + 1), 2):
+            mech_rows.append({"ticket_id": ticket_id, "mechanic_id": mechanic_id})
+        for inventory_id in rng.sample(range(1, args.parts + 1), 3):
+            part_rows.append({"ticket_id": ticket_id, "inventory_id": inventory_id})
+    for chunk in _chunks(mech_rows):
+        conn.execute(insert(service_mechanics), chunk)
+    for chunk in _chunks(part_rows):
+        conn.execute(insert(service_ticket_parts), chunk)
+    db.session.commit()
+
+
+def workloads(args):
+    """(endpoint, statement) pairs mirroring the queries each route issues."""
+    rng = random.Random(7)
+    vin = f"1HGCM{rng.randint(1, args.tickets):012d}"
+    return [
+        ("GET /mechanics/leaderboard", lambda: select(
+            Mechanic.id, Mechanic.name, func.count(service_mechanics.c.ticket_id)
+        ).join(service_mechanics, Mechanic.id == service_mechanics.c.mechanic_id, isouter=True)
+         .group_by(Mechanic.id, Mechanic.name)
+         .order_by(func.count(service_mechanics.c.ticket_id).desc(), Mechanic.id.asc())),
+        ("DELETE /mechanics/<id> (clear tickets)", lambda: delete(service_mechanics).where(
+            service_mechanics.c.mechanic_id == rng.randint(1, args.mechanics))),
+        ("DELETE /inventory/<id> (clear tickets)", lambda: delete(service_ticket_parts).where(
+            service_ticket_parts.c.inventory_id == rng.randint(1, args.parts))),
+        ("VIN lookup", lambda: select(ServiceTicket.id).where(ServiceTicket.VIN == vin)),
+        ("service_date range", lambda: select(ServiceTicket.id).where(
+            ServiceTicket.service_date.between(date(2022, 3, 1), date(2022, 3, 7)))),
+        ("GET /customers/my-tickets/", lambda: select(ServiceTicket.id, ServiceTicket.VIN).where(
+            ServiceTicket.customer_id == rng.randint(1, args.customers)
+        ).order_by(ServiceTicket.id).limit(25)),
+    ]
+
+
+def time_workloads(args):
+    results = {}
+    for name, make_stmt in workloads(args):
+        samples = []
+        for _ in range(args.repeat):
+            stmt = make_stmt()
+            started = time.perf_counter()
+            db.session.execute(stmt).all() if stmt.is_select else db.session.execute(stmt)
+            samples.append((time.perf_counter() - started) * 1000)
+            db.session.rollback()  # keep DELETE workloads from shrinking the data
+        results[name] = statistics.median(samples)
+    return results
+
+
+def secondary_indexes():
+    return [index for table in db.metadata.sorted_tables for index in table.indexes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=200000)
+    parser.add_argument("--customers", type=int, default=20000)
+    parser.add_argument("--mechanics", type=int, default=200)
+    parser.add_argument("--parts", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            print(f"Seeding {args.tickets} tickets into {workdir} ...")
+            seed(args)
+            engine = db.engine
+
+            for index in secondary_indexes():
+                index.drop(engine)
+            db.session.execute(text("ANALYZE"))
+            before = time_workloads(args)
+
+            for index in secondary_indexes():
+                index.create(engine)
+            db.session.execute(text("ANALYZE"))
+            after = time_workloads(args)
+            db.session.remove()
+            engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    width = max(len(name) for name in before)
+    print(f"{'endpoint':<{width}}  {'before ms':>10}  {'after ms':>10}  {'speedup':>8}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float("inf")
+        print(f"{name:<{width}}  {before[name]:>10.2f}  {after[name]:>10.2f}  {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
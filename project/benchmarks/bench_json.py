@@ -0,0 +1,82 @@
+"""
+Times the JSON providers on realistic service-ticket payloads: the list
+response jsonify() builds for GET /service-tickets/ and the per-row encode
+done for NDJSON streaming.
+
+    python -m project.benchmarks.bench_json --tickets 5000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from project.application import create_app
+from project.application.config.init import TestingConfig
+from project.application.json_provider import PROVIDERS
+
+
+def payload(count):
+    rng = random.Random(42)
+    start = date(2020, 1, 1)
+    return [{
+        "id": i,
+        "VIN": f"1HGCM{i:012d}",
+        "service_date": (start + timedelta(days=rng.randrange(2000))).isoformat(),
+        "service_desc": "Replace brake pads and rotors, rotate tyres",
+        "customer_id": rng.randint(1, 5000),
+        "mechanics": [
+            {"id": m, "name": f"Mechanic {m}", "email": f"m{m}@example.com",
+             "phone": "555-000-0000", "salary": round(rng.uniform(3000, 9000), 2)}
+            for m in rng.sample(range(1, 200), 2)
+        ],
+        "parts": [
+            {"id": p, "name": f"Part {p}", "price": round(rng.uniform(5, 500), 2)}
+            for p in rng.sample(range(1, 2000), 3)
+        ],
+    } for i in range(1, count + 1)]
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - began) * 1000)
+    return min(timings), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    tickets = payload(args.tickets)
+    body = {"limit": args.tickets, "next_cursor": None, "items": tickets}
+    results = {}
+    outputs = {}
+
+    for name in PROVIDERS:
+        class BenchConfig(TestingConfig):
+            JSON_ENCODER = name
+
+        app = create_app(BenchConfig)
+        with app.test_request_context():
+            outputs[name] = app.json.response(body).get_data()
+            results[f"{name} jsonify"] = best_of(lambda: app.json.response(body), args.repeat)
+            results[f"{name} ndjson"] = best_of(
+                lambda: [app.json.dumps(t, separators=(",", ":")) for t in tickets], args.repeat
+            )
+
+    assert json.loads(outputs["stdlib"]) == json.loads(outputs["orjson"])
+    print(f"{args.tickets} tickets, {len(outputs['stdlib']) / 1024:.0f} KiB per response")
+    width = max(len(name) for name in results)
+    print(f"{'workload':<{width}}  {'best ms':>9}  {'median ms':>9}")
+    for name, (best, median) in results.items():
+        print(f"{name:<{width}}  {best:>9.2f}  {median:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
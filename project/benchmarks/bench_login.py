@@ -0,0 +1,94 @@
+"""
+Login latency percentiles under a concurrent login storm, alongside the
+latency of a cheap read (GET /inventory/<id>) issued at the same time,
+for unbounded KDF work versus a KdfLimiter capped at --concurrency.
+
+    python -m project.benchmarks.bench_login --method pbkdf2 --threads 16
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+from project.application import create_app
+from project.application.config.init import TestingConfig
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(samples)}
+
+
+def run(args, concurrency):
+    workdir = tempfile.mkdtemp(prefix="bench-login-")
+
+    class BenchConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+        PASSWORD_HASH_METHOD = args.method
+        PASSWORD_HASH_CONCURRENCY = concurrency
+        PASSWORD_HASH_TIMEOUT = 30
+
+    app = create_app(BenchConfig)
+    try:
+        client = app.test_client()
+        client.post("/customers/", json={
+            "name": "Bench", "email": "bench@example.com", "phone": "555", "password": "Secret123!"
+        })
+        part_id = client.post("/inventory/", json={"name": "Part", "price": 1.0}).get_json()["id"]
+
+        logins, reads, statuses = [], [], []
+        stop = threading.Event()
+
+        def storm():
+            c = app.test_client()
+            for _ in range(args.logins):
+                began = time.perf_counter()
+                r = c.post("/customers/login/", json={"email": "bench@example.com", "password": "Secret123!"})
+                logins.append((time.perf_counter() - began) * 1000)
+                statuses.append(r.status_code)
+
+        def reader():
+            c = app.test_client()
+            while not stop.is_set():
+                began = time.perf_counter()
+                c.get(f"/inventory/{part_id}")
+                reads.append((time.perf_counter() - began) * 1000)
+
+        threads = [threading.Thread(target=storm) for _ in range(args.threads)]
+        read_thread = threading.Thread(target=reader)
+        read_thread.start()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stop.set()
+        read_thread.join()
+        return percentiles(logins), percentiles(reads), statuses.count(503)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--method", default="pbkdf2")
+    parser.add_argument("--threads", type=int, default=16, help="concurrent login clients")
+    parser.add_argument("--logins", type=int, default=5, help="logins per client")
+    parser.add_argument("--concurrency", type=int, default=2, help="KDF slots for the limited run")
+    args = parser.parse_args()
+
+    print(f"{args.threads} clients x {args.logins} logins, {args.method}")
+    print(f"{'mode':<10} {'endpoint':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  503s")
+    for label, concurrency in (("unbounded", 0), (f"limit={args.concurrency}", args.concurrency)):
+        login, read, shed = run(args, concurrency)
+        for name, stats in (("login", login), ("read", read)):
+            print(f"{label:<10} {name:<8} " + " ".join(f"{stats[k]:>8.1f}" for k in ("p50", "p95", "p99", "max"))
+                  + (f"  {shed}" if name == "login" else ""))
+
+
+if __name__ == "__main__":
+    main()
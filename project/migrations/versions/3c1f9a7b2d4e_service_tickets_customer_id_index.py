@@ -0,0 +1,26 @@
+"""service_tickets customer_id index
+
+Revision ID: 3c1f9a7b2d4e
+Revises: aff9f1eeed77
+Create Date: 2026-10-18 09:12:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9a7b2d4e'
+down_revision = 'aff9f1eeed77'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('service_tickets', schema=None) as batch_op:
+        batch_op.create_index('ix_service_tickets_customer_id', ['customer_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('service_tickets', schema=None) as batch_op:
+        batch_op.drop_index('ix_service_tickets_customer_id')
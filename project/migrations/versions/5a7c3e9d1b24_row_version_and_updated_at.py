@@ -0,0 +1,32 @@
+"""row version and updated_at
+
+Revision ID: 5a7c3e9d1b24
+Revises: 8d2e4b6a1f03
+Create Date: 2026-10-18 11:42:05.218374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7c3e9d1b24'
+down_revision = '8d2e4b6a1f03'
+branch_labels = None
+depends_on = None
+
+TABLES = ('customers', 'inventory', 'mechanics', 'service_tickets')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
+            batch_op.drop_column('version')
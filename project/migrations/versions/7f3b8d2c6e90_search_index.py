@@ -0,0 +1,44 @@
+"""search index tables for tickets, customers and parts
+
+Revision ID: 7f3b8d2c6e90
+Revises: e2a9c5f7b381
+Create Date: 2026-10-18 16:48:30.226194
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7f3b8d2c6e90'
+down_revision = 'e2a9c5f7b381'
+branch_labels = None
+depends_on = None
+
+# search table -> (source table, columns folded into the body)
+SEARCH_TABLES = {
+    'search_service_tickets': ('service_tickets', ('VIN', 'service_desc')),
+    'search_customers': ('customers', ('name', 'email', 'phone')),
+    'search_inventory': ('inventory', ('name',)),
+}
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for name, (source, columns) in SEARCH_TABLES.items():
+        if dialect == 'sqlite':
+            op.execute(f"CREATE VIRTUAL TABLE {name} USING fts5(body, tokenize='trigram')")
+        else:
+            op.execute(f"CREATE TABLE {name} (rowid INTEGER PRIMARY KEY, body TEXT NOT NULL)")
+            if dialect == 'postgresql':
+                op.execute(f"CREATE INDEX ix_{name}_trgm ON {name} USING gin (body gin_trgm_ops)")
+
+        body = " || ' ' || ".join(f"coalesce(\"{column}\", '')" for column in columns)
+        op.execute(f"INSERT INTO {name} (rowid, body) SELECT id, {body} FROM {source}")
+
+
+def downgrade():
+    for name in SEARCH_TABLES:
+        op.execute(f"DROP TABLE {name}")
@@ -0,0 +1,40 @@
+"""foreign key and lookup indexes
+
+Revision ID: 8d2e4b6a1f03
+Revises: 3c1f9a7b2d4e
+Create Date: 2026-10-18 10:03:17.552910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2e4b6a1f03'
+down_revision = '3c1f9a7b2d4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('service_mechanics', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_service_mechanics_mechanic_id'), ['mechanic_id'], unique=False)
+
+    with op.batch_alter_table('service_ticket_parts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_service_ticket_parts_inventory_id'), ['inventory_id'], unique=False)
+
+    with op.batch_alter_table('service_tickets', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_service_tickets_VIN'), ['VIN'], unique=False)
+        batch_op.create_index(batch_op.f('ix_service_tickets_service_date'), ['service_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('service_tickets', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_service_tickets_service_date'))
+        batch_op.drop_index(batch_op.f('ix_service_tickets_VIN'))
+
+    with op.batch_alter_table('service_ticket_parts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_service_ticket_parts_inventory_id'))
+
+    with op.batch_alter_table('service_mechanics', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_service_mechanics_mechanic_id'))
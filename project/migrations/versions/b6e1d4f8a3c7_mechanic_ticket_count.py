@@ -0,0 +1,36 @@
+"""mechanic ticket_count for the leaderboard
+
+Revision ID: b6e1d4f8a3c7
+Revises: 5a7c3e9d1b24
+Create Date: 2026-10-18 14:05:41.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1d4f8a3c7'
+down_revision = '5a7c3e9d1b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('mechanics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ticket_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing assignments.
+    op.execute(
+        "UPDATE mechanics SET ticket_count = "
+        "(SELECT count(*) FROM service_mechanics WHERE service_mechanics.mechanic_id = mechanics.id)"
+    )
+
+    with op.batch_alter_table('mechanics', schema=None) as batch_op:
+        batch_op.create_index('ix_mechanics_leaderboard', [sa.text('ticket_count DESC'), 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mechanics', schema=None) as batch_op:
+        batch_op.drop_index('ix_mechanics_leaderboard')
+        batch_op.drop_column('ticket_count')
@@ -0,0 +1,26 @@
+"""quantity on service_ticket_parts
+
+Revision ID: e2a9c5f7b381
+Revises: b6e1d4f8a3c7
+Create Date: 2026-10-18 15:22:09.417630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a9c5f7b381'
+down_revision = 'b6e1d4f8a3c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('service_ticket_parts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('quantity', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('service_ticket_parts', schema=None) as batch_op:
+        batch_op.drop_column('quantity')
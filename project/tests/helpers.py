@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from project.application.extensions import db
+
+
+@contextmanager
+def assert_max_queries(testcase, client, maximum):
+    """
+    Fails `testcase` if the block issues more than `maximum` SQL statements
+    against the app's engine. Yields the list of captured statements.
+    """
+    with client.application.app_context():
+        engine = db.engine
+
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    testcase.assertLessEqual(
+        len(statements), maximum,
+        f"{len(statements)} SQL statements issued (max {maximum}):\n" + "\n".join(statements)
+    )
+
+
+def create_customer(client, email, password="Secret123!"):
+    """
+    Creates a customer and logs in. Returns (customer_id, auth_headers).
+    """
+    resp = client.post("/customers/", json={
+        "name": email.split("@")[0],
+        "email": email,
+        "phone": "555-000-1111",
+        "password": password
+    })
+    customer_id = resp.get_json()["id"]
+    token = client.post("/customers/login/", json={
+        "email": email,
+        "password": password
+    }).get_json()["token"]
+    return customer_id, {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from project.application import create_app
+from project.application.asgi import AsgiApp
+from project.application.async_db import async_url, init_async_db
+from project.application.config.init import TestingConfig
+from project.application.extensions import db
+from project.tests.helpers import assert_max_queries, create_customer
+
+
+class AsyncUrlTestCase(unittest.TestCase):
+
+    def test_async_drivers(self):
+        self.assertEqual(async_url("postgresql+psycopg2://u:p@db/app"), "postgresql+asyncpg://u:p@db/app")
+        self.assertEqual(async_url("postgresql://u:p@db/app"), "postgresql+asyncpg://u:p@db/app")
+        self.assertEqual(async_url("sqlite:////tmp/app.db"), "sqlite+aiosqlite:////tmp/app.db")
+        self.assertEqual(async_url("sqlite+aiosqlite:///x.db"), "sqlite+aiosqlite:///x.db")
+
+    # async_url (negative: no asyncio driver for the backend)
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            async_url("mssql+pyodbc://u:p@db/app")
+        with self.assertRaises(ValueError):
+            async_url("sqlite:///:memory:")
+
+
+class AsgiTestCase(unittest.TestCase):
+    """A SQLite file, so the sync and asyncio engines see the same rows."""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+
+        class AsgiConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(self.workdir, 'app.db')}"
+
+        self.flask_app = create_app(AsgiConfig)
+        self.app = self.flask_app.test_client()
+        self.asgi = AsgiApp(self.flask_app)
+
+    def tearDown(self):
+        asyncio.run(init_async_db(self.flask_app).dispose())
+        self.asgi.executor.shutdown()
+        with self.flask_app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def _request(self, method, path, query="", headers=(), body=b""):
+        """Runs one request through the ASGI app; returns (status, headers, body)."""
+        scope = {
+            "type": "http", "method": method, "path": path, "query_string": query.encode(),
+            "headers": [(k.encode(), v.encode()) for k, v in headers], "http_version": "1.1",
+            "scheme": "http", "server": ("testserver", 80), "client": ("127.0.0.1", 5000), "root_path": "",
+        }
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.asgi(scope, receive, send))
+        response_headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+        return sent[0]["status"], response_headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+    def _seed(self):
+        self.app.post("/mechanics/bulk", json=[
+            {"name": name, "email": f"{name.lower()}@example.com", "phone": "555", "salary": salary}
+            for name, salary in (("Ann", 3000), ("Bob", 5000), ("Cal", 4000))
+        ])
+        customer_id, _ = create_customer(self.app, "asgi@example.com")
+        part_id = self.app.post("/inventory/", json={"name": "Brake pad", "price": 20.0}).get_json()["id"]
+        ticket_ids = []
+        for i, day in enumerate(("2025-09-01", "2025-09-03", "2025-09-02")):
+            ticket_ids.append(self.app.post("/service_tickets/", json={
+                "VIN": f"ASGI{i}", "service_date": day, "service_desc": "x",
+                "customer_id": customer_id, "mechanic_ids": [1, 2],
+            }).get_json()["id"])
+        self.app.post(f"/service_tickets/{ticket_ids[0]}/parts", json=[{"part_id": part_id, "quantity": 2}])
+        return part_id, ticket_ids
+
+    # GET read endpoints: async views answer like the sync views, with no sync-engine queries
+    def test_async_reads_match_sync(self):
+        part_id, ticket_ids = self._seed()
+        for path, query in (
+            ("/mechanics/", "sort=-salary&fields=id,name"),
+            ("/mechanics/2", ""),
+            ("/mechanics/leaderboard", "limit=2"),
+            ("/inventory/", "filter[price][lte]=50"),
+            (f"/inventory/{part_id}", ""),
+            ("/service_tickets/", "limit=2"),
+            ("/service_tickets/", "limit=2&sort=-service_date&fields=id,VIN"),
+            ("/service_tickets/", "limit=2&sort=-service_date,customer_id"),
+            ("/service_tickets/", "limit=2&fields=mechanics"),
+            ("/service_tickets/", "limit=2&sort=service_date&fields=parts"),
+            (f"/service_tickets/{ticket_ids[0]}", ""),
+        ):
+            with assert_max_queries(self, self.app, 0):
+                status, _, body = self._request("GET", path, query)
+            self.assertEqual(status, 200, (path, query))
+            expected = self.app.get(path, query_string=query)
+            self.assertEqual(json.loads(body), expected.get_json(), (path, query))
+
+    # GET /service_tickets/ pages with the async view's cursors
+    def test_async_ticket_pages(self):
+        self._seed()
+        seen, cursor = [], ""
+        while True:
+            status, _, body = self._request("GET", "/service_tickets/", f"limit=2&sort=service_date{cursor}")
+            page = json.loads(body)
+            seen += [t["VIN"] for t in page["items"]]
+            if not page["next_cursor"]:
+                break
+            cursor = f"&cursor={page['next_cursor']}"
+        self.assertEqual(seen, ["ASGI0", "ASGI2", "ASGI1"])
+
+    # GET /mechanics/<id> with If-None-Match → 304 from the async view
+    def test_async_conditional(self):
+        self._seed()
+        status, headers, _ = self._request("GET", "/mechanics/1")
+        self.assertEqual(status, 200)
+        status, _, body = self._request("GET", "/mechanics/1", headers=[("If-None-Match", headers["etag"])])
+        self.assertEqual((status, body), (304, b""))
+
+    # GET (negative: missing row, bad spec) from the async views
+    def test_async_errors(self):
+        self.assertEqual(self._request("GET", "/service_tickets/999")[0], 404)
+        status, _, body = self._request("GET", "/mechanics/", "filter[phone]=555")
+        self.assertEqual(status, 400)
+        self.assertIn("error", json.loads(body))
+
+    # Writes, ?q= search and CSV exports fall through to the WSGI app
+    def test_sync_fallback(self):
+        status, _, body = self._request(
+            "POST", "/inventory/", headers=[("Content-Type", "application/json")],
+            body=json.dumps({"name": "Spark plug", "price": 3.0}).encode(),
+        )
+        self.assertEqual(status, 201)
+        part_id = json.loads(body)["id"]
+
+        status, _, body = self._request("GET", "/inventory/", "q=spark")
+        self.assertEqual([p["id"] for p in json.loads(body)["items"]], [part_id])
+
+        status, headers, body = self._request("GET", "/inventory/", headers=[("Accept", "text/csv")])
+        self.assertTrue(headers["content-type"].startswith("text/csv"))
+        self.assertEqual(body.decode().splitlines()[0], "id,name,price")
+
+
+if __name__ == "__main__":
+    unittest.main()
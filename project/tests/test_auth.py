@@ -0,0 +1,95 @@
+import time
+import unittest
+from unittest import mock
+
+from project.application import create_app
+from project.application import auth
+from project.application.auth import Claims, ClaimsCache
+from project.application.extensions import cache
+from project.tests.helpers import create_customer
+
+
+class ClaimsCacheTestCase(unittest.TestCase):
+
+    def test_lru_is_bounded(self):
+        lru = ClaimsCache(maxsize=2)
+        exp = int(time.time()) + 60
+        for key in ("a", "b", "c"):
+            lru.put(key, Claims(1, None, exp))
+        self.assertEqual(len(lru), 2)
+        self.assertIsNone(lru.get("a"))
+        self.assertIsNotNone(lru.get("c"))
+
+    def test_expired_entries_are_evicted(self):
+        lru = ClaimsCache(maxsize=2)
+        lru.put("old", Claims(1, None, int(time.time()) - 1))
+        self.assertIsNone(lru.get("old"))
+        self.assertEqual(len(lru), 0)
+
+    def test_size_zero_disables(self):
+        lru = ClaimsCache(maxsize=0)
+        lru.put("a", Claims(1, None, int(time.time()) + 60))
+        self.assertIsNone(lru.get("a"))
+
+
+class TokenRequiredTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.flask_app = create_app("TestingConfig")
+        self.app = self.flask_app.test_client()
+        _, self.headers = create_customer(self.app, "auth@example.com")
+
+    # Repeat requests with the same token are verified once
+    def test_token_decoded_once(self):
+        with mock.patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+            for _ in range(5):
+                response = self.app.get("/customers/my-tickets/", headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode.call_count, 1)
+
+    # negative: rotating SECRET_KEY invalidates cached claims
+    def test_secret_rotation_rejects_cached_token(self):
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=self.headers).status_code, 200)
+        self.flask_app.config["SECRET_KEY"] = "rotated"
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=self.headers).status_code, 401)
+
+    # POST /customers/logout/ revokes that token only
+    def test_logout_revokes_token(self):
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=self.headers).status_code, 200)
+        _, other_headers = create_customer(self.app, "auth2@example.com")
+
+        response = self.app.post("/customers/logout/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=self.headers).status_code, 401)
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=other_headers).status_code, 200)
+
+    # POST /customers/logout/ revokes a token minted without a jti by its digest
+    def test_logout_revokes_token_without_jti(self):
+        with self.flask_app.app_context():
+            config = self.flask_app.config
+            now = int(time.time())
+            payload = {"sub": "1", "iss": config["JWT_ISSUER"], "aud": config["JWT_AUDIENCE"], "exp": now + 600}
+            token = auth.jwt.encode({**payload, "iat": now}, config["SECRET_KEY"], algorithm="HS256")
+            other = auth.jwt.encode({**payload, "iat": now - 1}, config["SECRET_KEY"], algorithm="HS256")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        self.assertEqual(self.app.post("/customers/logout/", headers=headers).status_code, 200)
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=headers).status_code, 401)
+        other_headers = {"Authorization": f"Bearer {other}"}
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=other_headers).status_code, 200)
+
+    # Revocations outlive the response cache being emptied
+    def test_revocation_survives_response_cache_eviction(self):
+        self.app.post("/customers/logout/", headers=self.headers)
+        with self.flask_app.app_context():
+            cache.clear()
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=self.headers).status_code, 401)
+
+    # negative: garbage token
+    def test_invalid_token(self):
+        headers = {"Authorization": "Bearer not.a.token"}
+        self.assertEqual(self.app.get("/customers/my-tickets/", headers=headers).status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
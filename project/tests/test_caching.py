@@ -0,0 +1,93 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from project.application import create_app
+from project.application.caching import bump, generations
+from project.application.config.init import TestingConfig
+
+
+class CacheBackendTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        db_path = os.path.join(self.cache_dir, "shared.db")
+
+        class SharedCacheConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{db_path}"
+            CACHE_BACKEND = "shared"
+            CACHE_DIR = os.path.join(self.cache_dir, "cache")
+
+        # Two apps on one database stand in for two gunicorn workers.
+        self.worker_a = create_app(SharedCacheConfig)
+        self.worker_b = create_app(SharedCacheConfig)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_shared_backend_selected(self):
+        self.assertEqual(self.worker_a.config["CACHE_TYPE"], "FileSystemCache")
+        self.assertTrue(self.worker_a.config["CACHE_DIR"].startswith(self.cache_dir))
+
+    # One bump() is seen by every worker sharing the cache
+    def test_invalidation_reaches_every_worker(self):
+        with self.worker_a.app_context():
+            before = generations("customers")
+        with self.worker_b.app_context():
+            self.assertEqual(generations("customers"), before)
+            bump("customers")
+        with self.worker_a.app_context():
+            self.assertNotEqual(generations("customers"), before)
+
+    # A page cached by one worker is evicted by a write through another
+    def test_cached_page_evicted_across_workers(self):
+        client_a = self.worker_a.test_client()
+        client_b = self.worker_b.test_client()
+        client_a.post("/inventory/", json={"name": "Spark Plug", "price": 5.0})
+        self.assertEqual(len(client_a.get("/inventory/").get_json()), 1)
+
+        client_b.post("/inventory/", json={"name": "Air Filter", "price": 12.0})
+        self.assertEqual(len(client_a.get("/inventory/").get_json()), 2)
+
+    # CACHE_BACKEND=null: conditional and cached views still answer
+    def test_null_backend(self):
+        class NullCacheConfig(TestingConfig):
+            CACHE_BACKEND = "null"
+
+        client = create_app(NullCacheConfig).test_client()
+        client.post("/inventory/", json={"name": "Spark Plug", "price": 5.0})
+        response = client.get("/inventory/")
+        self.assertEqual((response.status_code, len(response.get_json())), (200, 1))
+        self.assertIsNotNone(response.headers.get("ETag"))
+
+    def test_unknown_backend_rejected(self):
+        class BadConfig(TestingConfig):
+            CACHE_BACKEND = "nope"
+
+        with self.assertRaises(ValueError):
+            create_app(BadConfig)
+
+
+class CachePressureTestCase(unittest.TestCase):
+
+    # Pruning an over-full cache evicts page entries, not generation tokens
+    def test_generations_survive_pruning(self):
+        class SmallCacheConfig(TestingConfig):
+            CACHE_THRESHOLD = 20
+
+        app = create_app(SmallCacheConfig)
+        client = app.test_client()
+        client.get("/inventory/")
+        with app.test_request_context():
+            before = generations("customers", "inventory")
+
+        for page in range(1, 41):
+            client.get("/customers/", query_string={"page": page})
+
+        with app.test_request_context():
+            self.assertEqual(generations("customers", "inventory"), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
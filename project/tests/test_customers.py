@@ -1,5 +1,6 @@
 import unittest
 from project.application import create_app
+from project.tests.helpers import assert_max_queries, create_customer
 
 class CustomerRoutesTestCase(unittest.TestCase):
 
@@ -107,6 +108,123 @@ class CustomerRoutesTestCase(unittest.TestCase):
         get_again_resp = self.app.get(f"/customers/{customer_id}")
         self.assertEqual(get_again_resp.status_code, 404)
 
+    # Cached list pages are served from cache and evicted by any write
+    def test_get_customers_cache_invalidated_on_write(self):
+        first = self.app.get(self.base_url, query_string={"per_page": 5}).get_json()
+
+        with assert_max_queries(self, self.app, 0):
+            cached = self.app.get(self.base_url, query_string={"per_page": 5}).get_json()
+        self.assertEqual(cached, first)
+
+        self.app.post(self.base_url, json={
+            "name": "Fresh",
+            "email": "fresh@example.com",
+            "phone": "555-777-8888",
+            "password": "FreshPass123"
+        })
+        after = self.app.get(self.base_url, query_string={"per_page": 5}).get_json()
+        self.assertEqual(after["total"], first["total"] + 1)
+
+    def _create_customers(self, count):
+        for i in range(count):
+            self.app.post(self.base_url, json={
+                "name": f"Seek{i}",
+                "email": f"seek{i}@example.com",
+                "phone": "555-101-2020",
+                "password": "SeekPass123"
+            })
+
+    # GET /customers?cursor= walks the table by id without OFFSET
+    def test_get_customers_seek_mode(self):
+        self._create_customers(5)
+        seen, cursor = [], ""
+        while cursor is not None:
+            body = self.app.get(self.base_url, query_string={
+                "cursor": cursor, "per_page": 2, "count": "none"
+            }).get_json()
+            self.assertIsNone(body["page"])
+            self.assertIsNone(body["total"])
+            seen.extend(c["id"] for c in body["items"])
+            cursor = body["next_cursor"]
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen, sorted(seen))
+
+    # GET /customers?count=estimate falls back to a cached count on SQLite
+    def test_get_customers_estimated_count(self):
+        self._create_customers(3)
+        body = self.app.get(self.base_url, query_string={"count": "estimate"}).get_json()
+        self.assertEqual(body["total"], 3)
+        self.assertEqual(body["pages"], 1)
+
+    # GET /customers?count=<bogus> (negative)
+    def test_get_customers_invalid_count_mode(self):
+        response = self.app.get(self.base_url, query_string={"count": "bogus"})
+        self.assertEqual(response.status_code, 400)
+
+    # GET /customers/my-tickets only returns the caller's tickets
+    def test_my_tickets_scoped_to_customer(self):
+        mine_id, mine_headers = create_customer(self.app, "mine@example.com")
+        other_id, _ = create_customer(self.app, "other@example.com")
+        for i, owner in enumerate([mine_id, other_id, mine_id, mine_id]):
+            self.app.post("/service_tickets/", json={
+                "VIN": f"MYVIN{i}",
+                "service_date": "2025-09-05",
+                "service_desc": f"Job {i}",
+                "customer_id": owner
+            })
+
+        first = self.app.get("/customers/my-tickets/", headers=mine_headers,
+                             query_string={"limit": 2}).get_json()
+        self.assertEqual([t["VIN"] for t in first["items"]], ["MYVIN0", "MYVIN2"])
+        self.assertIsNotNone(first["next_cursor"])
+
+        second = self.app.get("/customers/my-tickets/", headers=mine_headers,
+                              query_string={"limit": 2, "cursor": first["next_cursor"]}).get_json()
+        self.assertEqual([t["VIN"] for t in second["items"]], ["MYVIN3"])
+        self.assertIsNone(second["next_cursor"])
+
+    # GET /customers/my-tickets (negative: no token)
+    def test_my_tickets_requires_token(self):
+        response = self.app.get("/customers/my-tickets/")
+        self.assertEqual(response.status_code, 401)
+
+    # POST /customers/bulk validates per item and dedupes emails set-wise
+    def test_create_customers_bulk(self):
+        self.app.post(self.base_url, json={
+            "name": "Existing", "email": "taken@example.com",
+            "phone": "555-000-0000", "password": "Secret123!"
+        })
+        items = [
+            {"name": f"Bulk{i}", "email": f"bulk{i}@example.com", "phone": "555-1", "password": "pw"}
+            for i in range(10)
+        ]
+        items.append({"name": "Dup", "email": "bulk0@example.com", "phone": "555-1", "password": "pw"})
+        items.append({"name": "Taken", "email": "taken@example.com", "phone": "555-1", "password": "pw"})
+        items.append({"name": "NoEmail", "phone": "555-1", "password": "pw"})
+
+        # email check + INSERT .. RETURNING + search index rows
+        with assert_max_queries(self, self.app, 4):
+            response = self.app.post(f"{self.base_url}bulk", json=items)
+        self.assertEqual(response.status_code, 207)
+        body = response.get_json()
+        self.assertEqual(body["created"], 10)
+        self.assertEqual(body["failed"], 3)
+        self.assertEqual([r["status"] for r in body["results"][-3:]], ["error"] * 3)
+        self.assertIn("email", body["results"][-1]["errors"])
+
+        login = self.app.post("/customers/login/", json={"email": "bulk7@example.com", "password": "pw"})
+        self.assertEqual(login.status_code, 200)
+
+    # POST /customers/bulk (negative: more items than BULK_MAX_PASSWORDS)
+    def test_create_customers_bulk_capped(self):
+        items = [
+            {"name": f"Cap{i}", "email": f"cap{i}@example.com", "phone": "555-1", "password": "pw"}
+            for i in range(21)
+        ]
+        response = self.app.post(f"{self.base_url}bulk", json=items)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("20", response.get_json()["error"])
+
 
 if __name__ == "__main__":
     unittest.main()
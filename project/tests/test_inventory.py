@@ -1,3 +1,4 @@
+import json
 import unittest
 from project.application import create_app
 
@@ -59,6 +60,64 @@ class CustomerRoutesTestCase(unittest.TestCase):
         delete_resp = self.app.delete(f"/inventory/{part_id}")
         self.assertEqual(delete_resp.status_code, 200)
 
+    # POST /inventory/bulk accepts an NDJSON stream
+    def test_create_inventory_bulk_ndjson(self):
+        body = "\n".join(
+            json.dumps({"name": f"Part {i}", "price": 1.5 * i}) for i in range(25)
+        ) + "\n{\"name\": \"No price\"}\n"
+        response = self.app.post(
+            f"{self.base_url}bulk", data=body, content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.get_json()["created"], 25)
+        self.assertEqual(len(self.app.get(self.base_url).get_json()), 25)
+
+    # POST /inventory/bulk (negative: not an array)
+    def test_create_inventory_bulk_rejects_object(self):
+        response = self.app.post(f"{self.base_url}bulk", json={"name": "x", "price": 1})
+        self.assertEqual(response.status_code, 400)
+
+    # GET /inventory with Accept: application/x-ndjson streams one part per line
+    def test_get_inventory_ndjson_stream(self):
+        for i in range(3):
+            self.app.post(self.base_url, json={"name": f"Stream {i}", "price": 2.5})
+        self.app.get(self.base_url)  # warm the JSON cache; streaming must bypass it
+
+        response = self.app.get(self.base_url, headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([p["name"] for p in lines], ["Stream 0", "Stream 1", "Stream 2"])
+
+    # GET /inventory with If-None-Match → 304 until the collection changes
+    def test_get_inventory_conditional(self):
+        self.app.post(self.base_url, json={"name": "Filter", "price": 5})
+        first = self.app.get(self.base_url)
+        etag = first.headers["ETag"]
+        # ETag only: a delete wouldn't move a collection's Last-Modified
+        self.assertIsNone(first.last_modified)
+
+        unchanged = self.app.get(self.base_url, headers={"If-None-Match": etag})
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.data, b"")
+        self.assertEqual(unchanged.headers["ETag"], etag)
+
+        part_id = self.app.post(self.base_url, json={"name": "Hose", "price": 7}).get_json()["id"]
+        changed = self.app.get(self.base_url, headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+
+        # An in-place update changes the ETag too
+        etag = changed.headers["ETag"]
+        self.app.put(f"{self.base_url}{part_id}", json={"price": 8})
+        self.assertEqual(self.app.get(self.base_url, headers={"If-None-Match": etag}).status_code, 200)
+
+    # GET /inventory?... (query string variants get their own ETag)
+    def test_get_inventory_etag_varies_by_query(self):
+        plain = self.app.get(self.base_url).headers["ETag"]
+        other = self.app.get(self.base_url, query_string={"x": "1"}).headers["ETag"]
+        self.assertNotEqual(plain, other)
+
 
 if __name__ == "__main__":
     unittest.main()
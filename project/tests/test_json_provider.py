@@ -0,0 +1,97 @@
+import json
+import unittest
+from datetime import date
+
+from flask.json.provider import DefaultJSONProvider
+
+from project.application import create_app
+from project.application.config.init import TestingConfig
+from project.application.json_provider import OrjsonProvider
+
+
+def _config(encoder):
+    class Config(TestingConfig):
+        JSON_ENCODER = encoder
+    return Config
+
+
+TICKETS = [{
+    "id": 1,
+    "VIN": "1HGCM82633A004352",
+    "service_date": date(2025, 9, 1),
+    "service_desc": "Oil + brakes",
+    "customer_id": 7,
+    "mechanics": [{"id": 2, "name": "Brock", "salary": 4500.5}],
+    "parts": [{"id": 3, "name": "Brake Pad", "price": 0.1 + 0.2}, {"id": 4, "name": "Filter", "price": None}],
+}]
+
+
+class JSONProviderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.fast = create_app(_config("orjson"))
+        self.slow = create_app(_config("stdlib"))
+
+    def test_provider_selected_from_config(self):
+        self.assertIsInstance(self.fast.json, OrjsonProvider)
+        self.assertIs(type(self.slow.json), DefaultJSONProvider)
+
+    # negative: unknown encoder name
+    def test_unknown_encoder_rejected(self):
+        with self.assertRaises(ValueError):
+            create_app(_config("ujson"))
+
+    # jsonify() bodies are byte-for-byte identical, dates and floats included
+    def test_response_matches_stdlib(self):
+        body = {"limit": 25, "next_cursor": None, "items": TICKETS}
+        with self.fast.test_request_context():
+            fast = self.fast.json.response(body)
+        with self.slow.test_request_context():
+            slow = self.slow.json.response(body)
+        self.assertEqual(fast.get_data(), slow.get_data())
+        self.assertEqual(fast.mimetype, slow.mimetype)
+
+    # Compact dumps (used for NDJSON lines) match stdlib
+    def test_compact_dumps_matches_stdlib(self):
+        for ticket in TICKETS:
+            self.assertEqual(
+                self.fast.json.dumps(ticket, separators=(",", ":")),
+                self.slow.json.dumps(ticket, separators=(",", ":")),
+            )
+
+    # Non-ASCII text falls back so ensure_ascii escaping is unchanged
+    def test_non_ascii_falls_back_to_stdlib(self):
+        body = {"name": "Zoë ✓", "n": 1}
+        with self.fast.test_request_context():
+            data = self.fast.json.response(body).get_data()
+        self.assertEqual(data, b'{"n":1,"name":"Zo\\u00eb \\u2713"}\n')
+
+    # Values orjson can't encode (ints over 64 bits) fall back too
+    def test_big_int_falls_back_to_stdlib(self):
+        self.assertEqual(self.fast.json.dumps({"n": 2 ** 70}, separators=(",", ":")), '{"n":1180591620717411303424}')
+
+    # NaN/Infinity (which orjson writes as null) fall back to stdlib's spelling
+    def test_non_finite_floats_fall_back_to_stdlib(self):
+        body = {"items": [{"price": float("nan")}, {"price": float("inf"), "ratio": -float("inf")}]}
+        with self.fast.test_request_context():
+            fast = self.fast.json.response(body).get_data()
+        with self.slow.test_request_context():
+            slow = self.slow.json.response(body).get_data()
+        self.assertEqual(fast, slow)
+        self.assertIn(b"NaN", fast)
+        self.assertEqual(
+            self.fast.json.dumps({"n": float("nan")}, separators=(",", ":")),
+            self.slow.json.dumps({"n": float("nan")}, separators=(",", ":")),
+        )
+
+    # An endpoint served through the orjson provider round-trips
+    def test_endpoint_through_orjson(self):
+        client = self.fast.test_client()
+        client.post("/inventory/", json={"name": "Brake Pad", "price": 99.99})
+        response = client.get("/inventory/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)[0]["price"], 99.99)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
 import unittest
 from project.application import create_app
+from project.application.extensions import db
+from project.application.models import Mechanic
+from project.tests.helpers import assert_max_queries, create_customer
 
 class CustomerRoutesTestCase(unittest.TestCase):
 
@@ -65,6 +68,122 @@ class CustomerRoutesTestCase(unittest.TestCase):
         delete_resp = self.app.delete(f"/mechanics/{mechanic_id}")
         self.assertEqual(delete_resp.status_code, 200)
 
+    # POST /mechanics/bulk
+    def test_create_mechanics_bulk(self):
+        items = [
+            {"name": f"Bulk{i}", "email": f"bulkmech{i}@example.com", "phone": "555-1", "salary": 4000}
+            for i in range(10)
+        ]
+        response = self.app.post(f"{self.base_url}bulk", json=items)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.app.get(self.base_url).get_json()), 10)
+
+        again = self.app.post(f"{self.base_url}bulk", json=items[:2])
+        self.assertEqual(again.status_code, 400)
+
+    # GET /mechanics/<id> with a current ETag → 304 without touching the DB
+    def test_get_mechanic_conditional(self):
+        mechanic_id = self.app.post(self.base_url, json={
+            "name": "Misty", "email": "misty@example.com", "phone": "555", "salary": 4000
+        }).get_json()["id"]
+        etag = self.app.get(f"{self.base_url}{mechanic_id}").headers["ETag"]
+
+        with assert_max_queries(self, self.app, 0):
+            response = self.app.get(f"{self.base_url}{mechanic_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.app.put(f"{self.base_url}{mechanic_id}", json={"salary": 4100})
+        response = self.app.get(f"{self.base_url}{mechanic_id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["salary"], 4100)
+
+    # GET /mechanics/ conditional after a delete (negative: no stale 304)
+    def test_get_mechanics_conditional_after_delete(self):
+        ids = [self.app.post(self.base_url, json={
+            "name": name, "email": f"{name.lower()}@example.com", "phone": "555", "salary": 4000
+        }).get_json()["id"] for name in ("Ada", "Ben")]
+        first = self.app.get(self.base_url)
+        self.app.delete(f"{self.base_url}{ids[0]}")
+
+        for headers in (
+            {"If-None-Match": first.headers["ETag"]},
+            {"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+        ):
+            response = self.app.get(self.base_url, headers=headers)
+            self.assertEqual(response.status_code, 200, headers)
+            self.assertEqual([m["id"] for m in response.get_json()], [ids[1]])
+
+    # GET /mechanics/<id> (negative: missing row still 404s, no ETag)
+    def test_get_mechanic_not_found_has_no_etag(self):
+        response = self.app.get(f"{self.base_url}999999", headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response.headers)
+
+    def _leaderboard(self, **args):
+        return {r["mechanic_id"]: r["ticket_count"] for r in self.app.get("/mechanics/leaderboard", query_string=args).get_json()}
+
+    def _mechanics(self, count):
+        return [self.app.post(self.base_url, json={
+            "name": f"Lead{i}", "email": f"lead{i}@example.com", "phone": "555", "salary": 4000
+        }).get_json()["id"] for i in range(count)]
+
+    # GET /mechanics/leaderboard follows every assignment change
+    def test_leaderboard_counts_maintained(self):
+        m1, m2, m3 = self._mechanics(3)
+        customer_id, headers = create_customer(self.app, "lead@example.com")
+        ticket = {"VIN": "V", "service_date": "2025-09-01", "service_desc": "x", "customer_id": customer_id}
+
+        t1 = self.app.post("/service_tickets/", json={**ticket, "mechanic_ids": [m1, m2]}).get_json()["id"]
+        t2 = self.app.post("/service_tickets/", json={**ticket, "mechanic_ids": [m1]}).get_json()["id"]
+        self.app.post("/service_tickets/bulk", json=[{**ticket, "mechanic_ids": [m3]}] * 3)
+        self.assertEqual(self._leaderboard(), {m1: 2, m2: 1, m3: 3})
+
+        self.app.put(f"/service_tickets/{t1}", json={"mechanic_ids": [m2, m3]}, headers=headers)
+        self.assertEqual(self._leaderboard(), {m1: 1, m2: 1, m3: 4})
+
+        self.app.put(f"/service_tickets/{t2}/edit", json={"add_ids": [m2, m1], "remove_ids": [m1]}, headers=headers)
+        self.assertEqual(self._leaderboard(), {m1: 0, m2: 2, m3: 4})
+
+        self.app.delete(f"/service_tickets/{t1}", headers=headers)
+        self.assertEqual(self._leaderboard(), {m1: 0, m2: 1, m3: 3})
+
+        self.app.delete(f"/mechanics/{m3}")
+        self.assertEqual(self._leaderboard(), {m1: 0, m2: 1})
+
+        self.app.delete(f"/customers/{customer_id}")
+        self.assertEqual(self._leaderboard(), {m1: 0, m2: 0})
+
+    # GET /mechanics/leaderboard?limit=K returns the top K in order
+    def test_leaderboard_limit(self):
+        ids = self._mechanics(4)
+        customer_id, _ = create_customer(self.app, "top@example.com")
+        for n, mid in zip((1, 3, 2), ids):
+            self.app.post("/service_tickets/bulk", json=[{
+                "VIN": "V", "service_date": "2025-09-01", "service_desc": "x",
+                "customer_id": customer_id, "mechanic_ids": [mid]
+            }] * n)
+        top = self.app.get("/mechanics/leaderboard", query_string={"limit": 2}).get_json()
+        self.assertEqual([(r["mechanic_id"], r["ticket_count"]) for r in top], [(ids[1], 3), (ids[2], 2)])
+
+        with assert_max_queries(self, self.app, 1):
+            self.app.get("/mechanics/leaderboard", query_string={"limit": 3})
+
+    # GET /mechanics/leaderboard?limit=abc (negative)
+    def test_leaderboard_invalid_limit(self):
+        self.assertEqual(self.app.get("/mechanics/leaderboard", query_string={"limit": "abc"}).status_code, 400)
+
+    # flask mechanics reconcile-counts repairs drift
+    def test_reconcile_counts_command(self):
+        (mid,) = self._mechanics(1)
+        flask_app = self.app.application
+        with flask_app.app_context():
+            db.session.get(Mechanic, mid).ticket_count = 7
+            db.session.commit()
+
+        result = flask_app.test_cli_runner().invoke(args=["mechanics", "reconcile-counts"])
+        self.assertIn("1 mechanic", result.output)
+        self.assertEqual(self._leaderboard(), {mid: 0})
+
 
 if __name__ == "__main__":
     unittest.main()
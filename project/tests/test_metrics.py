@@ -0,0 +1,142 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+
+from project.application import create_app
+from project.application.config.init import ProductionConfig, TestingConfig, _pool_options
+from project.application.extensions import db
+
+
+class PoolMetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+
+        class PooledConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(self.workdir, 'pool.db')}"
+            SQLALCHEMY_ENGINE_OPTIONS = {"pool_size": 2, "max_overflow": 1, "pool_timeout": 0.1}
+
+        self.flask_app = create_app(PooledConfig)
+        self.app = self.flask_app.test_client()
+
+    def tearDown(self):
+        with self.flask_app.app_context():
+            db.engine.dispose()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    # GET /metrics/pool reports occupancy and checkout waits
+    def test_pool_metrics(self):
+        self.app.get("/inventory/")
+        stats = self.app.get("/metrics/pool").get_json()
+        self.assertEqual(stats["class"], "InstrumentedQueuePool")
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["max_overflow"], 1)
+        self.assertGreaterEqual(stats["checkouts"], 1)
+        self.assertEqual(stats["timeouts"], 0)
+        self.assertIn("p95", stats["wait_ms"])
+
+    # Exhausting size + overflow counts a timeout and shows full utilisation
+    def test_pool_exhaustion_is_counted(self):
+        with self.flask_app.app_context():
+            engine = db.engine
+            held = [engine.connect() for _ in range(3)]
+            try:
+                with self.assertRaises(PoolTimeout):
+                    engine.connect()
+                stats = self.app.get("/metrics/pool").get_json()
+            finally:
+                for conn in held:
+                    conn.close()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["overflow_in_use"], 1)
+        self.assertGreaterEqual(stats["checked_out"], 3)
+
+    # GET /metrics/pool (negative: token configured but not sent)
+    def test_metrics_token_required(self):
+        self.flask_app.config["METRICS_TOKEN"] = "s3cret"
+        self.assertEqual(self.app.get("/metrics/pool").status_code, 401)
+        ok = self.app.get("/metrics/pool", headers={"Authorization": "Bearer s3cret"})
+        self.assertEqual(ok.status_code, 200)
+
+
+    # GET /metrics/pool (negative: token required but none configured → fail closed)
+    def test_metrics_closed_without_token_when_required(self):
+        self.flask_app.config.update(METRICS_REQUIRE_TOKEN=True, METRICS_TOKEN=None)
+        for path in ("/metrics/pool", "/metrics"):
+            response = self.app.get(path, headers={"Authorization": "Bearer "})
+            self.assertEqual(response.status_code, 403, path)
+        self.assertTrue(ProductionConfig.METRICS_REQUIRE_TOKEN)
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        class InstrumentedConfig(TestingConfig):
+            PERF_INSTRUMENTATION = True
+
+        self.flask_app = create_app(InstrumentedConfig)
+        self.app = self.flask_app.test_client()
+
+    # Server-Timing reports app time, SQL statements and cache results
+    def test_server_timing_header(self):
+        self.app.post("/inventory/", json={"name": "Pad", "price": 3})
+        miss = self.app.get("/inventory/1")
+        self.assertRegex(miss.headers["Server-Timing"], r'app;dur=[\d.]+, db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+        hit = self.app.get("/inventory/1", headers={"If-None-Match": miss.headers["ETag"]})
+        self.assertEqual(hit.status_code, 304)
+        self.assertIn('desc="0 queries", cache;desc="2 hit 0 miss"', hit.headers["Server-Timing"])
+
+    # GET /metrics renders per-endpoint histograms and counters
+    def test_prometheus_metrics(self):
+        self.app.post("/inventory/", json={"name": "Pad", "price": 3})
+        self.app.get("/inventory/")
+        self.app.get("/inventory/")
+        response = self.app.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        body = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{endpoint="inventory.get_parts",method="GET",status="200"} 2', body)
+        self.assertIn('http_request_duration_seconds_bucket{endpoint="inventory.get_parts",le="+Inf"} 2', body)
+        self.assertIn('http_response_size_bytes_count{endpoint="inventory.get_parts"} 2', body)
+        self.assertIn('cache_requests_total{endpoint="inventory.get_parts",namespace="view",result="hit"} 1', body)
+        self.assertRegex(body, r'db_statements_total\{endpoint="inventory.create_part"\} [1-9]')
+
+    # Statements that raise don't leave timings behind on the connection
+    def test_failed_statement_timing_popped(self):
+        with self.flask_app.test_request_context("/"):
+            self.flask_app.preprocess_request()
+            conn = db.session.connection()
+            with self.assertRaises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM no_such_table")
+            self.assertEqual(conn.info.get("_perf_started"), [])
+            db.session.rollback()
+
+    # negative: disabled → nothing registered, /metrics 404s
+    def test_disabled_by_default(self):
+        app = create_app("TestingConfig").test_client()
+        self.assertNotIn("Server-Timing", app.get("/inventory/").headers)
+        self.assertEqual(app.get("/metrics").status_code, 404)
+
+
+class PoolOptionsTestCase(unittest.TestCase):
+
+    def test_budget_split_across_workers(self):
+        with mock.patch.dict(os.environ, {"WEB_CONCURRENCY": "4", "DB_MAX_CONNECTIONS": "40"}):
+            options = _pool_options()
+        self.assertEqual((options["pool_size"], options["max_overflow"]), (5, 5))
+        self.assertTrue(options["pool_pre_ping"])
+
+    def test_explicit_sizes_win(self):
+        with mock.patch.dict(os.environ, {"DB_POOL_SIZE": "3", "DB_MAX_OVERFLOW": "0", "DB_POOL_PRE_PING": "false"}):
+            options = _pool_options()
+        self.assertEqual((options["pool_size"], options["max_overflow"]), (3, 0))
+        self.assertFalse(options["pool_pre_ping"])
+
+
+if __name__ == "__main__":
+    unittest.main()
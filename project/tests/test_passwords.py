@@ -0,0 +1,99 @@
+import threading
+import unittest
+from unittest import mock
+
+from project.application import create_app
+from project.application.extensions import db
+from project.application.models import Customer
+from project.application.passwords import HasherBusy, KdfLimiter, policy_method
+from project.tests.helpers import create_customer
+
+
+class KdfLimiterTestCase(unittest.TestCase):
+
+    def test_runs_in_caller_thread(self):
+        limiter = KdfLimiter(slots=1, timeout=1)
+        self.assertIs(limiter.run(threading.current_thread), threading.current_thread())
+
+    # negative: every slot taken → HasherBusy instead of an unbounded queue
+    def test_saturated_limiter_raises(self):
+        limiter = KdfLimiter(slots=1, timeout=0.05)
+        started, release = threading.Event(), threading.Event()
+        blocker = threading.Thread(target=limiter.run, args=(lambda: started.set() or release.wait(),))
+        blocker.start()
+        started.wait()
+        try:
+            with self.assertRaises(HasherBusy):
+                limiter.run(lambda: None)
+        finally:
+            release.set()
+            blocker.join()
+        self.assertIsNone(limiter.run(lambda: None))
+
+
+class PasswordPolicyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.flask_app = create_app("TestingConfig")
+        self.app = self.flask_app.test_client()
+
+    def test_policy_method_fills_defaults(self):
+        with self.flask_app.app_context():
+            self.assertEqual(policy_method("pbkdf2:sha256:1000"), "pbkdf2:sha256:1000")
+            self.assertEqual(policy_method("scrypt"), "scrypt:32768:8:1")
+            self.assertTrue(policy_method("pbkdf2").startswith("pbkdf2:sha256:"))
+
+    def _stored_hash(self, customer_id):
+        with self.flask_app.app_context():
+            return db.session.get(Customer, customer_id).password_hash
+
+    # POST /customers/login/ upgrades hashes made under an older policy
+    def test_login_rehashes_on_policy_change(self):
+        customer_id, _ = create_customer(self.app, "rehash@example.com")
+        self.assertTrue(self._stored_hash(customer_id).startswith("pbkdf2:sha256:1000$"))
+
+        self.flask_app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1500"
+        response = self.app.post("/customers/login/", json={"email": "rehash@example.com", "password": "Secret123!"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self._stored_hash(customer_id).startswith("pbkdf2:sha256:1500$"))
+
+        # negative: a wrong password never rewrites the hash
+        before = self._stored_hash(customer_id)
+        self.flask_app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1200"
+        response = self.app.post("/customers/login/", json={"email": "rehash@example.com", "password": "nope"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self._stored_hash(customer_id), before)
+
+    # POST /customers/login/ (negative: a policy below the stored cost never downgrades)
+    def test_login_never_downgrades(self):
+        customer_id, _ = create_customer(self.app, "keep@example.com")
+        before = self._stored_hash(customer_id)
+        for method in ("pbkdf2:sha256:500", "pbkdf2:sha256:1000"):
+            self.flask_app.config["PASSWORD_HASH_METHOD"] = method
+            response = self.app.post("/customers/login/", json={"email": "keep@example.com", "password": "Secret123!"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self._stored_hash(customer_id), before)
+
+        # A different algorithm is a policy change, whatever its cost
+        self.flask_app.config["PASSWORD_HASH_METHOD"] = "scrypt:1024:8:1"
+        self.app.post("/customers/login/", json={"email": "keep@example.com", "password": "Secret123!"})
+        self.assertTrue(self._stored_hash(customer_id).startswith("scrypt:1024:8:1$"))
+
+    # PUT /customers/<id> hashes under the same policy as create
+    def test_update_password_uses_policy(self):
+        customer_id, _ = create_customer(self.app, "update@example.com")
+        self.flask_app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1100"
+        self.app.put(f"/customers/{customer_id}", json={"password": "Changed1!"})
+        self.assertTrue(self._stored_hash(customer_id).startswith("pbkdf2:sha256:1100$"))
+
+    # POST /customers/login/ (negative: KDF slots saturated → 503)
+    def test_login_sheds_load_when_pool_busy(self):
+        create_customer(self.app, "busy@example.com")
+        with mock.patch.object(KdfLimiter, "run", side_effect=HasherBusy()):
+            response = self.app.post("/customers/login/", json={"email": "busy@example.com", "password": "Secret123!"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+
+
+if __name__ == "__main__":
+    unittest.main()
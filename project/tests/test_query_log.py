@@ -0,0 +1,118 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy.exc import OperationalError
+
+from project.application import create_app
+from project.application.config.init import TestingConfig
+from project.application import query_log
+from project.application.extensions import db
+from project.application.query_log import param_shape
+from project.tests.helpers import create_customer
+
+
+def _slow_records(logs):
+    return [json.loads(line.split("slow query ", 1)[1]) for line in logs.output]
+
+
+class SlowQueryLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        class SlowConfig(TestingConfig):
+            SLOW_QUERY_MS = 0.0001  # every statement counts as slow
+            SLOW_QUERY_EXPLAIN = True
+
+        self.app = create_app(SlowConfig).test_client()
+
+    # Slow statements are logged with endpoint, param shape and a plan
+    def test_slow_query_logged_with_plan(self):
+        with self.assertLogs("mechanic_api.sql.slow", "WARNING") as logs:
+            self.app.get("/customers/", query_string={"page": 1})
+        records = _slow_records(logs)
+        select = next(r for r in records if r["sql"].lstrip().startswith("SELECT"))
+        self.assertEqual(select["endpoint"], "customers.get_customers")
+        self.assertIn("plan", select)
+        self.assertTrue(any("SCAN" in step or "SEARCH" in step for step in select["plan"]))
+
+        # Same statement again (different page): logged, but not re-EXPLAINed
+        with self.assertLogs("mechanic_api.sql.slow", "WARNING") as logs:
+            self.app.get("/customers/", query_string={"page": 2})
+        same = [r for r in _slow_records(logs) if r["sql"] == select["sql"]]
+        self.assertTrue(same)
+        self.assertTrue(all("plan" not in r for r in same))
+
+    # Bound values never reach the log, only their types
+    def test_params_logged_without_values(self):
+        with self.assertLogs("mechanic_api.sql.slow", "WARNING") as logs:
+            self.app.post("/customers/", json={
+                "name": "Private", "email": "private@example.com", "phone": "555", "password": "Secret123!"
+            })
+        self.assertNotIn("private@example.com", "\n".join(logs.output))
+        insert = next(r for r in _slow_records(logs) if r["sql"].startswith("INSERT"))
+        self.assertNotIn("plan", insert)  # EXPLAIN only for reads
+        self.assertIn("str", insert["params"])
+
+    # Slow-query log (negative: EXPLAIN fails) - the request and its transaction carry on
+    def test_failed_explain(self):
+        with mock.patch.dict(query_log._EXPLAIN_PREFIX, {"sqlite": "EXPLAIN NONSENSE "}):
+            with self.assertLogs("mechanic_api.sql.slow", "WARNING") as logs:
+                create_customer(self.app, "explain@example.com")
+                response = self.app.get("/customers/", query_string={"page": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["items"]), 1)
+        plans = [r["plan"] for r in _slow_records(logs) if "plan" in r]
+        self.assertTrue(plans)
+        self.assertTrue(all(plan[0].startswith("EXPLAIN failed") for plan in plans))
+
+    # Statements that raise don't leave timings behind on the connection
+    def test_failed_statement_timing_popped(self):
+        with self.app.application.app_context():
+            with db.engine.connect() as conn:
+                with self.assertRaises(OperationalError):
+                    conn.exec_driver_sql("SELECT * FROM no_such_table")
+                self.assertEqual(conn.info.get("_query_started"), [])
+
+    def test_param_shape(self):
+        self.assertEqual(param_shape({"a": 1, "b": "x"}), {"a": "int", "b": "str"})
+        self.assertEqual(param_shape((1, None)), ["int", "NoneType"])
+        self.assertEqual(param_shape([(1,), (2,)], executemany=True), {"rows": 2, "each": ["int"]})
+
+
+class QueryTraceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+        self.trace_file = os.path.join(self.workdir, "trace.jsonl")
+
+        class TraceConfig(TestingConfig):
+            QUERY_TRACE_FILE = self.trace_file
+            QUERY_TRACE_SAMPLE = 1.0
+
+        self.flask_app = create_app(TraceConfig)
+        self.app = self.flask_app.test_client()
+
+    def tearDown(self):
+        for handler in self.flask_app.extensions["query_log"].trace_logger.handlers:
+            handler.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    # Sampled requests write one JSON line with every statement they ran
+    def test_trace_written(self):
+        self.app.post("/inventory/", json={"name": "Pad", "price": 2})
+        self.app.get("/inventory/1")
+        with open(self.trace_file) as fh:
+            traces = [json.loads(line) for line in fh]
+        self.assertEqual([t["endpoint"] for t in traces], ["inventory.create_part", "inventory.get_part"])
+        self.assertTrue(all(s["ms"] >= 0 and "sql" in s for t in traces for s in t["statements"]))
+
+    # negative: nothing configured → no listeners installed
+    def test_disabled_by_default(self):
+        self.assertNotIn("query_log", create_app("TestingConfig").extensions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import json
+import unittest
+
+from project.application import create_app
+from project.tests.helpers import assert_max_queries, create_customer
+
+
+class QuerySpecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("TestingConfig").test_client()
+
+    def _mechanics(self):
+        self.app.post("/mechanics/bulk", json=[
+            {"name": name, "email": f"{name.lower()}@example.com", "phone": "555", "salary": salary}
+            for name, salary in (("Ann", 3000), ("Bob", 5000), ("Cal", 4000), ("Dee", 5000))
+        ])
+
+    # GET /mechanics/?filter&sort&fields selects, filters and orders in SQL
+    def test_mechanics_filter_sort_fields(self):
+        self._mechanics()
+        with assert_max_queries(self, self.app, 2) as statements:
+            response = self.app.get("/mechanics/", query_string={
+                "filter[salary][gte]": "4000", "sort": "-salary", "fields": "id,name"
+            })
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual([m["name"] for m in body], ["Bob", "Dee", "Cal"])
+        self.assertEqual(set(body[0]), {"id", "name"})
+
+        select_sql = next(s for s in statements if "FROM mechanics" in s and "count(" not in s)
+        self.assertNotIn("mechanics.email", select_sql)
+        self.assertIn("WHERE mechanics.salary >=", select_sql)
+
+        body = self.app.get("/mechanics/", query_string={"filter[name][in]": "Ann,Dee"}).get_json()
+        self.assertEqual([m["name"] for m in body], ["Ann", "Dee"])
+
+    # GET /inventory/ price range and sparse fields
+    def test_inventory_price_range(self):
+        self.app.post("/inventory/bulk", json=[{"name": f"P{i}", "price": float(i)} for i in range(1, 6)])
+        body = self.app.get("/inventory/", query_string={
+            "filter[price][gt]": "1.5", "filter[price][lte]": "4", "sort": "-price", "fields": "name"
+        }).get_json()
+        self.assertEqual(body, [{"name": "P4"}, {"name": "P3"}, {"name": "P2"}])
+
+    # GET /service_tickets/ filtered by date and customer, sorted with keyset pages
+    def test_tickets_filter_and_sorted_pages(self):
+        customer_id, _ = create_customer(self.app, "spec@example.com")
+        other_id, _ = create_customer(self.app, "other@example.com")
+        dates = ["2025-09-03", "2025-09-01", "2025-09-02", "2025-09-02", "2025-08-30"]
+        for i, day in enumerate(dates):
+            self.app.post("/service_tickets/", json={
+                "VIN": f"SPEC{i}", "service_date": day, "service_desc": "x", "customer_id": customer_id
+            })
+        self.app.post("/service_tickets/", json={
+            "VIN": "OTHER", "service_date": "2025-09-02", "service_desc": "x", "customer_id": other_id
+        })
+
+        args = {
+            "filter[customer_id]": str(customer_id), "filter[service_date][gte]": "2025-09-01",
+            "sort": "-service_date", "fields": "id,VIN,service_date", "limit": 2,
+        }
+        seen = []
+        cursor = None
+        while True:
+            # fields without mechanics/parts: no eager loads, just the page query
+            with assert_max_queries(self, self.app, 1):
+                body = self.app.get("/service_tickets/", query_string={**args, **({"cursor": cursor} if cursor else {})}).get_json()
+            seen += body["items"]
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual([t["VIN"] for t in seen], ["SPEC0", "SPEC2", "SPEC3", "SPEC1"])
+        self.assertEqual(set(seen[0]), {"id", "VIN", "service_date"})
+
+    # GET /service_tickets/?sort=a,b pages in the same order the stream does
+    def test_tickets_composite_sort_pages(self):
+        first_id, _ = create_customer(self.app, "first@example.com")
+        second_id, _ = create_customer(self.app, "second@example.com")
+        for i, (customer_id, day) in enumerate((
+            (second_id, "2025-09-01"), (first_id, "2025-09-02"), (second_id, "2025-09-02"),
+            (first_id, "2025-09-01"), (second_id, "2025-09-02"), (first_id, "2025-09-03"),
+        )):
+            self.app.post("/service_tickets/", json={
+                "VIN": f"COMP{i}", "service_date": day, "service_desc": "x", "customer_id": customer_id
+            })
+
+        args = {"sort": "-service_date,customer_id", "fields": "id,VIN", "limit": 2}
+        seen, cursor = [], None
+        while True:
+            response = self.app.get("/service_tickets/", query_string={**args, **({"cursor": cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            body = response.get_json()
+            seen += [t["VIN"] for t in body["items"]]
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, ["COMP5", "COMP1", "COMP2", "COMP4", "COMP3", "COMP0"])
+
+        streamed = self.app.get("/service_tickets/", query_string=args, headers={"Accept": "application/x-ndjson"})
+        self.assertEqual([json.loads(line)["VIN"] for line in streamed.data.splitlines()], seen)
+
+    # GET /service_tickets/?fields=<nested only> still loads the ticket ids
+    def test_tickets_nested_fields_only(self):
+        customer_id, _ = create_customer(self.app, "nested@example.com")
+        for i in range(3):
+            self.app.post("/service_tickets/", json={
+                "VIN": f"NEST{i}", "service_date": "2025-09-01", "service_desc": "x", "customer_id": customer_id
+            })
+        for fields in ("mechanics", "parts", "mechanics,parts"):
+            response = self.app.get("/service_tickets/", query_string={"fields": fields, "limit": 2})
+            self.assertEqual(response.status_code, 200, fields)
+            body = response.get_json()
+            self.assertEqual([set(t) for t in body["items"]], [set(fields.split(","))] * 2)
+            self.assertIsNotNone(body["next_cursor"])
+
+            streamed = self.app.get("/service_tickets/", query_string={"fields": fields},
+                                    headers={"Accept": "application/x-ndjson"})
+            self.assertEqual(streamed.status_code, 200, fields)
+            self.assertEqual(len(streamed.data.splitlines()), 3)
+
+    # ?filter / sort / fields (negative: not whitelisted or malformed)
+    def test_invalid_specs(self):
+        for url, args in (
+            ("/mechanics/", {"filter[phone]": "555"}),
+            ("/mechanics/", {"filter[salary][like]": "4"}),
+            ("/mechanics/", {"filter[salary]": "lots"}),
+            ("/inventory/", {"sort": "version"}),
+            ("/inventory/", {"fields": "id,password"}),
+            ("/service_tickets/", {"filter[service_date]": "yesterday"}),
+            ("/service_tickets/", {"sort": "customer_id", "cursor": "not-a-cursor"}),
+        ):
+            response = self.app.get(url, query_string=args)
+            self.assertEqual(response.status_code, 400, (url, args))
+            self.assertIn("error", response.get_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
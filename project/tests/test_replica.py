@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from flask import g
+from sqlalchemy import insert, select
+
+from project.application import create_app
+from project.application.config.init import TestingConfig
+from project.application.extensions import db
+from project.application.models import Inventory
+
+REPLICA = {"REMOTE_ADDR": "10.0.0.2"}
+
+
+class ReplicaRoutingTestCase(unittest.TestCase):
+    """Two SQLite files stand in for the primary and a (lagging) replica."""
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+
+        class ReplicaConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(self.workdir, 'primary.db')}"
+            SQLALCHEMY_REPLICA_URI = f"sqlite:///{os.path.join(self.workdir, 'replica.db')}"
+            REPLICA_STICKY_SECONDS = 5
+
+        self.flask_app = create_app(ReplicaConfig)
+        with self.flask_app.app_context():
+            db.metadata.create_all(db.engines["replica"])
+        self.writer = self.flask_app.test_client()
+        self.reader = self.flask_app.test_client()
+        self.reader.environ_base.update(REPLICA)
+
+    def tearDown(self):
+        with self.flask_app.app_context():
+            for engine in db.engines.values():
+                engine.dispose()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def _replicate(self):
+        with self.flask_app.app_context():
+            rows = [dict(r._mapping) for r in db.session.execute(select(Inventory.__table__))]
+            with db.engines["replica"].begin() as conn:
+                conn.execute(Inventory.__table__.delete())
+                if rows:
+                    conn.execute(insert(Inventory.__table__), rows)
+
+    # GET /inventory reads the replica; writes always land on the primary
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.writer.post("/inventory/", json={"name": "Pad", "price": 9.5}).status_code, 201)
+        self.assertEqual(self.reader.get("/inventory/").get_json(), [])  # not replicated yet
+
+        self._replicate()
+        self.assertEqual([p["name"] for p in self.reader.get("/inventory/").get_json()], ["Pad"])
+
+    # A client reads its own write from the primary during the sticky window
+    def test_read_your_writes(self):
+        self.writer.post("/inventory/", json={"name": "Rotor", "price": 50})
+        self.assertEqual([p["name"] for p in self.writer.get("/inventory/").get_json()], ["Rotor"])
+
+        # ...and neither a replica-filled cache entry nor ETag hides it
+        self.writer.post("/inventory/", json={"name": "Hose", "price": 4})
+        self.assertEqual(self.reader.get("/inventory/").get_json(), [])
+        self.assertEqual(len(self.writer.get("/inventory/").get_json()), 2)
+
+    # Without stickiness the writer sees replica lag like everyone else
+    def test_sticky_window_disabled(self):
+        self.flask_app.config["REPLICA_STICKY_SECONDS"] = 0
+        self.writer.post("/inventory/", json={"name": "Belt", "price": 12})
+        self.assertEqual(self.writer.get("/inventory/").get_json(), [])
+
+    # DML and flushes never use the replica, even inside a replica route
+    def test_writes_bind_to_primary(self):
+        with self.flask_app.test_request_context():
+            g.db_route = "replica"
+            session = db.session
+            self.assertIs(session.get_bind(clause=select(Inventory)), db.engines["replica"])
+            self.assertIs(session.get_bind(clause=insert(Inventory)), db.engine)
+
+    # GET /metrics/pool reports the replica pool alongside the primary
+    def test_metrics_include_replica(self):
+        self.assertIn("replica", self.reader.get("/metrics/pool").get_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
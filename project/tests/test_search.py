@@ -0,0 +1,80 @@
+import unittest
+
+from sqlalchemy import text
+
+from project.application import create_app
+from project.application.extensions import db
+from project.tests.helpers import create_customer
+
+
+class SearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.flask_app = create_app("TestingConfig")
+        self.app = self.flask_app.test_client()
+
+    def _ticket(self, customer_id, vin, desc):
+        return self.app.post("/service_tickets/", json={
+            "VIN": vin, "service_date": "2025-09-07", "service_desc": desc, "customer_id": customer_id
+        }).get_json()["id"]
+
+    # GET /service_tickets?q= matches VIN fragments; edits and deletes follow
+    def test_ticket_search(self):
+        customer_id, headers = create_customer(self.app, "search@example.com")
+        oil = self._ticket(customer_id, "1HGCM82633A004352", "Oil change")
+        brakes = self._ticket(customer_id, "JH4KA7561PC008269", "Front brake pads")
+
+        items = self.app.get("/service_tickets/", query_string={"q": "633a"}).get_json()["items"]
+        self.assertEqual([t["id"] for t in items], [oil])
+
+        self.app.put(f"/service_tickets/{brakes}", json={"service_desc": "Oil and brakes"}, headers=headers)
+        items = self.app.get("/service_tickets/", query_string={"q": "oil"}).get_json()["items"]
+        self.assertEqual(sorted(t["id"] for t in items), sorted([oil, brakes]))
+
+        self.app.delete(f"/service_tickets/{oil}", headers=headers)
+        items = self.app.get("/service_tickets/", query_string={"q": "oil"}).get_json()["items"]
+        self.assertEqual([t["id"] for t in items], [brakes])
+
+    # GET /customers/?q= across name, email and phone, paginated
+    def test_customer_search_paginates(self):
+        self.app.post("/customers/bulk", json=[
+            {"name": f"Smith {i}", "email": f"smith{i}@example.com", "phone": f"555-01{i:02d}", "password": "pw"}
+            for i in range(5)
+        ])
+        first = self.app.get("/customers/", query_string={"q": "smith", "per_page": 3}).get_json()
+        self.assertEqual((len(first["items"]), first["has_more"]), (3, True))
+        second = self.app.get("/customers/", query_string={"q": "smith", "per_page": 3, "page": 2}).get_json()
+        self.assertEqual((len(second["items"]), second["has_more"]), (2, False))
+
+        items = self.app.get("/customers/", query_string={"q": "555-0103"}).get_json()["items"]
+        self.assertEqual([c["name"] for c in items], ["Smith 3"])
+
+    # GET /inventory/?q= requires every term; best match first
+    def test_part_search(self):
+        for name in ("Brake pad", "Brake pad set front brake", "Brake fluid"):
+            self.app.post("/inventory/", json={"name": name, "price": 1.0})
+        items = self.app.get("/inventory/", query_string={"q": "brake pad"}).get_json()["items"]
+        self.assertEqual({p["name"] for p in items}, {"Brake pad", "Brake pad set front brake"})
+        self.assertEqual(self.app.get("/inventory/", query_string={"q": "gasket"}).get_json()["items"], [])
+
+    # ?q= (negative: nothing long enough to search for)
+    def test_short_query_rejected(self):
+        response = self.app.get("/inventory/", query_string={"q": "ab"})
+        self.assertEqual(response.status_code, 400)
+
+    # flask search rebuild backfills a wiped index
+    def test_rebuild_command(self):
+        self.app.post("/inventory/", json={"name": "Spark plug", "price": 3.0})
+        with self.flask_app.app_context():
+            db.session.execute(text("DELETE FROM search_inventory"))
+            db.session.commit()
+        self.assertEqual(self.app.get("/inventory/", query_string={"q": "spark"}).get_json()["items"], [])
+
+        result = self.flask_app.test_cli_runner().invoke(args=["search", "rebuild"])
+        self.assertIn("Indexed 1 inventory", result.output)
+        items = self.app.get("/inventory/", query_string={"q": "spark"}).get_json()["items"]
+        self.assertEqual([p["name"] for p in items], ["Spark plug"])
+
+
+if __name__ == "__main__":
+    unittest.main()
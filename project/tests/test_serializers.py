@@ -0,0 +1,106 @@
+import json
+import unittest
+from datetime import date
+
+from marshmallow_sqlalchemy import SQLAlchemySchema
+from sqlalchemy import select
+
+from project.application import create_app
+from project.application.extensions import db
+from project.application.models import Customer, Inventory, Mechanic, ServiceTicket
+from project.application.serializers import compile_schema, schema_columns
+from project.application.blueprints.customers import schemas as customer_schemas
+from project.application.blueprints.inventory import schemas as inventory_schemas
+from project.application.blueprints.mechanics import schemas as mechanic_schemas
+from project.application.blueprints.service_tickets import schemas as ticket_schemas
+
+
+def _mechanic(i, **overrides):
+    values = dict(id=i, name=f"Mech {i}", email=f"m{i}@example.com", phone="555", salary=4500)
+    values.update(overrides)
+    return Mechanic(**values)
+
+
+def _part(i, **overrides):
+    values = dict(id=i, name=f"Part {i}", price=19.99 * i)
+    values.update(overrides)
+    return Inventory(**values)
+
+
+SAMPLES = {
+    Customer: [
+        Customer(id=1, name="Ash", email="ash@example.com", phone="555-111", password_hash="h"),
+        Customer(id=2, name="Zoë Ünicode ✓", email="zoe@example.com", phone="", password_hash="h"),
+        Customer(id=None, name=None, email=None, phone=None, password_hash=None),
+    ],
+    Mechanic: [
+        _mechanic(1),
+        _mechanic(2, salary=1e16, name="Ø"),
+        _mechanic(3, salary=None, phone=None),
+    ],
+    Inventory: [
+        _part(1),
+        _part(2, price=0.1 + 0.2),
+        _part(3, price=123456789.125),
+        _part(4, price=None),
+    ],
+    ServiceTicket: [
+        ServiceTicket(id=1, VIN="1HGCM82633A004352", service_date=date(2025, 9, 1),
+                      service_desc="Oil + brakes", customer_id=1,
+                      mechanics=[_mechanic(1), _mechanic(2)], parts=[_part(1), _part(2)]),
+        ServiceTicket(id=2, VIN="V2", service_date=date(1999, 12, 31), service_desc="“quoted”",
+                      customer_id=2, mechanics=[], parts=[]),
+        ServiceTicket(id=3, VIN="V3", service_date=None, service_desc="", customer_id=None),
+    ],
+}
+
+
+def _module_schemas():
+    for module in (customer_schemas, inventory_schemas, mechanic_schemas, ticket_schemas):
+        for name, value in vars(module).items():
+            if isinstance(value, SQLAlchemySchema):
+                yield f"{module.__name__}.{name}", value
+
+
+class SerializerParityTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.flask_app = create_app("TestingConfig")
+
+    def _assert_identical(self, label, expected, actual):
+        self.assertEqual(actual, expected, label)
+        # Same keys in the same order, and the same bytes on the wire.
+        self.assertEqual(json.dumps(actual), json.dumps(expected), label)
+        self.assertEqual(self.flask_app.json.dumps(actual), self.flask_app.json.dumps(expected), label)
+
+    # Every schema in blueprints/*/schemas.py, single and many
+    def test_compiled_output_matches_marshmallow(self):
+        checked = 0
+        for label, schema in _module_schemas():
+            samples = SAMPLES[schema.opts.model]
+            fast = compile_schema(schema)
+            if schema.many:
+                self._assert_identical(label, schema.dump(samples), fast(samples))
+            else:
+                for obj in samples:
+                    self._assert_identical(label, schema.dump(obj), fast(obj))
+            checked += 1
+        self.assertGreaterEqual(checked, 12)
+
+    # Compiled dumpers over Core rows match marshmallow over ORM objects
+    def test_compiled_output_from_rows_matches_marshmallow(self):
+        client = self.flask_app.test_client()
+        client.post("/inventory/", json={"name": "Brake Pad", "price": 99.99})
+        client.post("/mechanics/", json={
+            "name": "Brock", "email": "brock@example.com", "phone": "555", "salary": 4500
+        })
+        with self.flask_app.app_context():
+            for schema, model in ((inventory_schemas.inventories_schema, Inventory),
+                                  (mechanic_schemas.mechanics_schema, Mechanic)):
+                rows = db.session.execute(select(*schema_columns(schema, model))).all()
+                objs = db.session.execute(select(model)).scalars().all()
+                self._assert_identical(model.__name__, schema.dump(objs), compile_schema(schema)(rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,8 @@
+import csv
+import io
 import unittest
 from project.application import create_app
+from project.tests.helpers import assert_max_queries, create_customer
 
 class CustomerRoutesTestCase(unittest.TestCase):
 
@@ -72,6 +75,334 @@ class CustomerRoutesTestCase(unittest.TestCase):
         delete_resp = self.app.delete(f"/service_tickets/{ticket_id}")
         self.assertEqual(delete_resp.status_code, 200)
 
+    # GET /service_tickets?limit=&cursor= walks every ticket exactly once
+    def test_get_service_tickets_cursor_pagination(self):
+        cust_resp = self.app.post("/customers/", json={
+            "name": "Pager",
+            "email": "pager@example.com",
+            "phone": "555-123-4567",
+            "password": "PagerPass123"
+        })
+        customer_id = cust_resp.get_json()["id"]
+        for i in range(5):
+            self.app.post(self.base_url, json={
+                "VIN": f"VIN{i}",
+                "service_date": "2025-09-01",
+                "service_desc": f"Job {i}",
+                "customer_id": customer_id
+            })
+
+        seen, cursor = [], None
+        while True:
+            query = {"limit": 2}
+            if cursor:
+                query["cursor"] = cursor
+            response = self.app.get(self.base_url, query_string=query)
+            self.assertEqual(response.status_code, 200)
+            body = response.get_json()
+            self.assertLessEqual(len(body["items"]), 2)
+            seen.extend(item["id"] for item in body["items"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen, sorted(seen))
+
+    # GET /service_tickets?cursor=<garbage> (negative)
+    def test_get_service_tickets_invalid_cursor(self):
+        response = self.app.get(self.base_url, query_string={"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def _seed_tickets(self, count, mechanics=2, parts=2):
+        customer_id, headers = create_customer(self.app, "seed@example.com")
+        mech_ids = [
+            self.app.post("/mechanics/", json={
+                "name": f"Mech{i}", "email": f"mech{i}@example.com",
+                "phone": "555-222-3333", "salary": 4000
+            }).get_json()["id"]
+            for i in range(mechanics)
+        ]
+        part_ids = [
+            self.app.post("/inventory/", json={"name": f"Part{i}", "price": 10.0 + i}).get_json()["id"]
+            for i in range(parts)
+        ]
+        ticket_ids = []
+        for i in range(count):
+            ticket_id = self.app.post(self.base_url, json={
+                "VIN": f"SEEDVIN{i}",
+                "service_date": "2025-09-03",
+                "service_desc": f"Seeded {i}",
+                "customer_id": customer_id,
+                "mechanic_ids": mech_ids
+            }).get_json()["id"]
+            for part_id in part_ids:
+                self.app.post(f"{self.base_url}{ticket_id}/add-part/{part_id}", headers=headers)
+            ticket_ids.append(ticket_id)
+        return ticket_ids, headers
+
+    # Nested mechanics/parts must not be lazy-loaded per ticket (N+1)
+    def test_get_service_tickets_query_budget(self):
+        self._seed_tickets(6)
+        with assert_max_queries(self, self.app, 3):
+            response = self.app.get(self.base_url, query_string={"limit": 50})
+        self.assertEqual(response.status_code, 200)
+        items = response.get_json()["items"]
+        self.assertEqual(len(items), 6)
+        self.assertTrue(all(len(t["mechanics"]) == 2 and len(t["parts"]) == 2 for t in items))
+
+    def test_get_service_ticket_query_budget(self):
+        ticket_ids, _ = self._seed_tickets(1)
+        # ticket + mechanics + parts, plus one UNION for the ETag validators
+        with assert_max_queries(self, self.app, 4):
+            response = self.app.get(f"{self.base_url}{ticket_ids[0]}")
+        self.assertEqual(response.status_code, 200)
+
+    # GET /service_tickets/<id>: ETag covers the nested mechanics and parts
+    def test_get_service_ticket_conditional(self):
+        ticket_ids, headers = self._seed_tickets(1)
+        url = f"{self.base_url}{ticket_ids[0]}"
+        etag = self.app.get(url).headers["ETag"]
+        self.assertEqual(self.app.get(url, headers={"If-None-Match": etag}).status_code, 304)
+
+        mech_id = self.app.get(url).get_json()["mechanics"][0]["id"]
+        self.app.put(f"/mechanics/{mech_id}", json={"name": "Renamed"})
+        response = self.app.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Renamed", [m["name"] for m in response.get_json()["mechanics"]])
+
+        etag = response.headers["ETag"]
+        self.app.put(url, json={"mechanic_ids": [mech_id]}, headers=headers)
+        response = self.app.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["mechanics"]), 1)
+
+    def test_update_service_ticket_query_budget(self):
+        ticket_ids, headers = self._seed_tickets(1)
+        # ... plus one upsert keeping the search index in step with service_desc
+        with assert_max_queries(self, self.app, 6):
+            response = self.app.put(
+                f"{self.base_url}{ticket_ids[0]}",
+                json={"service_desc": "Updated"},
+                headers=headers
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["parts"]), 2)
+
+    # POST /service_tickets/bulk with mechanic assignments
+    def test_create_service_tickets_bulk(self):
+        customer_id, _ = create_customer(self.app, "bulkowner@example.com")
+        mech_id = self.app.post("/mechanics/", json={
+            "name": "Bulk Mech", "email": "bulkmech@example.com", "phone": "555-1", "salary": 1
+        }).get_json()["id"]
+        items = [{
+            "VIN": f"BULKVIN{i}", "service_date": "2025-09-04", "service_desc": "Bulk",
+            "customer_id": customer_id, "mechanic_ids": [mech_id]
+        } for i in range(5)]
+        items.append({"VIN": "BAD", "service_date": "2025-09-04", "service_desc": "x", "customer_id": 999999})
+        items.append({"VIN": "BAD2", "service_date": "2025-09-04", "service_desc": "x",
+                      "customer_id": customer_id, "mechanic_ids": [999999]})
+
+        response = self.app.post(f"{self.base_url}bulk", json=items)
+        self.assertEqual(response.status_code, 207)
+        body = response.get_json()
+        self.assertEqual(body["created"], 5)
+
+        ticket = self.app.get(f"{self.base_url}{body['results'][0]['id']}").get_json()
+        self.assertEqual([m["id"] for m in ticket["mechanics"]], [mech_id])
+
+    # POST /service_tickets/bulk (negative: booleans or a non-list as mechanic_ids)
+    def test_create_service_tickets_bulk_rejects_bool_ids(self):
+        customer_id, _ = create_customer(self.app, "boolowner@example.com")
+        self.app.post("/mechanics/", json={"name": "One", "email": "one@example.com", "phone": "555-1", "salary": 1})
+        items = [{
+            "VIN": f"BOOL{i}", "service_date": "2025-09-04", "service_desc": "x",
+            "customer_id": customer_id, "mechanic_ids": ids
+        } for i, ids in enumerate(([True], [1, False], False))]
+
+        response = self.app.post(f"{self.base_url}bulk", json=items)
+        self.assertEqual(response.status_code, 400)
+        body = response.get_json()
+        self.assertEqual(body["created"], 0)
+        self.assertTrue(all("mechanic_ids" in r["errors"] for r in body["results"]))
+
+    # GET /service_tickets with Accept: text/csv streams every ticket
+    def test_get_service_tickets_csv_stream(self):
+        self._seed_tickets(3)
+        response = self.app.get(self.base_url, headers={"Accept": "text/csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "text/csv")
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual(rows[0], ["id", "VIN", "service_date", "service_desc",
+                                   "customer_id", "mechanics", "parts"])
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(len(rows[1][5].split(";")), 2)
+
+    def _edit_fixture(self, mechanics):
+        customer_id, headers = create_customer(self.app, "editor@example.com")
+        mech_ids = [r["id"] for r in self.app.post("/mechanics/bulk", json=[{
+            "name": f"Crew{i}", "email": f"crew{i}@example.com", "phone": "555", "salary": 1
+        } for i in range(mechanics)]).get_json()["results"]] if mechanics else []
+        ticket_id = self.app.post(self.base_url, json={
+            "VIN": "EDITVIN", "service_date": "2025-09-05", "service_desc": "Edit",
+            "customer_id": customer_id
+        }).get_json()["id"]
+        return ticket_id, mech_ids, headers
+
+    # PUT /service_tickets/<id>/edit: statement count doesn't grow with the lists
+    def test_edit_mechanics_constant_queries(self):
+        ticket_id, mech_ids, headers = self._edit_fixture(60)
+        url = f"{self.base_url}{ticket_id}/edit"
+
+        self.app.put(url, json={"add_ids": mech_ids[:2]}, headers=headers)
+        counts = []
+        for add, remove in (([mech_ids[2]], [mech_ids[0]]), (mech_ids[3:53], mech_ids[1:3])):
+            with assert_max_queries(self, self.app, 12) as statements:
+                response = self.app.put(url, json={"add_ids": add, "remove_ids": remove}, headers=headers)
+            self.assertEqual(response.status_code, 200)
+            counts.append(len(statements))
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(sorted(m["id"] for m in response.get_json()["mechanics"]), sorted(mech_ids[3:53]))
+
+        # PUT /service_tickets/<id> replaces the set the same way
+        with assert_max_queries(self, self.app, 12):
+            response = self.app.put(f"{self.base_url}{ticket_id}", json={"mechanic_ids": mech_ids[40:]}, headers=headers)
+        self.assertEqual(sorted(m["id"] for m in response.get_json()["mechanics"]), sorted(mech_ids[40:]))
+
+    # PUT /service_tickets/<id>/edit moves the ticket's ETag
+    def test_edit_mechanics_changes_etag(self):
+        ticket_id, mech_ids, headers = self._edit_fixture(2)
+        url = f"{self.base_url}{ticket_id}"
+        self.app.put(f"{url}/edit", json={"add_ids": [mech_ids[0]]}, headers=headers)
+        etag = self.app.get(url).headers["ETag"]
+
+        # Same count and versions on the mechanics side: only the ticket's version differs
+        self.app.put(f"{url}/edit", json={"add_ids": [mech_ids[1]], "remove_ids": [mech_ids[0]]}, headers=headers)
+        response = self.app.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([m["id"] for m in response.get_json()["mechanics"]], [mech_ids[1]])
+
+    # PUT /service_tickets/<id>/edit (negative: unknown or malformed ids)
+    def test_edit_mechanics_invalid_ids(self):
+        ticket_id, mech_ids, headers = self._edit_fixture(1)
+        url = f"{self.base_url}{ticket_id}/edit"
+        response = self.app.put(url, json={"add_ids": [mech_ids[0], 999999]}, headers=headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("999999", response.get_json()["error"])
+        self.assertEqual(self.app.put(url, json={"remove_ids": "1"}, headers=headers).status_code, 400)
+        self.assertEqual(self.app.get(f"{self.base_url}{ticket_id}").get_json()["mechanics"], [])
+
+    def _parts_fixture(self, parts):
+        ticket_id, _, headers = self._edit_fixture(0)
+        part_ids = [r["id"] for r in self.app.post("/inventory/bulk", json=[
+            {"name": f"Pad{i}", "price": 5.0 + i} for i in range(parts)
+        ]).get_json()["results"]]
+        return ticket_id, part_ids, headers
+
+    # POST /service_tickets/<id>/parts: one request, one upsert, quantities kept
+    def test_add_parts_batch(self):
+        ticket_id, part_ids, headers = self._parts_fixture(15)
+        url = f"{self.base_url}{ticket_id}/parts"
+
+        with assert_max_queries(self, self.app, 6):
+            response = self.app.post(url, json=[{"part_id": p, "quantity": 2} for p in part_ids], headers=headers)
+        self.assertEqual(response.status_code, 200)
+        lines = response.get_json()["parts"]
+        self.assertEqual([l["part_id"] for l in lines], sorted(part_ids))
+        self.assertTrue(all(l["quantity"] == 2 for l in lines))
+
+        # Existing lines take the new quantity; repeated ids are summed
+        response = self.app.post(url, json=[
+            {"part_id": part_ids[0], "quantity": 5}, {"part_id": part_ids[1]}, {"part_id": part_ids[1]}
+        ], headers=headers)
+        quantities = {l["part_id"]: l["quantity"] for l in response.get_json()["parts"]}
+        self.assertEqual((quantities[part_ids[0]], quantities[part_ids[1]], quantities[part_ids[2]]), (5, 2, 2))
+
+        # The single-part route leaves an existing quantity alone
+        self.app.post(f"{self.base_url}{ticket_id}/add-part/{part_ids[0]}", headers=headers)
+        lines = self.app.post(url, json=[{"part_id": part_ids[2], "quantity": 1}], headers=headers).get_json()["parts"]
+        self.assertEqual(lines[0]["quantity"], 5)
+
+        ticket = self.app.get(f"{self.base_url}{ticket_id}").get_json()
+        self.assertEqual(len(ticket["parts"]), 15)
+
+    # POST /service_tickets/<id>/parts (negative: bad body, unknown part, wrong owner)
+    def test_add_parts_batch_invalid(self):
+        ticket_id, part_ids, headers = self._parts_fixture(1)
+        url = f"{self.base_url}{ticket_id}/parts"
+        self.assertEqual(self.app.post(url, json=[], headers=headers).status_code, 400)
+        self.assertEqual(self.app.post(url, json=[{"part_id": part_ids[0], "quantity": 0}], headers=headers).status_code, 400)
+        self.assertEqual(self.app.post(url, json={"part_id": part_ids[0]}, headers=headers).status_code, 400)
+
+        response = self.app.post(url, json=[{"part_id": part_ids[0]}, {"part_id": 999999}], headers=headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.app.get(f"{self.base_url}{ticket_id}").get_json()["parts"], [])
+
+        _, other = create_customer(self.app, "stranger@example.com")
+        self.assertEqual(self.app.post(url, json=[{"part_id": part_ids[0]}], headers=other).status_code, 403)
+
+    # GET /service_tickets/<id>/invoice: totals follow quantity and price changes
+    def test_ticket_invoice(self):
+        ticket_id, part_ids, headers = self._parts_fixture(2)  # prices 5.0 and 6.0
+        self.app.post(f"{self.base_url}{ticket_id}/parts", json=[
+            {"part_id": part_ids[0], "quantity": 3}, {"part_id": part_ids[1]}
+        ], headers=headers)
+        url = f"{self.base_url}{ticket_id}/invoice"
+
+        body = self.app.get(url).get_json()
+        self.assertEqual([l["line_total"] for l in body["lines"]], [15.0, 6.0])
+        self.assertEqual(body["total"], 21.0)
+
+        # Cached total: only the ticket lookup and the lines query run
+        with assert_max_queries(self, self.app, 2):
+            self.assertEqual(self.app.get(url).get_json()["total"], 21.0)
+
+        self.app.put(f"/inventory/{part_ids[1]}", json={"price": 10.0})
+        self.assertEqual(self.app.get(url).get_json()["total"], 25.0)
+
+        self.app.post(f"{self.base_url}{ticket_id}/parts", json=[{"part_id": part_ids[0], "quantity": 1}], headers=headers)
+        self.assertEqual(self.app.get(url).get_json()["total"], 15.0)
+
+        self.app.delete(f"/inventory/{part_ids[0]}")
+        self.assertEqual(self.app.get(url).get_json()["total"], 10.0)
+
+        self.assertEqual(self.app.get(f"{self.base_url}999999/invoice").status_code, 404)
+
+    # GET /service_tickets/invoices grouped by ticket, customer and date
+    def test_invoice_summaries(self):
+        ticket_id, part_ids, headers = self._parts_fixture(1)  # 5.0 each
+        customer_id = self.app.get(f"{self.base_url}{ticket_id}").get_json()["customer_id"]
+        self.app.post(f"{self.base_url}{ticket_id}/parts", json=[{"part_id": part_ids[0], "quantity": 2}], headers=headers)
+        for day, quantity in (("2025-09-06", 4), ("2025-09-06", None)):
+            other = self.app.post(self.base_url, json={
+                "VIN": "SUMVIN", "service_date": day, "service_desc": "Sum", "customer_id": customer_id
+            }).get_json()["id"]
+            if quantity:
+                self.app.post(f"{self.base_url}{other}/parts", json=[{"part_id": part_ids[0], "quantity": quantity}], headers=headers)
+        url = f"{self.base_url}invoices"
+
+        by_ticket = self.app.get(url, query_string={"limit": 2}).get_json()
+        self.assertEqual([i["total"] for i in by_ticket["items"]], [10.0, 20.0])
+        rest = self.app.get(url, query_string={"limit": 2, "cursor": by_ticket["next_cursor"]}).get_json()
+        self.assertEqual([i["total"] for i in rest["items"]], [0.0])
+
+        by_customer = self.app.get(url, query_string={"group_by": "customer"}).get_json()["items"]
+        self.assertEqual(by_customer, [{"customer_id": customer_id, "tickets": 3, "total": 30.0}])
+
+        by_date = self.app.get(url, query_string={"group_by": "date", "from": "2025-09-06"}).get_json()
+        self.assertEqual(by_date["items"], [{"service_date": "2025-09-06", "tickets": 2, "total": 20.0}])
+        self.assertEqual(by_date["total"], 20.0)
+
+    # GET /service_tickets/invoices (negative: bad grouping, date or customer_id)
+    def test_invoice_summaries_invalid(self):
+        url = f"{self.base_url}invoices"
+        self.assertEqual(self.app.get(url, query_string={"group_by": "mechanic"}).status_code, 400)
+        self.assertEqual(self.app.get(url, query_string={"from": "09/06/2025"}).status_code, 400)
+        for raw in ("abc", "1.5", "0"):
+            response = self.app.get(url, query_string={"customer_id": raw})
+            self.assertEqual(response.status_code, 400, raw)
+            self.assertIn("customer_id", response.get_json()["error"])
+
 
 if __name__ == "__main__":
     unittest.main()